@@ -0,0 +1,130 @@
+"""
+Servicio de archivos de /uploads (fotos de órdenes, PDFs de vacaciones).
+
+Reemplaza al StaticFiles montado en /uploads para controlar la caché:
+- ETag fuerte: el sha256 para el almacén por contenido (uploads/ordenes/cas/...), tamaño+mtime para el resto.
+- Cache-Control: immutable (1 año) para nombres por contenido; no-cache (revalidar) para los demás,
+  que pueden regenerarse con el mismo nombre (ej. PDFs).
+- GET condicional (If-None-Match / If-Modified-Since -> 304) y rangos de bytes (Range / If-Range -> 206).
+- Modo X-Accel-Redirect (settings.UPLOADS_X_ACCEL_PREFIX): FastAPI valida la ruta y nginx envía los bytes.
+"""
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Iterator, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from app.config import settings
+
+router = APIRouter(tags=["Uploads"])
+
+UPLOADS_ROOT = os.path.realpath(settings.UPLOAD_DIR)
+CHUNK_SIZE = 256 * 1024
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDAR = "no-cache"
+_RE_CAS = re.compile(r"^ordenes/cas/[0-9a-f]{2}/([0-9a-f]{64})(__\w+)?\.\w+$")
+_RE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _resolver(ruta: str) -> Tuple[str, str]:
+    """Ruta relativa pedida -> (ruta absoluta, ruta relativa normalizada). 404 si sale de uploads o no existe."""
+    absoluta = os.path.realpath(os.path.join(UPLOADS_ROOT, ruta))
+    if not absoluta.startswith(UPLOADS_ROOT + os.sep) or not os.path.isfile(absoluta):
+        raise HTTPException(status_code=404, detail="Archivo no encontrado")
+    return absoluta, os.path.relpath(absoluta, UPLOADS_ROOT).replace(os.sep, "/")
+
+
+def _validadores(relativa: str, stat: os.stat_result) -> Tuple[str, str]:
+    """(etag, cache-control) del archivo."""
+    m = _RE_CAS.match(relativa)
+    if m:
+        return f'"{m.group(1)}{m.group(2) or ""}"', CACHE_INMUTABLE
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"', CACHE_REVALIDAR
+
+
+def _no_modificado(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etags = [e.strip().removeprefix("W/") for e in if_none_match.split(",")]
+        return "*" in etags or etag in etags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _rango(request: Request, etag: str, tamano: int) -> Optional[Tuple[int, int]]:
+    """(inicio, fin) inclusivos del Range pedido; None para responder el archivo completo; 416 si no es satisfacible."""
+    cabecera = request.headers.get("range")
+    if not cabecera or tamano == 0:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        return None
+    m = _RE_RANGE.match(cabecera.strip())
+    if not m or (not m.group(1) and not m.group(2)):
+        # Varios rangos o sintaxis no soportada: se ignora y se envía completo (permitido por RFC 9110)
+        return None
+    if m.group(1):
+        inicio = int(m.group(1))
+        fin = min(int(m.group(2)), tamano - 1) if m.group(2) else tamano - 1
+    else:
+        inicio, fin = max(tamano - int(m.group(2)), 0), tamano - 1
+    if inicio >= tamano or inicio > fin:
+        raise HTTPException(status_code=416, detail="Rango no satisfacible", headers={"Content-Range": f"bytes */{tamano}"})
+    return inicio, fin
+
+
+def _leer_rango(ruta: str, inicio: int, fin: int) -> Iterator[bytes]:
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        pendiente = fin - inicio + 1
+        while pendiente > 0:
+            bloque = f.read(min(CHUNK_SIZE, pendiente))
+            if not bloque:
+                break
+            pendiente -= len(bloque)
+            yield bloque
+
+
+@router.api_route("/uploads/{ruta:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def servir_upload(ruta: str, request: Request):
+    absoluta, relativa = _resolver(ruta)
+    stat = os.stat(absoluta)
+    etag, cache_control = _validadores(relativa, stat)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+    }
+
+    if _no_modificado(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(absoluta)[0] or "application/octet-stream"
+
+    if settings.UPLOADS_X_ACCEL_PREFIX:
+        # nginx (location internal) envía el archivo y resuelve Range por su cuenta
+        headers["X-Accel-Redirect"] = settings.UPLOADS_X_ACCEL_PREFIX.rstrip("/") + "/" + relativa
+        return Response(status_code=200, headers=headers, media_type=media_type)
+
+    rango = _rango(request, etag, stat.st_size)
+    if rango is None:
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(stat.st_size)
+            return Response(status_code=200, headers=headers, media_type=media_type)
+        return FileResponse(absoluta, headers=headers, media_type=media_type, stat_result=stat)
+
+    inicio, fin = rango
+    headers["Content-Range"] = f"bytes {inicio}-{fin}/{stat.st_size}"
+    headers["Content-Length"] = str(fin - inicio + 1)
+    if request.method == "HEAD":
+        return Response(status_code=206, headers=headers, media_type=media_type)
+    return StreamingResponse(_leer_rango(absoluta, inicio, fin), status_code=206, headers=headers, media_type=media_type)
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.user import Token, UserLogin, UserCreate, UserResponse, LoginTecnicoCodigo
 from app.services.auth_service import AuthService
-from app.core.dependencies import get_current_active_user
+from app.core.dependencies import get_current_user_db
 from app.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["Autenticación"])
@@ -79,7 +79,7 @@ def register(
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user_db)
 ):
     """
     Obtener información del usuario actual
@@ -19,19 +19,11 @@ from app.schemas.caja import (
     AperturaCajaCreate,
 )
 from app.core.dependencies import get_current_active_user, require_role
+from app.services.caja_service import CajaService
 
 router = APIRouter(tags=["caja"])
 
 
-def _saldo_inicial_para_fecha(db: Session, fecha: date) -> float:
-    """Saldo inicial del día: apertura de caja si existe para esa fecha, si no último corte."""
-    apertura = db.query(AperturaCaja).filter(AperturaCaja.fecha == fecha).first()
-    if apertura:
-        return float(apertura.monto)
-    ultimo_corte = db.query(CorteCaja).filter(CorteCaja.fecha < fecha).order_by(CorteCaja.fecha.desc()).first()
-    return float(ultimo_corte.saldo_final) if ultimo_corte else 0.0
-
-
 def _mov_to_response(m: MovimientoCaja) -> dict:
     d = {
         "id": m.id,
@@ -104,6 +96,7 @@ def create_movimiento(
         usuario_id=current_user.id,
     )
     db.add(m)
+    CajaService.registrar_movimiento(db, m.fecha, m.tipo, m.monto)
     db.commit()
     db.refresh(m)
     return _mov_to_response(m)
@@ -146,28 +139,47 @@ def resumen_dia(
     current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"])),
 ):
     """Resumen del día (para corte caja chica o vista previa): total entradas, salidas y saldo sin cerrar."""
-    entradas = db.query(func.coalesce(func.sum(MovimientoCaja.monto), 0)).filter(
-        MovimientoCaja.fecha == fecha,
-        MovimientoCaja.tipo == TipoMovimientoCajaEnum.ENTRADA,
-    ).scalar() or 0
-    salidas = db.query(func.coalesce(func.sum(MovimientoCaja.monto), 0)).filter(
-        MovimientoCaja.fecha == fecha,
-        MovimientoCaja.tipo == TipoMovimientoCajaEnum.SALIDA,
-    ).scalar() or 0
-    saldo_inicial = _saldo_inicial_para_fecha(db, fecha)
+    resumen = CajaService.resumen_dia(db, fecha)
+    saldo_inicial = resumen["saldo_inicial"]
+    entradas = resumen["total_entradas"]
+    salidas = resumen["total_salidas"]
     saldo_final = float(saldo_inicial) + float(entradas) - float(salidas)
-    # Indicar si hay apertura para este día (para el front)
-    apertura = db.query(AperturaCaja).filter(AperturaCaja.fecha == fecha).first()
     return {
         "fecha": fecha.isoformat(),
         "saldo_inicial": round(saldo_inicial, 2),
-        "tiene_apertura": apertura is not None,
+        "tiene_apertura": resumen["tiene_apertura"],  # Indicar si hay apertura para este día (para el front)
         "total_entradas": round(float(entradas), 2),
         "total_salidas": round(float(salidas), 2),
         "saldo_final": round(saldo_final, 2),
     }
 
 
+# Máximo de días por consulta de rango (2 años)
+_MAX_DIAS_RANGO = 731
+
+
+@router.get("/caja/resumen-rango")
+def resumen_rango(
+    desde: date = Query(..., description="Fecha inicial (inclusive)"),
+    hasta: date = Query(..., description="Fecha final (inclusive)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"])),
+):
+    """Resumen por día de un rango (gráficas mensuales/anuales): entradas, salidas y saldo de cada día."""
+    if hasta < desde:
+        raise HTTPException(status_code=400, detail="hasta debe ser mayor o igual a desde")
+    if (hasta - desde).days + 1 > _MAX_DIAS_RANGO:
+        raise HTTPException(status_code=400, detail=f"El rango no puede ser mayor a {_MAX_DIAS_RANGO} días")
+    dias = CajaService.resumen_rango(db, desde, hasta)
+    return {
+        "desde": desde.isoformat(),
+        "hasta": hasta.isoformat(),
+        "total_entradas": round(sum(d["total_entradas"] for d in dias), 2),
+        "total_salidas": round(sum(d["total_salidas"] for d in dias), 2),
+        "dias": dias,
+    }
+
+
 @router.get("/caja/cortes", response_model=List[dict])
 def list_cortes(
     db: Session = Depends(get_db),
@@ -221,15 +233,10 @@ def create_corte(
     if existente:
         raise HTTPException(status_code=400, detail=f"Ya existe un corte {tipo_val} para la fecha {fecha}")
 
-    entradas = db.query(func.coalesce(func.sum(MovimientoCaja.monto), 0)).filter(
-        MovimientoCaja.fecha == fecha,
-        MovimientoCaja.tipo == TipoMovimientoCajaEnum.ENTRADA,
-    ).scalar() or 0
-    salidas = db.query(func.coalesce(func.sum(MovimientoCaja.monto), 0)).filter(
-        MovimientoCaja.fecha == fecha,
-        MovimientoCaja.tipo == TipoMovimientoCajaEnum.SALIDA,
-    ).scalar() or 0
-    saldo_inicial = body.saldo_inicial if body.saldo_inicial is not None else _saldo_inicial_para_fecha(db, fecha)
+    resumen = CajaService.resumen_dia(db, fecha)
+    entradas = resumen["total_entradas"]
+    salidas = resumen["total_salidas"]
+    saldo_inicial = body.saldo_inicial if body.saldo_inicial is not None else resumen["saldo_inicial"]
     saldo_final = float(saldo_inicial) + float(entradas) - float(salidas)
 
     corte = CorteCaja(
@@ -243,6 +250,7 @@ def create_corte(
         usuario_cierre_id=current_user.id if tipo_val == "CIERRE_DIA" else None,
     )
     db.add(corte)
+    CajaService.registrar_corte(db, fecha, corte.saldo_inicial, corte.saldo_final)
     db.commit()
     db.refresh(corte)
 
@@ -6,6 +6,7 @@ from app.models.user import User
 from app.models.cliente import Cliente
 from app.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteResponse
 from app.core.dependencies import get_current_active_user, require_role
+from app.services.cliente_busqueda_service import ClienteBusquedaService
 
 router = APIRouter(tags=["clientes"])
 
@@ -24,24 +25,15 @@ def get_clientes(
     """
     query = db.query(Cliente)
     
-    # Filtrar por búsqueda
-    if buscar:
-        search_filter = f"%{buscar}%"
-        query = query.filter(
-            (Cliente.nombre.ilike(search_filter)) |
-            (Cliente.apellido_paterno.ilike(search_filter)) |
-            (Cliente.apellido_materno.ilike(search_filter)) |
-            (Cliente.razon_social.ilike(search_filter)) |
-            (Cliente.rfc.ilike(search_filter)) |
-            (Cliente.telefono.ilike(search_filter)) |
-            (Cliente.email.ilike(search_filter))
-        )
-    
     # Filtrar por estado
     if activo is not None:
         query = query.filter(Cliente.activo == activo)
     
-    clientes = query.order_by(Cliente.created_at.desc()).offset(skip).limit(limit).all()
+    # Búsqueda por texto (FULLTEXT sobre clientes.busqueda, ordenada por relevancia)
+    if buscar and buscar.strip():
+        clientes = ClienteBusquedaService.buscar(db, query, buscar, skip=skip, limit=limit)
+    else:
+        clientes = query.order_by(Cliente.created_at.desc()).offset(skip).limit(limit).all()
     
     # Agregar campos calculados
     result = []
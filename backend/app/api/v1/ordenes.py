@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Query, Response
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, case
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+import io
 import os
-import shutil
+import base64
 import logging
 from pydantic import ValidationError as PydanticValidationError
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.models import (
     OrdenTrabajo, Cliente, User, CategoriaOrden, SubcategoriaOrden,
     SubtareaOrden, SubOrdenTrabajo, EstadoOrdenEnum, PrioridadEnum, OrdenFotoEntrada, OrdenTrabajoPieza,
-    SubtareaFotoEntrada,
+    SubtareaFotoEntrada, EstadoSubtareaEnum,
 )
 from app.schemas import (
     OrdenTrabajoCreate,
@@ -18,6 +20,7 @@ from app.schemas import (
     OrdenTrabajoResponse,
     OrdenTrabajoListResponse,
     CambiarEstadoOrden,
+    OrdenesPdfLote,
     CategoriaOrdenCreate,
     CategoriaOrdenResponse,
     SubcategoriaOrdenCreate,
@@ -31,6 +34,9 @@ from app.schemas import (
     SubOrdenTrabajoResponse,
 )
 from app.core.dependencies import get_current_user, require_role
+from app.services.folio_service import FolioService
+from app.services.foto_store_service import FotoStoreService
+from app.services.image_service import ImageService
 
 router = APIRouter(tags=["ordenes"])
 
@@ -63,7 +69,9 @@ def _orden_to_response_dict(db: Session, orden, subtareas_with_tech=True, includ
                 d[k] = None
         else:
             d[k] = v
-    d["fotos_entrada_list"] = _fotos_entrada_list(db, orden)
+    fotos_orden, fotos_por_subtarea = _cargar_fotos_entrada(db, orden, incluir_subtareas=subtareas_with_tech)
+    d["fotos_entrada_list"] = fotos_orden
+    d["fotos_entrada_variantes"] = [ImageService.variantes_url(u) for u in fotos_orden]
     d["cliente_nombre"] = getattr(orden.cliente, "nombre_completo", None) if getattr(orden, "cliente", None) else None
     d["sucursal_nombre"] = getattr(orden.sucursal, "nombre_sucursal", None) if getattr(orden, "sucursal", None) else None
     d["categoria_nombre"] = getattr(orden.categoria, "nombre", None) if getattr(orden, "categoria", None) else None
@@ -89,8 +97,8 @@ def _orden_to_response_dict(db: Session, orden, subtareas_with_tech=True, includ
             est = st.estado
             st_d["estado"] = est.value if hasattr(est, "value") else (est if est and str(est).strip() else "PENDIENTE")
             st_d["tecnico_nombre"] = st.tecnico.nombre_completo if st.tecnico else None
-            fotos_st = db.query(SubtareaFotoEntrada).filter(SubtareaFotoEntrada.subtarea_id == st.id).all()
-            st_d["fotos_entrada_list"] = [f.url for f in fotos_st]
+            st_d["fotos_entrada_list"] = fotos_por_subtarea.get(st.id, [])
+            st_d["fotos_entrada_variantes"] = [ImageService.variantes_url(u) for u in st_d["fotos_entrada_list"]]
             d["subtareas"].append(st_d)
     else:
         d["subtareas"] = []
@@ -181,40 +189,137 @@ def _orden_to_response_dict(db: Session, orden, subtareas_with_tech=True, includ
     return d
 
 
+def _opciones_detalle_orden() -> tuple:
+    """
+    Carga de todo lo que usa _orden_to_response_dict con include_gastos (detalle y PDFs).
+    Las relaciones a uno van en el mismo SELECT (joinedload); las colecciones con selectinload,
+    una consulta IN por colección, para no multiplicar filas (subtareas x gastos x piezas por orden)
+    al cargar hasta 100 órdenes en el PDF por lote.
+    """
+    return (
+        joinedload(OrdenTrabajo.cliente),
+        joinedload(OrdenTrabajo.sucursal),
+        joinedload(OrdenTrabajo.tecnico),
+        joinedload(OrdenTrabajo.usuario_recepcion),
+        joinedload(OrdenTrabajo.categoria),
+        joinedload(OrdenTrabajo.subcategoria),
+        selectinload(OrdenTrabajo.subtareas).joinedload(SubtareaOrden.tecnico),
+        selectinload(OrdenTrabajo.sub_ordenes),
+        selectinload(OrdenTrabajo.gastos),
+        selectinload(OrdenTrabajo.piezas_usadas).joinedload(OrdenTrabajoPieza.pieza),
+    )
+
+
+def _cargar_fotos_entrada(db: Session, orden, incluir_subtareas: bool = True) -> Tuple[List[str], Dict[int, List[str]]]:
+    """
+    Carga en bloque las fotos de entrada de la OT y de todas sus subtareas.
+    Siempre son 2 queries (una por tabla con IN), sin importar cuántas subtareas tenga la orden.
+    Devuelve (urls de la OT, {subtarea_id: [urls]}).
+    """
+    fotos_orden = _fotos_entrada_list(db, orden)
+    fotos_por_subtarea: Dict[int, List[str]] = {}
+    if not incluir_subtareas:
+        return fotos_orden, fotos_por_subtarea
+    subtarea_ids = [st.id for st in (getattr(orden, "subtareas", None) or [])]
+    if subtarea_ids:
+        rows = (
+            db.query(SubtareaFotoEntrada.subtarea_id, SubtareaFotoEntrada.url)
+            .filter(SubtareaFotoEntrada.subtarea_id.in_(subtarea_ids))
+            .order_by(SubtareaFotoEntrada.id)
+            .all()
+        )
+        for subtarea_id, url in rows:
+            fotos_por_subtarea.setdefault(subtarea_id, []).append(url)
+    return fotos_orden, fotos_por_subtarea
+
+
+def _urls_fotos_orden(db: Session, orden_id: int, subtarea_ids: Optional[List[int]] = None) -> List[str]:
+    """URLs de todas las fotos de la orden (o solo de las subtareas indicadas), antes de borrarla."""
+    urls: List[str] = []
+    if subtarea_ids is None:
+        urls += [u for (u,) in db.query(OrdenFotoEntrada.url).filter(OrdenFotoEntrada.orden_id == orden_id)]
+        urls += [u for row in db.query(OrdenTrabajo.foto_entrada, OrdenTrabajo.foto_salida).filter(OrdenTrabajo.id == orden_id) for u in row if u]
+        subtarea_ids = [i for (i,) in db.query(SubtareaOrden.id).filter(SubtareaOrden.orden_trabajo_id == orden_id)]
+    if subtarea_ids:
+        urls += [u for (u,) in db.query(SubtareaFotoEntrada.url).filter(SubtareaFotoEntrada.subtarea_id.in_(subtarea_ids))]
+    return urls
+
+
+def _liberar_fotos(urls: List[str]) -> None:
+    """Borra del disco las fotos que quedaron sin referencias (BackgroundTasks, con sesión propia)."""
+    db = SessionLocal()
+    try:
+        FotoStoreService.liberar(db, urls)
+    except Exception:
+        logging.exception("Error liberando fotos huérfanas")
+    finally:
+        db.close()
+
+
 def _fotos_entrada_list(db: Session, orden) -> List[str]:
     """Obtiene la lista completa de URLs de fotos de entrada (todos los roles, sin límite)."""
     orden_id = orden.id if hasattr(orden, "id") else int(orden)
     rows = (
-        db.query(OrdenFotoEntrada)
+        db.query(OrdenFotoEntrada.url)
         .filter(OrdenFotoEntrada.orden_id == orden_id)
         .order_by(OrdenFotoEntrada.id)
         .all()
     )
     if rows:
-        return [r.url for r in rows]
+        return [url for (url,) in rows]
     if hasattr(orden, "foto_entrada") and orden.foto_entrada:
         return [orden.foto_entrada]
     return []
 
 
+def _porcentajes_completado(db: Session, orden_ids: List[int]) -> Dict[int, int]:
+    """
+    Porcentaje de subtareas completadas por OT, calculado en SQL con un solo GROUP BY
+    (misma fórmula que OrdenTrabajo.porcentaje_completado, sin cargar las subtareas).
+    """
+    if not orden_ids:
+        return {}
+    rows = (
+        db.query(
+            SubtareaOrden.orden_trabajo_id,
+            func.count(SubtareaOrden.id),
+            func.sum(case((SubtareaOrden.estado == EstadoSubtareaEnum.COMPLETADA, 1), else_=0)),
+        )
+        .filter(SubtareaOrden.orden_trabajo_id.in_(orden_ids))
+        .group_by(SubtareaOrden.orden_trabajo_id)
+        .all()
+    )
+    return {
+        orden_id: int((int(completadas or 0) / total) * 100) if total else 0
+        for orden_id, total, completadas in rows
+    }
+
+
+def _encode_cursor_orden(orden) -> str:
+    """Cursor opaco para paginar /ordenes por (fecha_recepcion, id)."""
+    raw = f"{orden.fecha_recepcion.isoformat()},{orden.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor_orden(cursor: str) -> Tuple[datetime, int]:
+    """Decodifica el cursor de _encode_cursor_orden; 400 si no es válido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        fecha_str, id_str = raw.rsplit(",", 1)
+        return datetime.fromisoformat(fecha_str), int(id_str)
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación no válido")
+
+
 # Crear directorio para fotos si no existe
 UPLOAD_DIR = "uploads/ordenes"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
 def generar_folio(db: Session) -> str:
-    """Genera un folio único para la orden de trabajo"""
-    from datetime import datetime
-    
-    anio_actual = datetime.now().year
-    count = db.query(OrdenTrabajo).filter(
-        OrdenTrabajo.folio.like(f"OT-{anio_actual}-%")
-    ).count()
-    
-    numero = count + 1
-    folio = f"OT-{anio_actual}-{numero:04d}"
-    
-    return folio
+    """Genera un folio único para la orden de trabajo (OT-AÑO-XXXX). Se confirma con el commit de la orden."""
+    return FolioService.siguiente_folio(db, "OT", OrdenTrabajo.folio, ancho=4)
 
 
 # ==================== ENDPOINTS DE CATEGORÍAS ====================
@@ -278,8 +383,10 @@ def create_subcategoria(
 
 @router.get("/ordenes", response_model=List[OrdenTrabajoListResponse])
 def get_ordenes(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = Query(None, description="Cursor devuelto en X-Next-Cursor; si se envía se ignora skip"),
     estatus: Optional[str] = None,
     solo_activas: bool = Query(False, description="Solo OT no entregadas/finalizadas (para gastos, etc.)"),
     cliente_id: Optional[int] = None,
@@ -298,7 +405,6 @@ def get_ordenes(
         joinedload(OrdenTrabajo.usuario_recepcion),
         joinedload(OrdenTrabajo.categoria),
         joinedload(OrdenTrabajo.subcategoria),
-        joinedload(OrdenTrabajo.subtareas)
     )
     
     # Si es técnico, solo puede ver sus propias órdenes asignadas (nunca las de otros)
@@ -335,7 +441,20 @@ def get_ordenes(
             (Cliente.nombre.ilike(search_filter))
         )
     
-    ordenes = query.order_by(OrdenTrabajo.fecha_recepcion.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(OrdenTrabajo.fecha_recepcion.desc(), OrdenTrabajo.id.desc())
+    # Paginación por cursor (keyset): usa el índice (fecha_recepcion, id) en lugar de OFFSET
+    if after:
+        fecha_cursor, id_cursor = _decode_cursor_orden(after)
+        query = query.filter(
+            (OrdenTrabajo.fecha_recepcion < fecha_cursor) |
+            ((OrdenTrabajo.fecha_recepcion == fecha_cursor) & (OrdenTrabajo.id < id_cursor))
+        )
+    else:
+        query = query.offset(skip)
+    ordenes = query.limit(limit).all()
+    if ordenes and len(ordenes) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor_orden(ordenes[-1])
+    porcentajes = _porcentajes_completado(db, [o.id for o in ordenes])
     
     # Preparar respuesta (estatus/prioridad pueden ser enum o string según cómo los guarde la BD)
     def _estatus_val(o):
@@ -364,7 +483,7 @@ def get_ordenes(
                 "precio_final": orden.precio_final,
                 "dias_desde_recepcion": orden.dias_desde_recepcion,
                 "esta_retrasada": orden.esta_retrasada,
-                "porcentaje_completado": orden.porcentaje_completado
+                "porcentaje_completado": porcentajes.get(orden.id, 0)
             }
             result.append(OrdenTrabajoListResponse(**orden_dict))
         except Exception as e:
@@ -382,18 +501,7 @@ def get_orden(
     current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"]))
 ):
     """Obtener una orden de trabajo específica"""
-    orden = db.query(OrdenTrabajo).options(
-        joinedload(OrdenTrabajo.cliente),
-        joinedload(OrdenTrabajo.sucursal),
-        joinedload(OrdenTrabajo.tecnico),
-        joinedload(OrdenTrabajo.usuario_recepcion),
-        joinedload(OrdenTrabajo.categoria),
-        joinedload(OrdenTrabajo.subcategoria),
-        joinedload(OrdenTrabajo.subtareas).joinedload(SubtareaOrden.tecnico),
-        joinedload(OrdenTrabajo.sub_ordenes),
-        joinedload(OrdenTrabajo.gastos),
-        joinedload(OrdenTrabajo.piezas_usadas).joinedload(OrdenTrabajoPieza.pieza),
-    ).filter(OrdenTrabajo.id == orden_id).first()
+    orden = db.query(OrdenTrabajo).options(*_opciones_detalle_orden()).filter(OrdenTrabajo.id == orden_id).first()
     
     if not orden:
         raise HTTPException(status_code=404, detail="Orden de trabajo no encontrada")
@@ -407,6 +515,73 @@ def get_orden(
     return OrdenTrabajoResponse(**orden_dict)
 
 
+def _validar_tipo_pdf(tipo: Optional[str]) -> None:
+    from app.utils.pdf_orden import TIPO_ENTREGA, TIPO_RECEPCION
+
+    if tipo is not None and tipo not in (TIPO_RECEPCION, TIPO_ENTREGA):
+        raise HTTPException(status_code=400, detail=f"tipo debe ser '{TIPO_RECEPCION}' o '{TIPO_ENTREGA}'")
+
+
+def _respuesta_pdf(ordenes_dict: List[dict], tipo: Optional[str], nombre: str) -> Response:
+    # ReportLab/Pillow se cargan con el primer PDF, no al arrancar el worker
+    from app.utils.pdf_orden import generar_pdf_ordenes
+
+    buffer = io.BytesIO()
+    generar_pdf_ordenes(ordenes_dict, buffer, tipo)
+    return Response(
+        content=buffer.getvalue(),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'inline; filename="{nombre}"'},
+    )
+
+
+@router.post("/ordenes/pdf/lote")
+def get_ordenes_pdf_lote(
+    lote: OrdenesPdfLote,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"]))
+):
+    """
+    Comprobantes de varias órdenes en un solo PDF (una por página, en el orden pedido).
+    Las órdenes se cargan con una sola consulta y el documento se arma en una pasada.
+    """
+    _validar_tipo_pdf(lote.tipo)
+    ids = list(dict.fromkeys(lote.orden_ids))
+    ordenes = db.query(OrdenTrabajo).options(*_opciones_detalle_orden()).filter(OrdenTrabajo.id.in_(ids)).all()
+    por_id = {o.id: o for o in ordenes}
+    faltantes = [i for i in ids if i not in por_id]
+    if faltantes:
+        raise HTTPException(status_code=404, detail=f"Órdenes no encontradas: {faltantes}")
+    if current_user.rol.value == "TECNICO" and any(o.tecnico_asignado_id != current_user.id for o in ordenes):
+        raise HTTPException(status_code=403, detail="No tienes permiso para ver alguna de las órdenes")
+
+    mask_piezas = getattr(current_user.rol, "value", None) != "ADMIN"
+    ordenes_dict = [
+        _orden_to_response_dict(db, por_id[i], include_gastos=True, mask_piezas_price=mask_piezas) for i in ids
+    ]
+    return _respuesta_pdf(ordenes_dict, lote.tipo, f"ordenes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+
+
+@router.get("/ordenes/{orden_id}/pdf")
+def get_orden_pdf(
+    orden_id: int,
+    tipo: Optional[str] = Query(None, description="'recepcion' o 'entrega'; por defecto según el estado"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"]))
+):
+    """Comprobante de recepción o entrega de una orden de trabajo en PDF"""
+    _validar_tipo_pdf(tipo)
+    orden = db.query(OrdenTrabajo).options(*_opciones_detalle_orden()).filter(OrdenTrabajo.id == orden_id).first()
+    if not orden:
+        raise HTTPException(status_code=404, detail="Orden de trabajo no encontrada")
+    if current_user.rol.value == "TECNICO" and orden.tecnico_asignado_id != current_user.id:
+        raise HTTPException(status_code=403, detail="No tienes permiso para ver esta orden")
+
+    mask_piezas = getattr(current_user.rol, "value", None) != "ADMIN"
+    orden_dict = _orden_to_response_dict(db, orden, include_gastos=True, mask_piezas_price=mask_piezas)
+    return _respuesta_pdf([orden_dict], tipo, f"{orden.folio}.pdf")
+
+
 @router.get("/ordenes/{orden_id}/fotos")
 def get_orden_fotos(
     orden_id: int,
@@ -420,7 +595,7 @@ def get_orden_fotos(
     if current_user.rol.value == "TECNICO" and orden.tecnico_asignado_id != current_user.id:
         raise HTTPException(status_code=403, detail="No tienes permiso para ver esta orden")
     fotos = _fotos_entrada_list(db, orden)
-    return {"fotos_entrada_list": fotos}
+    return {"fotos_entrada_list": fotos, "fotos_entrada_variantes": [ImageService.variantes_url(u) for u in fotos]}
 
 
 @router.post("/ordenes", response_model=OrdenTrabajoResponse, status_code=status.HTTP_201_CREATED)
@@ -775,8 +950,9 @@ def delete_sub_orden(
 
 
 @router.post("/ordenes/{orden_id}/foto")
-async def upload_foto(
+def upload_foto(
     orden_id: int,
+    background_tasks: BackgroundTasks,
     tipo: str = Query(..., description="Tipo de foto: 'entrada' o 'salida'"),
     file: UploadFile = File(..., description="Archivo de imagen"),
     db: Session = Depends(get_db),
@@ -796,28 +972,34 @@ async def upload_foto(
     if tipo not in ["entrada", "salida"]:
         raise HTTPException(status_code=400, detail="Tipo debe ser 'entrada' o 'salida'")
     
-    # Generar nombre único
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{db_orden.folio}_{tipo}_{timestamp}_{file.filename}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    
-    # Guardar archivo
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Guardar en el almacén por contenido (por bloques, con límite de tamaño; el endpoint corre en el threadpool)
+    guardado = FotoStoreService.guardar(file.file)
+    url = guardado["url"]
+    if not guardado["duplicado"]:
+        # Miniatura y variantes (thumb/medium/webp) después de responder
+        background_tasks.add_task(ImageService.generar_variantes, guardado["path"])
     
     # Actualizar base de datos
-    url = f"/uploads/ordenes/{filename}"
+    foto_salida_anterior = None
     if tipo == "entrada":
-        # Añadir fila en orden_fotos_entrada (múltiples fotos sin alterar tabla ordenes_trabajo)
-        db.add(OrdenFotoEntrada(orden_id=orden_id, url=url))
+        # Añadir fila en orden_fotos_entrada (múltiples fotos sin alterar tabla ordenes_trabajo); la misma imagen no se repite
+        ya_existe = db.query(OrdenFotoEntrada.id).filter(
+            OrdenFotoEntrada.orden_id == orden_id, OrdenFotoEntrada.url == url
+        ).first()
+        if not ya_existe:
+            db.add(OrdenFotoEntrada(orden_id=orden_id, url=url))
         if not db_orden.foto_entrada:
             db_orden.foto_entrada = url
     else:
+        if db_orden.foto_salida != url:
+            foto_salida_anterior = db_orden.foto_salida
         db_orden.foto_salida = url
     
     db.commit()
+    if foto_salida_anterior:
+        background_tasks.add_task(_liberar_fotos, [foto_salida_anterior])
     
-    return {"message": "Foto subida correctamente", "url": f"/uploads/ordenes/{filename}"}
+    return {"message": "Foto subida correctamente", "url": url, "size": guardado["size"], "sha256": guardado["sha256"]}
 
 
 # ==================== ENDPOINTS DE SUBTAREAS ====================
@@ -904,6 +1086,7 @@ def update_subtarea(
 @router.delete("/subtareas/{subtarea_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_subtarea(
     subtarea_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["ADMIN", "RECEPCION"]))
 ):
@@ -913,8 +1096,11 @@ def delete_subtarea(
     if not db_subtarea:
         raise HTTPException(status_code=404, detail="Subtarea no encontrada")
     
+    urls_fotos = _urls_fotos_orden(db, db_subtarea.orden_trabajo_id, subtarea_ids=[subtarea_id])
     db.delete(db_subtarea)
     db.commit()
+    # Las fotos que ya no use ninguna otra orden/subtarea se borran del disco
+    background_tasks.add_task(_liberar_fotos, urls_fotos)
     
     return None
 
@@ -932,12 +1118,14 @@ def get_subtarea_fotos(
     if current_user.rol.value == "TECNICO" and st.orden_trabajo.tecnico_asignado_id != current_user.id:
         raise HTTPException(status_code=403, detail="No tienes permiso para ver esta subtarea")
     fotos = db.query(SubtareaFotoEntrada).filter(SubtareaFotoEntrada.subtarea_id == subtarea_id).all()
-    return {"fotos_entrada_list": [f.url for f in fotos]}
+    urls = [f.url for f in fotos]
+    return {"fotos_entrada_list": urls, "fotos_entrada_variantes": [ImageService.variantes_url(u) for u in urls]}
 
 
 @router.post("/subtareas/{subtarea_id}/foto")
-async def upload_subtarea_foto(
+def upload_subtarea_foto(
     subtarea_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="Archivo de imagen"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"]))
@@ -948,21 +1136,23 @@ async def upload_subtarea_foto(
         raise HTTPException(status_code=404, detail="Subtarea no encontrada")
     if current_user.rol.value == "TECNICO" and st.orden_trabajo.tecnico_asignado_id != current_user.id:
         raise HTTPException(status_code=403, detail="No tienes permiso para subir fotos a esta subtarea")
-    folio = getattr(st.orden_trabajo, "folio", "OT") or "OT"
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{folio}_subtarea_{subtarea_id}_{timestamp}_{file.filename}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    url = f"/uploads/ordenes/{filename}"
-    db.add(SubtareaFotoEntrada(subtarea_id=subtarea_id, url=url))
-    db.commit()
-    return {"message": "Foto subida correctamente", "url": url}
+    guardado = FotoStoreService.guardar(file.file)
+    url = guardado["url"]
+    if not guardado["duplicado"]:
+        background_tasks.add_task(ImageService.generar_variantes, guardado["path"])
+    ya_existe = db.query(SubtareaFotoEntrada.id).filter(
+        SubtareaFotoEntrada.subtarea_id == subtarea_id, SubtareaFotoEntrada.url == url
+    ).first()
+    if not ya_existe:
+        db.add(SubtareaFotoEntrada(subtarea_id=subtarea_id, url=url))
+        db.commit()
+    return {"message": "Foto subida correctamente", "url": url, "size": guardado["size"], "sha256": guardado["sha256"]}
 
 
 @router.delete("/ordenes/{orden_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_orden(
     orden_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["ADMIN"]))
 ):
@@ -979,7 +1169,10 @@ def delete_orden(
             detail="Solo se pueden eliminar órdenes en estado RECIBIDO"
         )
     
+    urls_fotos = _urls_fotos_orden(db, orden_id)
     db.delete(db_orden)
     db.commit()
+    # Las fotos que ya no use ninguna otra orden/subtarea se borran del disco
+    background_tasks.add_task(_liberar_fotos, urls_fotos)
     
     return None
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from decimal import Decimal
 
 from app.database import get_db
-from app.models import Pieza, OrdenTrabajoPieza, OrdenTrabajo, CatalogoPieza, SubcatalogoPieza, SubOrdenTrabajo
+from app.models import (
+    Pieza, OrdenTrabajoPieza, OrdenTrabajo, CatalogoPieza, SubcatalogoPieza, SubOrdenTrabajo, MovimientoInventario,
+)
 from app.models.user import User
 from app.schemas.pieza import (
     PiezaCreate,
@@ -18,18 +21,23 @@ from app.schemas.pieza import (
     OrdenTrabajoPiezaCreate,
     OrdenTrabajoPiezaUpdate,
     OrdenTrabajoPiezaResponse,
+    OrdenTrabajoPiezasLote,
+    OrdenTrabajoPiezasLoteEliminar,
+    MovimientoInventarioResponse,
 )
 from app.core.dependencies import get_current_user, require_role
+from app.services.folio_service import FolioService
+from app.services.inventario_service import InventarioService
+from app.services.pieza_indice_service import PiezaIndiceService
+from app.services.pieza_importacion_service import PiezaImportacionService
+from app.services.reorden_service import ReordenService
 
 router = APIRouter(tags=["piezas-bodega"])
 
 
 def generar_folio_pieza(db: Session) -> str:
-    """Genera folio único para material/pieza: MAT-AÑO-XXXX."""
-    from datetime import datetime
-    anio = datetime.now().year
-    count = db.query(Pieza).filter(Pieza.codigo.like(f"MAT-{anio}-%")).count()
-    return f"MAT-{anio}-{(count + 1):05d}"
+    """Genera folio único para material/pieza: MAT-AÑO-XXXXX. Se confirma con el commit de la pieza."""
+    return FolioService.siguiente_folio(db, "MAT", Pieza.codigo, ancho=5)
 
 
 def _pieza_to_dict(pieza, mask_price: bool = False):
@@ -75,10 +83,16 @@ def list_piezas(
         q = q.filter(Pieza.catalogo_id == catalogo_id)
     if subcatalogo_id is not None:
         q = q.filter(Pieza.subcatalogo_id == subcatalogo_id)
-    if search:
-        t = f"%{search.strip()}%"
-        q = q.filter((Pieza.nombre.ilike(t)) | (Pieza.codigo.ilike(t)))
-    items = q.order_by(Pieza.nombre).offset(skip).limit(limit).all()
+    if search and search.strip():
+        # Índice de trigramas en memoria: filtra, ordena por parecido y pagina sin recorrer la tabla
+        ids = PiezaIndiceService.buscar(
+            search, activo=activo, catalogo_id=catalogo_id, subcatalogo_id=subcatalogo_id, limite=skip + limit, db=db
+        )
+        pagina = ids[skip:skip + limit]
+        por_id = {p.id: p for p in q.filter(Pieza.id.in_(pagina)).all()} if pagina else {}
+        items = [por_id[i] for i in pagina if i in por_id]
+    else:
+        items = q.order_by(Pieza.nombre).offset(skip).limit(limit).all()
     mask = current_user.rol.value != "ADMIN"
     return [_pieza_to_dict(p, mask_price=mask) for p in items]
 
@@ -102,12 +116,67 @@ def create_pieza(
         data["precio"] = Decimal("0.00")
     pieza = Pieza(**data)
     db.add(pieza)
-    db.commit()
+    try:
+        InventarioService.registrar_alta(db, pieza, usuario_id=current_user.id)
+        db.commit()
+    except IntegrityError:
+        # Otro usuario registró el mismo código al mismo tiempo
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Ya existe una pieza con ese código")
     db.refresh(pieza)
+    PiezaIndiceService.actualizar(pieza)
     mask = current_user.rol.value != "ADMIN"
     return _pieza_to_dict(pieza, mask_price=mask)
 
 
+@router.post("/piezas/importar")
+def importar_piezas(
+    file: UploadFile = File(..., description="CSV (o XLSX) con encabezados: codigo, nombre, precio, stock, ..."),
+    solo_validar: bool = Query(False, description="Solo validar y reportar errores, sin guardar"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["ADMIN", "RECEPCION"])),
+):
+    """
+    Importar el catálogo de piezas desde archivo. Las filas válidas se guardan por lotes y las
+    inválidas se reportan con su número de fila. Solo ADMIN importa precios; para los demás van en 0.
+    """
+    return PiezaImportacionService.importar(
+        db,
+        file.file,
+        file.filename,
+        es_admin=current_user.rol.value == "ADMIN",
+        usuario_id=current_user.id,
+        solo_validar=solo_validar,
+    )
+
+
+@router.get("/piezas/reabastecer")
+def list_piezas_reabastecer(
+    catalogo_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["ADMIN", "RECEPCION"])),
+):
+    """
+    Piezas activas cuyo stock llegó a su punto de reorden, de la que se acaba antes a la que dura más.
+    Solo lee piezas: consumo y punto de reorden ya están calculados (ver ReordenService).
+    """
+    q = db.query(Pieza).options(
+        joinedload(Pieza.catalogo),
+        joinedload(Pieza.subcatalogo),
+    ).filter(
+        Pieza.activo == True,
+        Pieza.consumo_diario > 0,
+        Pieza.punto_reorden > 0,
+        Pieza.stock <= Pieza.punto_reorden,
+    )
+    if catalogo_id is not None:
+        q = q.filter(Pieza.catalogo_id == catalogo_id)
+    mask = current_user.rol.value != "ADMIN"
+    resultado = [{**_pieza_to_dict(p, mask_price=mask), **ReordenService.sugerencia(p)} for p in q.all()]
+    resultado.sort(key=lambda r: (r["dias_restantes"] is None, r["dias_restantes"] or 0, r["nombre"]))
+    return resultado
+
+
 @router.get("/piezas/{pieza_id}")
 def get_pieza(
     pieza_id: int,
@@ -142,10 +211,14 @@ def update_pieza(
         other = db.query(Pieza).filter(Pieza.codigo == data["codigo"].strip(), Pieza.id != pieza_id).first()
         if other:
             raise HTTPException(status_code=400, detail="Ya existe otra pieza con ese código")
+    nuevo_stock = data.pop("stock", None)
+    if nuevo_stock is not None:
+        InventarioService.ajustar(db, pieza_id, nuevo_stock, "Ajuste manual de stock", usuario_id=current_user.id)
     for k, v in data.items():
         setattr(pieza, k, v)
     db.commit()
     db.refresh(pieza)
+    PiezaIndiceService.actualizar(pieza)
     return _pieza_to_dict(pieza, mask_price=(current_user.rol.value != "ADMIN"))
 
 
@@ -167,9 +240,31 @@ def delete_pieza(
         )
     db.delete(pieza)
     db.commit()
+    PiezaIndiceService.quitar(pieza_id)
     return None
 
 
+@router.get("/piezas/{pieza_id}/movimientos", response_model=List[MovimientoInventarioResponse])
+def list_movimientos_pieza(
+    pieza_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["ADMIN", "RECEPCION"])),
+):
+    """Historial de movimientos de inventario de una pieza, del más reciente al más antiguo."""
+    if not db.query(Pieza.id).filter(Pieza.id == pieza_id).first():
+        raise HTTPException(status_code=404, detail="Pieza no encontrada")
+    return (
+        db.query(MovimientoInventario)
+        .filter(MovimientoInventario.pieza_id == pieza_id)
+        .order_by(MovimientoInventario.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
 # --- Catálogo y subcatálogo (mecánico) ---
 
 @router.get("/catalogos-pieza", response_model=List[CatalogoPiezaResponse])
@@ -207,6 +302,7 @@ def delete_all_catalogos_pieza(
     """Elimina todas las categorías y subcategorías. Las piezas quedan sin categoría (solo ADMIN)."""
     db.query(CatalogoPieza).delete()
     db.commit()
+    PiezaIndiceService.invalidar()
     return None
 
 
@@ -250,6 +346,7 @@ def delete_catalogo_pieza(
         raise HTTPException(status_code=404, detail="Catálogo no encontrado")
     db.delete(cat)
     db.commit()
+    PiezaIndiceService.invalidar()
     return None
 
 
@@ -320,6 +417,7 @@ def delete_subcatalogo_pieza(
         raise HTTPException(status_code=404, detail="Subcatálogo no encontrado")
     db.delete(sub)
     db.commit()
+    PiezaIndiceService.invalidar()
     return None
 
 
@@ -359,11 +457,6 @@ def add_pieza_to_orden(
         raise HTTPException(status_code=404, detail="Pieza no encontrada")
     if not pieza.activo:
         raise HTTPException(status_code=400, detail="La pieza no está activa")
-    if pieza.stock < body.cantidad:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Stock insuficiente. Disponible: {pieza.stock}, solicitado: {body.cantidad}",
-        )
 
     sub_orden_id = getattr(body, "sub_orden_id", None)
     if sub_orden_id is not None:
@@ -387,8 +480,17 @@ def add_pieza_to_orden(
         cantidad=body.cantidad,
         precio_unitario=precio_unit,
     )
+    restante = InventarioService.descontar(
+        db, pieza.id, body.cantidad, f"Uso en OT {orden.folio}",
+        usuario_id=current_user.id, orden_trabajo_id=orden_id,
+    )
+    if restante is None:
+        disponible = db.query(Pieza.stock).filter(Pieza.id == body.pieza_id).scalar()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Stock insuficiente. Disponible: {disponible}, solicitado: {body.cantidad}",
+        )
     db.add(uso)
-    pieza.stock -= body.cantidad
     db.commit()
     db.refresh(uso)
     db.refresh(pieza)
@@ -398,6 +500,122 @@ def add_pieza_to_orden(
     return OrdenTrabajoPiezaResponse(**resp)
 
 
+@router.post(
+    "/ordenes/{orden_id}/piezas/lote",
+    response_model=List[OrdenTrabajoPiezaResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def add_piezas_to_orden_lote(
+    orden_id: int,
+    body: OrdenTrabajoPiezasLote,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"])),
+):
+    """
+    Agregar varias piezas a una OT en una sola transacción: todas o ninguna.
+    Las piezas se cargan y bloquean con una sola consulta, el stock se descuenta con un solo
+    UPDATE por lote y se hace un único commit. Si alguna no alcanza, el error las lista todas.
+    """
+    orden = db.query(OrdenTrabajo).filter(OrdenTrabajo.id == orden_id).first()
+    if not orden:
+        raise HTTPException(status_code=404, detail="Orden de trabajo no encontrada")
+    if current_user.rol.value == "TECNICO" and orden.tecnico_asignado_id != current_user.id:
+        raise HTTPException(status_code=403, detail="No tienes permiso para modificar esta orden")
+
+    sub_orden_ids = {item.sub_orden_id for item in body.piezas if item.sub_orden_id is not None}
+    if sub_orden_ids:
+        encontradas = {
+            sid for (sid,) in db.query(SubOrdenTrabajo.id).filter(
+                SubOrdenTrabajo.id.in_(sub_orden_ids),
+                SubOrdenTrabajo.orden_trabajo_id == orden_id,
+            ).all()
+        }
+        if encontradas != sub_orden_ids:
+            raise HTTPException(status_code=400, detail="Sub-orden no encontrada o no pertenece a esta OT")
+
+    cantidades = {}
+    for item in body.piezas:
+        cantidades[item.pieza_id] = cantidades.get(item.pieza_id, 0) + item.cantidad
+    piezas = InventarioService.bloquear(db, cantidades)
+    faltantes = [pid for pid in cantidades if pid not in piezas]
+    if faltantes:
+        raise HTTPException(status_code=404, detail=f"Pieza(s) no encontrada(s): {faltantes}")
+    inactivas = [piezas[pid].nombre for pid in cantidades if not piezas[pid].activo]
+    if inactivas:
+        raise HTTPException(status_code=400, detail=f"Pieza(s) no activa(s): {', '.join(inactivas)}")
+    insuficientes = [
+        f"{piezas[pid].nombre} (disponible: {piezas[pid].stock}, solicitado: {n})"
+        for pid, n in cantidades.items() if piezas[pid].stock < n
+    ]
+    if insuficientes:
+        raise HTTPException(status_code=400, detail=f"Stock insuficiente: {'; '.join(insuficientes)}")
+
+    es_admin = current_user.rol.value == "ADMIN"
+    usos = [
+        OrdenTrabajoPieza(
+            orden_trabajo_id=orden_id,
+            sub_orden_id=item.sub_orden_id,
+            pieza_id=item.pieza_id,
+            cantidad=item.cantidad,
+            precio_unitario=(
+                item.precio_unitario if es_admin and item.precio_unitario is not None
+                else piezas[item.pieza_id].precio
+            ),
+        )
+        for item in body.piezas
+    ]
+    InventarioService.descontar_lote(
+        db, piezas, cantidades, f"Uso en OT {orden.folio}", usuario_id=current_user.id, orden_trabajo_id=orden_id,
+    )
+    db.add_all(usos)
+    db.flush()
+    ids = [u.id for u in usos]
+    db.commit()
+
+    por_id = {
+        u.id: u
+        for u in db.query(OrdenTrabajoPieza).options(joinedload(OrdenTrabajoPieza.pieza))
+        .filter(OrdenTrabajoPieza.id.in_(ids)).all()
+    }
+    return [OrdenTrabajoPiezaResponse(**_uso_to_response(por_id[i], mask_price=not es_admin)) for i in ids]
+
+
+@router.post("/ordenes/{orden_id}/piezas/lote/eliminar", status_code=status.HTTP_204_NO_CONTENT)
+def remove_piezas_from_orden_lote(
+    orden_id: int,
+    body: OrdenTrabajoPiezasLoteEliminar,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"])),
+):
+    """Quitar varios usos de pieza de la OT en una sola transacción. Devuelve sus cantidades al stock."""
+    orden = db.query(OrdenTrabajo).filter(OrdenTrabajo.id == orden_id).first()
+    if not orden:
+        raise HTTPException(status_code=404, detail="Orden de trabajo no encontrada")
+    if current_user.rol.value == "TECNICO" and orden.tecnico_asignado_id != current_user.id:
+        raise HTTPException(status_code=403, detail="No tienes permiso para modificar esta orden")
+
+    uso_ids = set(body.uso_ids)
+    usos = (
+        db.query(OrdenTrabajoPieza)
+        .filter(OrdenTrabajoPieza.id.in_(uso_ids), OrdenTrabajoPieza.orden_trabajo_id == orden_id)
+        .with_for_update()
+        .all()
+    )
+    faltantes = sorted(uso_ids - {u.id for u in usos})
+    if faltantes:
+        raise HTTPException(status_code=404, detail=f"Uso(s) de pieza no encontrado(s) en esta orden: {faltantes}")
+
+    cantidades = {}
+    for u in usos:
+        cantidades[u.pieza_id] = cantidades.get(u.pieza_id, 0) + u.cantidad
+    InventarioService.devolver_lote(
+        db, cantidades, f"Quitada de OT {orden.folio}", usuario_id=current_user.id, orden_trabajo_id=orden_id,
+    )
+    db.query(OrdenTrabajoPieza).filter(OrdenTrabajoPieza.id.in_(uso_ids)).delete(synchronize_session=False)
+    db.commit()
+    return None
+
+
 @router.patch("/ordenes/{orden_id}/piezas/{uso_id}", response_model=OrdenTrabajoPiezaResponse)
 def update_pieza_en_orden(
     orden_id: int,
@@ -407,10 +625,12 @@ def update_pieza_en_orden(
     current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"])),
 ):
     """Actualizar cantidad y/o precio unitario de un uso de pieza en la OT. Solo ADMIN puede cambiar el precio."""
+    # FOR UPDATE: dos cambios simultáneos al mismo uso no calculan la diferencia sobre la misma cantidad
     uso = (
         db.query(OrdenTrabajoPieza)
         .options(joinedload(OrdenTrabajoPieza.pieza), joinedload(OrdenTrabajoPieza.orden_trabajo))
         .filter(OrdenTrabajoPieza.id == uso_id, OrdenTrabajoPieza.orden_trabajo_id == orden_id)
+        .with_for_update()
         .first()
     )
     if not uso:
@@ -423,13 +643,21 @@ def update_pieza_en_orden(
     if "cantidad" in data:
         nueva_cant = data["cantidad"]
         delta = nueva_cant - uso.cantidad
-        if uso.pieza and delta != 0:
-            if delta > 0 and uso.pieza.stock < delta:
+        concepto = f"Cambio de cantidad en OT {uso.orden_trabajo.folio}"
+        if uso.pieza and delta > 0:
+            restante = InventarioService.descontar(
+                db, uso.pieza_id, delta, concepto, usuario_id=current_user.id, orden_trabajo_id=orden_id,
+            )
+            if restante is None:
+                disponible = db.query(Pieza.stock).filter(Pieza.id == uso.pieza_id).scalar()
                 raise HTTPException(
                     status_code=400,
-                    detail=f"Stock insuficiente. Disponible: {uso.pieza.stock}, necesario extra: {delta}",
+                    detail=f"Stock insuficiente. Disponible: {disponible}, necesario extra: {delta}",
                 )
-            uso.pieza.stock -= delta
+        elif uso.pieza and delta < 0:
+            InventarioService.devolver(
+                db, uso.pieza_id, -delta, concepto, usuario_id=current_user.id, orden_trabajo_id=orden_id,
+            )
         uso.cantidad = nueva_cant
     if "precio_unitario" in data:
         uso.precio_unitario = data["precio_unitario"]
@@ -447,10 +675,12 @@ def remove_pieza_from_orden(
     current_user: User = Depends(require_role(["ADMIN", "RECEPCION", "TECNICO"])),
 ):
     """Quitar un uso de pieza de la OT. Devuelve la cantidad al stock."""
+    # FOR UPDATE: dos cambios simultáneos al mismo uso no calculan la diferencia sobre la misma cantidad
     uso = (
         db.query(OrdenTrabajoPieza)
         .options(joinedload(OrdenTrabajoPieza.pieza), joinedload(OrdenTrabajoPieza.orden_trabajo))
         .filter(OrdenTrabajoPieza.id == uso_id, OrdenTrabajoPieza.orden_trabajo_id == orden_id)
+        .with_for_update()
         .first()
     )
     if not uso:
@@ -458,9 +688,11 @@ def remove_pieza_from_orden(
     if current_user.rol.value == "TECNICO" and uso.orden_trabajo.tecnico_asignado_id != current_user.id:
         raise HTTPException(status_code=403, detail="No tienes permiso para modificar esta orden")
 
-    pieza = uso.pieza
-    if pieza:
-        pieza.stock += uso.cantidad
+    if uso.pieza:
+        InventarioService.devolver(
+            db, uso.pieza_id, uso.cantidad, f"Quitada de OT {uso.orden_trabajo.folio}",
+            usuario_id=current_user.id, orden_trabajo_id=orden_id,
+        )
     db.delete(uso)
     db.commit()
     return None
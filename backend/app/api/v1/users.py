@@ -6,6 +6,7 @@ from app.schemas.user import UserCreate, UserUpdate, UserResponse
 from app.models.user import User, RolEnum
 from app.core.dependencies import get_current_active_user, require_role
 from app.core.security import get_password_hash
+from app.core.auth_cache import invalidar_principal
 
 router = APIRouter(prefix="/users", tags=["Usuarios"])
 
@@ -155,6 +156,7 @@ def update_user(
             setattr(user, field, value)
     
     db.commit()
+    invalidar_principal(user_id)
     db.refresh(user)
     
     return user
@@ -194,6 +196,7 @@ def delete_user(
     
     db.delete(user)
     db.commit()
+    invalidar_principal(user_id)
     
     return None
 
@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import date, datetime
-import os
 from app.database import get_db
 from app.models.user import User
 from app.models.solicitud_vacaciones import SolicitudVacaciones, EstadoSolicitudEnum
@@ -13,8 +12,8 @@ from app.schemas.solicitud_vacaciones import (
     SolicitudVacacionesAprobacion,
     SolicitudVacacionesResponse
 )
-from app.core.dependencies import get_current_active_user, require_role
-from app.utils.pdf_generator import generar_pdf_solicitud_vacaciones
+from app.core.dependencies import get_current_active_user, get_current_user_db, require_role
+from app.services.vacaciones_pdf_service import VacacionesPdfService, PDF_ERROR
 
 router = APIRouter(
     prefix="/vacaciones",
@@ -102,7 +101,7 @@ def get_mis_solicitudes(
 @router.get("/mis-vacaciones", response_model=dict)
 def get_mis_vacaciones(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user_db)
 ):
     """
     Obtener resumen de vacaciones del usuario actual
@@ -126,7 +125,7 @@ def get_mis_vacaciones(
 def crear_solicitud_vacaciones(
     solicitud: SolicitudVacacionesCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user_db)
 ):
     """
     Crear una nueva solicitud de vacaciones
@@ -257,13 +256,6 @@ def aprobar_rechazar_solicitud(
         empleado.actualizar_dias_vacaciones()
         db.add(empleado)
         
-        # Generar PDF
-        try:
-            pdf_path = generar_pdf_solicitud_vacaciones(solicitud, empleado, current_user)
-            solicitud.pdf_url = pdf_path
-        except Exception as e:
-            print(f"Error al generar PDF: {e}")
-            # No fallar la aprobación si hay error en el PDF
     else:
         # Rechazar
         solicitud.estado = EstadoSolicitudEnum.RECHAZADA
@@ -275,8 +267,22 @@ def aprobar_rechazar_solicitud(
     db.commit()
     db.refresh(solicitud)
     
+    # PDF en segundo plano (no bloquea la aprobación); pdf_status indica si ya está listo
+    pdf_status = None
+    if aprobacion.aprobar:
+        try:
+            solicitud.pdf_url = VacacionesPdfService.encolar(solicitud)
+            db.commit()
+            pdf_status = VacacionesPdfService.estado(solicitud.pdf_url)
+        except Exception as e:
+            # No fallar la aprobación si hay error en el PDF
+            db.rollback()
+            print(f"Error al encolar PDF: {e}")
+            pdf_status = PDF_ERROR
+    
     # Agregar nombres para la respuesta
     result = SolicitudVacacionesResponse.from_orm(solicitud).dict()
+    result['pdf_status'] = pdf_status
     result['empleado_nombre'] = solicitud.empleado.nombre_completo if solicitud.empleado else 'N/A'
     if solicitud.aprobada_por_id and solicitud.aprobada_por:
         result['aprobada_por_nombre'] = solicitud.aprobada_por.nombre_completo
@@ -284,6 +290,28 @@ def aprobar_rechazar_solicitud(
     return result
 
 
+@router.get("/{solicitud_id}/pdf-status")
+def estado_pdf_solicitud(
+    solicitud_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Estado del PDF de una solicitud (LISTO, GENERANDO, ERROR o null si no se ha pedido)
+    """
+    solicitud = db.query(SolicitudVacaciones).filter(SolicitudVacaciones.id == solicitud_id).first()
+    
+    if not solicitud:
+        raise HTTPException(status_code=404, detail="Solicitud no encontrada")
+    
+    if (current_user.rol.value != "ADMIN" and 
+        solicitud.empleado_id != current_user.id and 
+        solicitud.aprobada_por_id != current_user.id):
+        raise HTTPException(status_code=403, detail="No tienes permiso para ver este PDF")
+    
+    return {"pdf_status": VacacionesPdfService.estado(solicitud.pdf_url, solicitud), "pdf_url": solicitud.pdf_url}
+
+
 @router.get("/{solicitud_id}/pdf")
 def descargar_pdf_solicitud(
     solicitud_id: int,
@@ -307,28 +335,21 @@ def descargar_pdf_solicitud(
         solicitud.aprobada_por_id != current_user.id):
         raise HTTPException(status_code=403, detail="No tienes permiso para descargar este PDF")
     
-    # Si no existe el PDF, generarlo
-    if not solicitud.pdf_url or not os.path.exists(solicitud.pdf_url):
-        try:
-            pdf_path = generar_pdf_solicitud_vacaciones(
-                solicitud, 
-                solicitud.empleado, 
-                solicitud.aprobada_por if solicitud.aprobada_por_id else None
-            )
-            solicitud.pdf_url = pdf_path
-            db.add(solicitud)
-            db.commit()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error al generar PDF: {str(e)}")
-    
-    # Verificar que el archivo existe
-    if not os.path.exists(solicitud.pdf_url):
-        raise HTTPException(status_code=404, detail="Archivo PDF no encontrado")
+    # PDF del estado actual: si no cambió desde la última vez se sirve el de caché
+    ruta = VacacionesPdfService.encolar(solicitud)
+    if solicitud.pdf_url != ruta:
+        solicitud.pdf_url = ruta
+        db.commit()
+    if VacacionesPdfService.esperar(ruta) is None:
+        estado_pdf = VacacionesPdfService.estado(ruta)
+        if estado_pdf == PDF_ERROR:
+            raise HTTPException(status_code=500, detail="Error al generar PDF")
+        return JSONResponse(status_code=202, content={"pdf_status": estado_pdf, "pdf_url": ruta})
     
     # Retornar el archivo
     filename = f"solicitud_vacaciones_{solicitud.id}.pdf"
     return FileResponse(
-        path=solicitud.pdf_url,
+        path=ruta,
         media_type='application/pdf',
         filename=filename
     )
@@ -20,7 +20,32 @@ try:
         PROJECT_NAME: str = "CRM Talleres"
         VERSION: str = "1.0.0"
         UPLOAD_DIR: str = "uploads"
-        MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5MB
+        MAX_UPLOAD_SIZE: int = 15 * 1024 * 1024  # 15MB (fotos de celular ~10MB)
+        # Si se define (ej. "/_uploads"), /uploads responde con X-Accel-Redirect y nginx envía el archivo
+        UPLOADS_X_ACCEL_PREFIX: str = ""
+        # Generación de PDFs en segundo plano (ver app/services/vacaciones_pdf_service.py)
+        PDF_WORKERS: int = 2
+        PDF_ESPERA_SEGUNDOS: float = 20.0
+        # Pool de conexiones (por worker de uvicorn; total ≈ workers × (DB_POOL_SIZE + DB_MAX_OVERFLOW))
+        DB_POOL_SIZE: int = 5
+        DB_MAX_OVERFLOW: int = 10
+        DB_POOL_TIMEOUT: float = 30.0
+        DB_POOL_RECYCLE: int = 3600
+        # True: ping antes de cada checkout. False: sin ping; las conexiones caídas se detectan al fallar y se descarta el pool
+        DB_POOL_PRE_PING: bool = True
+        # Caché de usuarios autenticados (ver app/core/auth_cache.py); 0 la desactiva
+        AUTH_CACHE_TTL_SECONDS: int = 30
+        AUTH_CACHE_MAX_SIZE: int = 1024
+        # Índice de búsqueda de piezas en memoria (ver app/services/pieza_indice_service.py); 0 = sin caducidad
+        PIEZAS_INDICE_TTL_SECONDS: int = 60
+        # Puntos de reorden (ver app/services/reorden_service.py): días de historial para el consumo
+        # promedio y días de consumo que debe cubrir el stock mientras llega el pedido
+        REORDEN_VENTANA_DIAS: int = 90
+        REORDEN_DIAS_COBERTURA: int = 14
+        # Log de consultas SQL: off | slow | sample | all (ver app/core/query_log.py)
+        SQL_LOG_MODE: str = "off"
+        SQL_SLOW_MS: float = 200.0
+        SQL_SAMPLE_RATE: float = 0.01
 
         model_config = {"env_file": ".env", "extra": "allow"}
 
@@ -40,6 +65,22 @@ except ModuleNotFoundError:
         PROJECT_NAME: str = "CRM Talleres"
         VERSION: str = "1.0.0"
         UPLOAD_DIR: str = "uploads"
-        MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5MB
+        MAX_UPLOAD_SIZE: int = 15 * 1024 * 1024  # 15MB (fotos de celular ~10MB)
+        UPLOADS_X_ACCEL_PREFIX: str = os.getenv("UPLOADS_X_ACCEL_PREFIX", "")
+        PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", "2"))
+        PDF_ESPERA_SEGUNDOS: float = float(os.getenv("PDF_ESPERA_SEGUNDOS", "20"))
+        DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+        DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+        DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").strip().lower() in ("1", "true", "yes")
+        AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+        AUTH_CACHE_MAX_SIZE: int = int(os.getenv("AUTH_CACHE_MAX_SIZE", "1024"))
+        PIEZAS_INDICE_TTL_SECONDS: int = int(os.getenv("PIEZAS_INDICE_TTL_SECONDS", "60"))
+        REORDEN_VENTANA_DIAS: int = int(os.getenv("REORDEN_VENTANA_DIAS", "90"))
+        REORDEN_DIAS_COBERTURA: int = int(os.getenv("REORDEN_DIAS_COBERTURA", "14"))
+        SQL_LOG_MODE: str = os.getenv("SQL_LOG_MODE", "off")
+        SQL_SLOW_MS: float = float(os.getenv("SQL_SLOW_MS", "200"))
+        SQL_SAMPLE_RATE: float = float(os.getenv("SQL_SAMPLE_RATE", "0.01"))
 
     settings = Settings()
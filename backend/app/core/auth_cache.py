@@ -0,0 +1,79 @@
+"""
+Caché de usuarios autenticados (principal) por id.
+
+get_current_user solo necesita id, rol, activo y nombre del usuario del token; en lugar de
+cargar la fila completa de users en cada petición se guarda un Principal ligero durante
+AUTH_CACHE_TTL_SECONDS (LRU con tope AUTH_CACHE_MAX_SIZE).
+
+users.update_user / delete_user invalidan la entrada en el worker que atiende la petición;
+los demás workers de uvicorn la ven caducar a más tardar en AUTH_CACHE_TTL_SECONDS, que es
+la cota de tiempo en que un usuario desactivado aún puede pasar.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import User
+
+
+class Principal:
+    """Datos mínimos del usuario autenticado (no ligado a la sesión de BD)."""
+
+    __slots__ = ("id", "username", "rol", "activo", "nombre_completo")
+
+    def __init__(self, id, username, rol, activo, nombre_completo):
+        self.id = id
+        self.username = username
+        self.rol = rol
+        self.activo = activo
+        self.nombre_completo = nombre_completo
+
+    def __repr__(self):
+        return f"<Principal {self.username} ({self.rol.value})>"
+
+
+_cache: "OrderedDict[int, tuple]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def obtener_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """Principal del usuario desde la caché; si no está o caducó, lo lee de BD (solo 5 columnas)."""
+    ttl = settings.AUTH_CACHE_TTL_SECONDS
+    ahora = time.monotonic()
+    if ttl > 0:
+        with _lock:
+            entrada = _cache.get(user_id)
+            if entrada is not None and entrada[0] > ahora:
+                _cache.move_to_end(user_id)
+                return entrada[1]
+
+    fila = db.query(
+        User.id, User.username, User.rol, User.activo, User.nombre_completo
+    ).filter(User.id == user_id).first()
+    if fila is None:
+        invalidar_principal(user_id)
+        return None
+    principal = Principal(*fila)
+
+    if ttl > 0:
+        with _lock:
+            _cache[user_id] = (ahora + ttl, principal)
+            _cache.move_to_end(user_id)
+            while len(_cache) > settings.AUTH_CACHE_MAX_SIZE:
+                _cache.popitem(last=False)
+    return principal
+
+
+def invalidar_principal(user_id: int) -> None:
+    """Quitar un usuario de la caché (tras editarlo, desactivarlo o eliminarlo)."""
+    with _lock:
+        _cache.pop(user_id, None)
+
+
+def limpiar_cache() -> None:
+    with _lock:
+        _cache.clear()
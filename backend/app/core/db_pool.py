@@ -0,0 +1,81 @@
+"""
+Pool de conexiones con métricas.
+
+QueuePoolConMetricas es un QueuePool que además mide cuánto espera cada checkout por una
+conexión libre y cuántos checkouts terminan en timeout. estadisticas_pool() junta esos
+contadores con el estado actual del pool (conexiones prestadas, overflow) para
+/api/metrics (solo ADMIN). Los valores son por proceso: con --workers 2 cada worker tiene su propio pool.
+"""
+import os
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class QueuePoolConMetricas(QueuePool):
+    """QueuePool que acumula tiempos de espera de checkout."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metricas_lock = threading.Lock()
+        self._reiniciar_metricas()
+
+    def _reiniciar_metricas(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total_ms = 0.0
+        self.espera_max_ms = 0.0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._metricas_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            espera_ms = (time.perf_counter() - inicio) * 1000
+            with self._metricas_lock:
+                self.checkouts += 1
+                self.espera_total_ms += espera_ms
+                if espera_ms > self.espera_max_ms:
+                    self.espera_max_ms = espera_ms
+
+    def recreate(self):
+        # dispose()/recreate() crean un pool nuevo; se conservan los contadores acumulados
+        nuevo = super().recreate()
+        nuevo.checkouts = self.checkouts
+        nuevo.timeouts = self.timeouts
+        nuevo.espera_total_ms = self.espera_total_ms
+        nuevo.espera_max_ms = self.espera_max_ms
+        return nuevo
+
+
+def estadisticas_pool(engine) -> dict:
+    """Estado del pool del engine y métricas de espera acumuladas de este proceso."""
+    pool = engine.pool
+    datos = {
+        "pid": os.getpid(),
+        "pool_class": type(pool).__name__,
+    }
+    if isinstance(pool, QueuePool):
+        datos.update({
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    if isinstance(pool, QueuePoolConMetricas):
+        with pool._metricas_lock:
+            checkouts = pool.checkouts
+            datos.update({
+                "checkouts": checkouts,
+                "checkout_timeouts": pool.timeouts,
+                "checkout_wait_avg_ms": round(pool.espera_total_ms / checkouts, 3) if checkouts else 0.0,
+                "checkout_wait_max_ms": round(pool.espera_max_ms, 3),
+            })
+    return datos
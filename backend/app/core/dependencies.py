@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from jose import JWTError
 from app.database import get_db
 from app.core.security import decode_access_token
+from app.core.auth_cache import Principal, obtener_principal
 from app.models.user import User
 from app.schemas.user import TokenData
 
@@ -14,8 +15,8 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> User:
-    """Obtener usuario actual desde el token"""
+) -> Principal:
+    """Obtener usuario actual desde el token (Principal cacheado: id, username, rol, activo, nombre_completo)"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudo validar las credenciales",
@@ -33,8 +34,8 @@ def get_current_user(
     if username is None or user_id is None:
         raise credentials_exception
     
-    # Buscar usuario en BD
-    user = db.query(User).filter(User.id == user_id).first()
+    # Buscar usuario (caché con TTL, ver app/core/auth_cache.py)
+    user = obtener_principal(db, user_id)
     if user is None:
         raise credentials_exception
     
@@ -48,8 +49,8 @@ def get_current_user(
 
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Verificar que el usuario esté activo"""
     if not current_user.activo:
         raise HTTPException(
@@ -59,9 +60,29 @@ def get_current_active_user(
     return current_user
 
 
+def get_current_user_db(
+    current_user: Principal = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """Fila completa del usuario actual, para endpoints que leen o modifican sus datos (vacaciones, /me)"""
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudo validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not user.activo:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Usuario inactivo"
+        )
+    return user
+
+
 def require_role(required_roles: list[str]):
     """Decorator para requerir roles específicos"""
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    def role_checker(current_user: Principal = Depends(get_current_active_user)) -> Principal:
         if current_user.rol.value not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
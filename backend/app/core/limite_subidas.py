@@ -0,0 +1,65 @@
+"""
+Límite de tamaño de las subidas de fotos antes de recibir el cuerpo.
+
+FastAPI lee el formulario multipart completo (UploadFile lo guarda en un archivo temporal) antes
+de llamar al endpoint, así que el límite de UploadService.guardar_archivo llega tarde: una foto de
+200 MB ya se recibió entera cuando se rechaza. Este middleware ASGI corta antes:
+
+  - Content-Length mayor que el límite: 413 sin leer el cuerpo.
+  - Sin Content-Length (chunked) o con uno falso: cuenta los bytes conforme llegan y responde 413
+    en cuanto se pasa del límite.
+
+Solo aplica a POST de rutas de fotos (sufijo /foto); el límite es settings.MAX_UPLOAD_SIZE más un
+margen para los encabezados del multipart. guardar_archivo sigue validando el tamaño del archivo.
+"""
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+
+from app.config import settings
+
+SUFIJOS_FOTOS = ("/foto",)
+# Encabezados y separadores del multipart alrededor del archivo
+MARGEN_MULTIPART = 64 * 1024
+
+
+def _excedido() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"El archivo excede el tamaño máximo de {settings.MAX_UPLOAD_SIZE // (1024 * 1024)} MB",
+    )
+
+
+class LimiteSubidasMiddleware:
+    """Middleware ASGI puro (no BaseHTTPMiddleware) para no leer el cuerpo antes que el endpoint."""
+
+    def __init__(self, app, sufijos=SUFIJOS_FOTOS):
+        self.app = app
+        self.sufijos = tuple(sufijos)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].rstrip("/").endswith(self.sufijos):
+            await self.app(scope, receive, send)
+            return
+        limite = settings.MAX_UPLOAD_SIZE + MARGEN_MULTIPART
+
+        longitud = dict(scope["headers"]).get(b"content-length")
+        if longitud is not None and longitud.isdigit() and int(longitud) > limite:
+            error = _excedido()
+            respuesta = JSONResponse(status_code=error.status_code, content={"detail": error.detail})
+            respuesta.headers["Connection"] = "close"
+            await respuesta(scope, receive, send)
+            return
+
+        recibidos = 0
+
+        async def receive_limitado():
+            nonlocal recibidos
+            mensaje = await receive()
+            if mensaje["type"] == "http.request":
+                recibidos += len(mensaje.get("body", b""))
+                if recibidos > limite:
+                    # FastAPI deja pasar HTTPException al leer el formulario: responde 413
+                    raise _excedido()
+            return mensaje
+
+        await self.app(scope, receive_limitado, send)
@@ -0,0 +1,92 @@
+"""
+Log estructurado de consultas SQL.
+
+Se engancha a los eventos before_cursor_execute / after_cursor_execute del engine y escribe
+una línea JSON por consulta en el logger "app.sql":
+
+  {"fingerprint": "3f2a9c1b0d4e", "statement": "SELECT ... WHERE id = ?", "duration_ms": 12.4, "rows": 1}
+
+Modos (settings.SQL_LOG_MODE):
+  off    - no se registra nada (default)
+  slow   - solo consultas con duración >= SQL_SLOW_MS
+  sample - una fracción SQL_SAMPLE_RATE de las consultas, más todas las lentas
+  all    - todas las consultas (solo para depuración)
+"""
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("app.sql")
+
+MODOS = ("off", "slow", "sample", "all")
+
+_RE_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_PARAMS = re.compile(r"%\([^)]+\)s|%s|:\w+|\?")
+_RE_LISTAS_IN = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_RE_ESPACIOS = re.compile(r"\s+")
+
+
+def fingerprint(statement: str):
+    """Normaliza la sentencia (literales y parámetros a '?', listas IN colapsadas) y devuelve (hash, texto)."""
+    texto = _RE_CADENAS.sub("?", statement)
+    texto = _RE_PARAMS.sub("?", texto)
+    texto = _RE_NUMEROS.sub("?", texto)
+    texto = _RE_LISTAS_IN.sub("(?)", texto)
+    texto = _RE_ESPACIOS.sub(" ", texto).strip()
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:12], texto
+
+
+def instalar_log_consultas(engine: Engine, modo: str, slow_ms: float = 200.0, sample_rate: float = 0.01) -> bool:
+    """Registra los listeners en el engine según el modo. Devuelve False si el modo es 'off'."""
+    modo = (modo or "off").strip().lower()
+    if modo not in MODOS:
+        raise ValueError(f"SQL_LOG_MODE inválido: {modo!r} (opciones: {', '.join(MODOS)})")
+    if modo == "off":
+        return False
+
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        muestreada = modo == "all" or (modo == "sample" and random.random() < sample_rate)
+        # Por contexto de ejecución: una sentencia que falla no llega a after_cursor_execute y no debe desfasar a las demás
+        conn.info.setdefault("_query_log", {})[id(context)] = (time.perf_counter(), muestreada)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        inicio_muestreo = conn.info.get("_query_log", {}).pop(id(context), None)
+        if inicio_muestreo is None:
+            return
+        inicio, muestreada = inicio_muestreo
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+        if not muestreada and duracion_ms < slow_ms:
+            return
+        huella, texto = fingerprint(statement)
+        logger.info(json.dumps({
+            "fingerprint": huella,
+            "statement": texto[:1000],
+            "duration_ms": round(duracion_ms, 2),
+            "rows": cursor.rowcount,
+            "executemany": executemany,
+            "slow": duracion_ms >= slow_ms,
+        }, ensure_ascii=False))
+
+    @event.listens_for(engine, "handle_error")
+    def _error(contexto):
+        # La sentencia falló: se descarta su inicio para que no quede en conn.info
+        if contexto.connection is not None:
+            contexto.connection.info.get("_query_log", {}).pop(id(contexto.execution_context), None)
+
+    return True
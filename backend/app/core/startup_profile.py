@@ -0,0 +1,128 @@
+"""
+Perfil de arranque del worker (STARTUP_PROFILE=1).
+
+Mide el tiempo de importación de cada módulo cargado desde app/main.py (propio y acumulado, como
+`python -X importtime`) y el tiempo hasta atender la primera petición, y lo imprime en stderr.
+Se activa por variable de entorno y no por app/config.py porque debe instalarse antes de importar
+la configuración y los routers:
+
+    STARTUP_PROFILE=1 uvicorn app.main:app --workers 2
+
+Apagado (por defecto) no instala nada.
+"""
+import importlib.machinery
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+ACTIVO = os.getenv("STARTUP_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+TOP_MODULOS = int(os.getenv("STARTUP_PROFILE_TOP", "25"))
+
+_LOADERS_CRONOMETRADOS = (
+    importlib.machinery.SourceFileLoader,
+    importlib.machinery.SourcelessFileLoader,
+    importlib.machinery.ExtensionFileLoader,
+)
+
+_inicio_importacion: Optional[float] = None
+_fin_importacion: Optional[float] = None
+_tiempos: Dict[str, Tuple[float, float]] = {}  # módulo -> (propio, acumulado) en segundos
+_pila: List[float] = []  # tiempo de módulos hijos del módulo en ejecución
+_primera_peticion_atendida = False
+
+
+def _inicio_proceso() -> Optional[float]:
+    """Epoch de inicio del proceso (Linux, /proc); None si no está disponible."""
+    try:
+        with open("/proc/self/stat") as f:
+            campos = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - (uptime - int(campos[19]) / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _Cronometro:
+    """Finder de sys.meta_path que envuelve exec_module de cada módulo nuevo para medirlo."""
+
+    def __init__(self):
+        self._buscando = False
+
+    def find_spec(self, nombre, path, target=None):
+        if self._buscando:
+            return None
+        self._buscando = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(nombre, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._buscando = False
+        if spec is not None and isinstance(spec.loader, _LOADERS_CRONOMETRADOS):
+            # Los loaders de archivo son una instancia por módulo: basta con envolver el método
+            spec.loader.exec_module = _medir(nombre, spec.loader.exec_module)
+        return spec
+
+
+def _medir(nombre, exec_module):
+    def exec_module_cronometrado(module):
+        _pila.append(0.0)
+        inicio = time.perf_counter()
+        try:
+            exec_module(module)
+        finally:
+            acumulado = time.perf_counter() - inicio
+            hijos = _pila.pop()
+            if _pila:
+                _pila[-1] += acumulado
+            _tiempos[nombre] = (acumulado - hijos, acumulado)
+    return exec_module_cronometrado
+
+
+def iniciar() -> None:
+    """Instala el cronómetro de importaciones. Llamar al inicio de app/main.py, antes de los demás imports."""
+    global _inicio_importacion
+    if not ACTIVO or _inicio_importacion is not None:
+        return
+    _inicio_importacion = time.perf_counter()
+    sys.meta_path.insert(0, _Cronometro())
+
+
+def _imprimir(texto: str) -> None:
+    print(f"[startup-profile pid={os.getpid()}] {texto}", file=sys.stderr, flush=True)
+
+
+def terminar_importacion(app) -> None:
+    """Quita el cronómetro, imprime el reporte de importaciones y registra la medición de la primera petición."""
+    global _fin_importacion
+    if not ACTIVO or _inicio_importacion is None:
+        return
+    _fin_importacion = time.perf_counter()
+    sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, _Cronometro)]
+
+    _imprimir(f"importación de app.main: {(_fin_importacion - _inicio_importacion) * 1000:.0f} ms, "
+              f"{len(_tiempos)} módulos nuevos")
+    _imprimir(f"{'propio ms':>10} {'acum. ms':>10}  módulo")
+    for nombre, (propio, acumulado) in sorted(_tiempos.items(), key=lambda x: -x[1][1])[:TOP_MODULOS]:
+        _imprimir(f"{propio * 1000:>10.1f} {acumulado * 1000:>10.1f}  {nombre}")
+
+    inicio_proceso = _inicio_proceso()
+
+    @app.middleware("http")
+    async def medir_primera_peticion(request, call_next):
+        global _primera_peticion_atendida
+        response = await call_next(request)
+        if not _primera_peticion_atendida:
+            _primera_peticion_atendida = True
+            ahora = time.perf_counter()
+            desde_proceso = f"{time.time() - inicio_proceso:.2f} s desde el inicio del proceso, " if inicio_proceso else ""
+            _imprimir(f"primera petición ({request.method} {request.url.path}) atendida: {desde_proceso}"
+                      f"{ahora - _inicio_importacion:.2f} s desde la importación de app.main, "
+                      f"{ahora - _fin_importacion:.2f} s después de terminar de importar")
+        return response
@@ -2,15 +2,24 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.core.db_pool import QueuePoolConMetricas
+from app.core.query_log import instalar_log_consultas
 
 # Crear engine de base de datos
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=True  # Cambiar a False en producción
+    poolclass=QueuePoolConMetricas,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    echo=False
 )
 
+# Log de consultas (SQL_LOG_MODE=off|slow|sample|all); apagado por defecto
+instalar_log_consultas(engine, settings.SQL_LOG_MODE, settings.SQL_SLOW_MS, settings.SQL_SAMPLE_RATE)
+
 # Crear SessionLocal
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
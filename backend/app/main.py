@@ -1,17 +1,28 @@
-from fastapi import FastAPI
+# Perfil de arranque (STARTUP_PROFILE=1): debe instalarse antes de cualquier otro import
+from app.core import startup_profile
+startup_profile.iniciar()
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+import logging
 import os
 import pathlib
 import traceback
 
 # Importar routers
+from app.api import uploads
 from app.api.v1 import auth, users, vacaciones, incidencias, clientes, ordenes, sucursales, gastos, piezas, caja
 from app.database import engine
-from app.models import OrdenFotoEntrada, Pieza, OrdenTrabajoPieza, CatalogoPieza, SubcatalogoPieza, SubOrdenTrabajo, SubtareaFotoEntrada, CorteCaja, MovimientoCaja, AperturaCaja
+from app.core.db_pool import estadisticas_pool
+from app.core.dependencies import require_role
+from app.core.limite_subidas import LimiteSubidasMiddleware
+from app.services.pieza_indice_service import PiezaIndiceService
+
+logger = logging.getLogger(__name__)
 
 # Orígenes permitidos para CORS
 # En producción definir CORS_ORIGINS en .env (ej: CORS_ORIGINS=http://16.148.80.123:3000,https://tudominio.com)
@@ -72,84 +83,9 @@ app = FastAPI(
 
 
 @app.on_event("startup")
-def startup_create_tables():
-    """Crea tablas/columnas que puedan faltar (sin alterar datos existentes)."""
-    from sqlalchemy import text
-    try:
-        OrdenFotoEntrada.__table__.create(engine, checkfirst=True)
-    except Exception as e:
-        print(f"Nota: orden_fotos_entrada (puede existir ya): {e}")
-    try:
-        SubOrdenTrabajo.__table__.create(engine, checkfirst=True)
-    except Exception as e:
-        print(f"Nota: tabla sub_ordenes_trabajo (puede existir ya): {e}")
-    try:
-        SubtareaFotoEntrada.__table__.create(engine, checkfirst=True)
-    except Exception as e:
-        print(f"Nota: tabla subtarea_fotos_entrada (puede existir ya): {e}")
-    try:
-        CatalogoPieza.__table__.create(engine, checkfirst=True)
-        SubcatalogoPieza.__table__.create(engine, checkfirst=True)
-        Pieza.__table__.create(engine, checkfirst=True)
-        OrdenTrabajoPieza.__table__.create(engine, checkfirst=True)
-    except Exception as e:
-        print(f"Nota: tablas catalogos/subcatalogos/piezas (pueden existir ya): {e}")
-    try:
-        CorteCaja.__table__.create(engine, checkfirst=True)
-        MovimientoCaja.__table__.create(engine, checkfirst=True)
-        AperturaCaja.__table__.create(engine, checkfirst=True)
-    except Exception as e:
-        print(f"Nota: tablas caja (pueden existir ya): {e}")
-    for col in ("sub_orden_id",):
-        try:
-            with engine.begin() as conn:
-                conn.execute(text(f"ALTER TABLE orden_trabajo_piezas ADD COLUMN {col} INT NULL"))
-            print(f"Columna orden_trabajo_piezas.{col} creada.")
-        except Exception as e:
-            err = str(e).lower()
-            if "duplicate column" in err or "already exists" in err or "duplicate column name" in err:
-                pass
-            else:
-                print(f"Nota al añadir orden_trabajo_piezas.{col}: {e}")
-    try:
-        with engine.begin() as conn:
-            conn.execute(text("ALTER TABLE gastos ADD COLUMN sub_orden_id INT NULL"))
-        print("Columna gastos.sub_orden_id creada correctamente.")
-    except Exception as e:
-        if "Duplicate column" in str(e) or "already exists" in str(e).lower():
-            print("Columna gastos.sub_orden_id ya existe.")
-        else:
-            print(f"Nota al añadir sub_orden_id a gastos (puede existir ya): {e}")
-    for col in ("catalogo_id", "subcatalogo_id"):
-        try:
-            with engine.begin() as conn:
-                conn.execute(text(f"ALTER TABLE piezas ADD COLUMN {col} INT NULL"))
-            print(f"Columna piezas.{col} creada.")
-        except Exception as e:
-            err = str(e).lower()
-            if "duplicate column" in err or "already exists" in err or "duplicate column name" in err:
-                pass
-            else:
-                print(f"Nota al añadir piezas.{col}: {e}")
-    # Columna codigo en usuarios (login técnicos): añadir si no existe
-    try:
-        with engine.begin() as conn:
-            conn.execute(text("ALTER TABLE usuarios ADD COLUMN codigo VARCHAR(4) NULL UNIQUE"))
-        print("Columna usuarios.codigo creada correctamente.")
-    except Exception as e:
-        if "Duplicate column" in str(e) or "already exists" in str(e).lower():
-            print("Columna usuarios.codigo ya existe.")
-        else:
-            print(f"Nota al añadir codigo a usuarios (puede existir ya): {e}")
-    try:
-        with engine.begin() as conn:
-            conn.execute(text("ALTER TABLE gastos ADD COLUMN categoria VARCHAR(20) NULL"))
-        print("Columna gastos.categoria creada correctamente.")
-    except Exception as e:
-        if "Duplicate column" in str(e) or "already exists" in str(e).lower():
-            print("Columna gastos.categoria ya existe.")
-        else:
-            print(f"Nota al añadir categoria a gastos (puede existir ya): {e}")
+def startup_indice_piezas():
+    """Índice de búsqueda de piezas en memoria (lectura del catálogo, sin DDL)."""
+    PiezaIndiceService.iniciar()
 
 
 @app.exception_handler(Exception)
@@ -168,6 +104,9 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
     return _add_cors_headers(resp, origin)
 
+# Límite de tamaño de fotos antes de recibir el cuerpo (más interno: sus 413 llevan cabeceras CORS)
+app.add_middleware(LimiteSubidasMiddleware)
+
 # Middleware CORS explícito primero (se ejecuta último = más externo)
 app.add_middleware(EnsureCORSHeadersMiddleware)
 
@@ -186,7 +125,8 @@ uploads_dir = "uploads"
 if not os.path.exists(uploads_dir):
     os.makedirs(uploads_dir)
 
-app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
+# /uploads lo sirve app/api/uploads.py (ETag, caché inmutable, rangos, X-Accel-Redirect)
+app.include_router(uploads.router)
 
 # Health check
 @app.get("/health")
@@ -198,6 +138,12 @@ def health_check():
         "version": "1.0.0"
     }
 
+# Métricas del pool de conexiones de este worker (para dimensionar contra max_connections de MariaDB).
+# Expone detalles internos (pool, pid): solo ADMIN.
+@app.get("/api/metrics")
+def metrics(current_user=Depends(require_role(["ADMIN"]))):
+    return {"db_pool": estadisticas_pool(engine)}
+
 # Incluir routers ANTES de montar el frontend
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
@@ -212,13 +158,13 @@ app.include_router(caja.router, prefix="/api/v1")
 
 # Servir frontend estático al final (debe ser lo último)
 frontend_dist = pathlib.Path(__file__).parent.parent.parent / "frontend" / "dist"
-print(f"Buscando frontend en: {frontend_dist}")
-print(f"Existe: {frontend_dist.exists()}")
 if frontend_dist.exists():
-    print(f"Montando frontend desde: {frontend_dist}")
+    logger.info("Montando frontend desde: %s", frontend_dist)
     app.mount("/", StaticFiles(directory=str(frontend_dist), html=True), name="frontend")
 else:
-    print("Frontend no encontrado, sirviendo solo API")
+    logger.info("Frontend no encontrado en %s, sirviendo solo API", frontend_dist)
+
+startup_profile.terminar_importacion(app)
 
 if __name__ == "__main__":
     import uvicorn
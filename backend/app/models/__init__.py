@@ -18,6 +18,9 @@ from app.models.orden_trabajo_pieza import OrdenTrabajoPieza
 from app.models.corte_caja import CorteCaja, TipoCorteCajaEnum
 from app.models.movimiento_caja import MovimientoCaja, TipoMovimientoCajaEnum
 from app.models.apertura_caja import AperturaCaja
+from app.models.folio_secuencia import FolioSecuencia
+from app.models.caja_saldo_diario import CajaSaldoDiario
+from app.models.movimiento_inventario import MovimientoInventario, TipoMovimientoInventarioEnum
 
 __all__ = [
     "User", 
@@ -61,4 +64,8 @@ __all__ = [
     "MovimientoCaja",
     "TipoMovimientoCajaEnum",
     "AperturaCaja",
+    "FolioSecuencia",
+    "CajaSaldoDiario",
+    "MovimientoInventario",
+    "TipoMovimientoInventarioEnum",
 ]
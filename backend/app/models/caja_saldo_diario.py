@@ -0,0 +1,24 @@
+"""Saldos diarios de caja (tabla materializada): un renglón por día con totales de movimientos y corte."""
+from sqlalchemy import Column, Integer, Date, Numeric, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class CajaSaldoDiario(Base):
+    """
+    Totales por día de movimientos_caja, mantenidos de forma incremental al registrar
+    movimientos y cortes. Se puede reconstruir desde el historial (scripts.reconstruir_saldos_caja).
+    """
+    __tablename__ = "caja_saldos_diarios"
+
+    fecha = Column(Date, primary_key=True)
+    total_entradas = Column(Numeric(12, 2), nullable=False, default=0)
+    total_salidas = Column(Numeric(12, 2), nullable=False, default=0)
+    num_movimientos = Column(Integer, nullable=False, default=0)
+    # Datos del corte del día (CIERRE_DIA o el último CAJA_CHICA), si existe
+    saldo_inicial = Column(Numeric(12, 2), nullable=True)
+    saldo_final = Column(Numeric(12, 2), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CajaSaldoDiario {self.fecha} +{self.total_entradas} -{self.total_salidas}>"
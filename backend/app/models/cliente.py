@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Date, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Date, Enum as SQLEnum, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -12,6 +12,10 @@ class TipoClienteEnum(str, enum.Enum):
 
 class Cliente(Base):
     __tablename__ = "clientes"
+    __table_args__ = (
+        # Búsqueda de clientes (ver app/services/cliente_busqueda_service.py); índice normal fuera de MySQL
+        Index("ft_clientes_busqueda", "busqueda", mysql_prefix="FULLTEXT"),
+    )
     
     # Identificador
     id = Column(Integer, primary_key=True, index=True)
@@ -46,6 +50,9 @@ class Cliente(Base):
     # Estado
     activo = Column(Boolean, default=True, nullable=False)
     
+    # Texto normalizado para búsqueda (sin acentos, teléfonos solo dígitos); se calcula al guardar
+    busqueda = Column(Text, nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -97,3 +104,10 @@ class Cliente(Base):
             partes.append(self.estado)
         
         return ", ".join(partes) if partes else "Sin dirección registrada"
+
+
+@event.listens_for(Cliente, "before_insert")
+@event.listens_for(Cliente, "before_update")
+def _actualizar_busqueda(mapper, connection, target):
+    from app.services.cliente_busqueda_service import ClienteBusquedaService
+    target.busqueda = ClienteBusquedaService.texto_busqueda(target)
@@ -0,0 +1,17 @@
+"""Consecutivos de folios por prefijo y año (OT-AÑO-XXXX, MAT-AÑO-XXXXX)."""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class FolioSecuencia(Base):
+    """Último consecutivo asignado para un prefijo en un año. Se incrementa con UPDATE atómico (bloqueo de fila)."""
+    __tablename__ = "folio_secuencias"
+
+    prefijo = Column(String(10), primary_key=True)  # OT, MAT
+    anio = Column(Integer, primary_key=True)
+    ultimo = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<FolioSecuencia {self.prefijo}-{self.anio} ultimo={self.ultimo}>"
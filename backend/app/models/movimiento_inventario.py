@@ -0,0 +1,67 @@
+"""Movimientos de inventario: bitácora de solo inserción de cada cambio de stock de una pieza."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator, VARCHAR
+from app.database import Base
+import enum
+
+
+class _EnumStringType(TypeDecorator):
+    impl = VARCHAR(20)
+    cache_ok = True
+
+    def __init__(self, enum_class, *args, **kwargs):
+        self.enum_class = enum_class
+        super().__init__(*args, **kwargs)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if hasattr(value, "value"):
+            value = value.value
+        return str(value).lower()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if hasattr(value, "value"):
+            return value
+        s = str(value).strip().upper()
+        try:
+            return self.enum_class(s)
+        except ValueError:
+            for m in self.enum_class:
+                if m.value.upper() == s:
+                    return m
+            return None
+
+
+class TipoMovimientoInventarioEnum(str, enum.Enum):
+    ENTRADA = "ENTRADA"   # Alta de pieza, devolución desde una OT
+    SALIDA = "SALIDA"     # Pieza usada en una OT
+    AJUSTE = "AJUSTE"     # Cambio manual del stock desde el catálogo
+
+
+class MovimientoInventario(Base):
+    """
+    Un cambio de stock: cantidad con signo (+ entra, - sale) y el stock que quedó después.
+    Solo se insertan renglones (InventarioService); nunca se editan ni se borran.
+    """
+    __tablename__ = "movimientos_inventario"
+
+    id = Column(Integer, primary_key=True, index=True)
+    pieza_id = Column(Integer, ForeignKey("piezas.id", ondelete="SET NULL"), nullable=True, index=True)
+    tipo = Column(_EnumStringType(TipoMovimientoInventarioEnum), nullable=False, index=True)
+    cantidad = Column(Integer, nullable=False)
+    stock_resultante = Column(Integer, nullable=False)
+    concepto = Column(String(255), nullable=False)
+    orden_trabajo_id = Column(Integer, ForeignKey("ordenes_trabajo.id", ondelete="SET NULL"), nullable=True, index=True)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    pieza = relationship("Pieza")
+    usuario = relationship("User", foreign_keys=[usuario_id])
+
+    def __repr__(self):
+        return f"<MovimientoInventario pieza={self.pieza_id} {self.cantidad:+d} -> {self.stock_resultante}>"
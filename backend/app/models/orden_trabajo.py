@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.types import TypeDecorator, VARCHAR
@@ -64,6 +64,10 @@ class TipoPermisoEnum(str, enum.Enum):
 
 class OrdenTrabajo(Base):
     __tablename__ = "ordenes_trabajo"
+    __table_args__ = (
+        # Paginación por cursor de /ordenes (ORDER BY fecha_recepcion DESC, id DESC)
+        Index("ix_ordenes_trabajo_fecha_recepcion_id", "fecha_recepcion", "id"),
+    )
     
     # Identificador
     id = Column(Integer, primary_key=True, index=True)
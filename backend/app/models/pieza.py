@@ -18,6 +18,9 @@ class Pieza(Base):
     stock = Column(Integer, nullable=False, default=0)
     unidad = Column(String(20), nullable=True, default="pza")  # pza, kg, m, etc.
     activo = Column(Boolean, default=True, nullable=False)
+    # Reabastecimiento (ReordenService): consumo promedio diario en OTs y stock al que hay que pedir más
+    consumo_diario = Column(Numeric(12, 4), nullable=False, default=0, server_default="0")
+    punto_reorden = Column(Numeric(12, 2), nullable=False, default=0, server_default="0", index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
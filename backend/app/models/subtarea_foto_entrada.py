@@ -1,6 +1,6 @@
 """Fotos de entrada por subtarea (como en la OT principal)."""
 from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 from app.database import Base
 
 
@@ -11,4 +11,4 @@ class SubtareaFotoEntrada(Base):
     subtarea_id = Column(Integer, ForeignKey("subtareas_orden.id", ondelete="CASCADE"), nullable=False, index=True)
     url = Column(String(512), nullable=False)
 
-    subtarea = relationship("SubtareaOrden", backref="fotos_entrada_list_rel")
+    subtarea = relationship("SubtareaOrden", backref=backref("fotos_entrada_list_rel", cascade="all, delete-orphan"))
@@ -48,6 +48,7 @@ from app.schemas.orden_trabajo import (
     OrdenTrabajoResponse,
     OrdenTrabajoListResponse,
     CambiarEstadoOrden,
+    OrdenesPdfLote,
     UploadFotoRequest
 )
 
@@ -93,5 +94,6 @@ __all__ = [
     "OrdenTrabajoResponse",
     "OrdenTrabajoListResponse",
     "CambiarEstadoOrden",
+    "OrdenesPdfLote",
     "UploadFotoRequest"
 ]
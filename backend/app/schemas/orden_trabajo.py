@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from decimal import Decimal
 from app.models.orden_trabajo import TipoPermisoEnum
@@ -80,6 +80,8 @@ class SubtareaOrdenResponse(SubtareaOrdenBase):
     fecha_inicio: Optional[datetime] = None
     fecha_completada: Optional[datetime] = None
     tecnico_nombre: Optional[str] = None
+    fotos_entrada_list: Optional[List[str]] = None  # URLs de fotos de entrada de la subtarea
+    fotos_entrada_variantes: Optional[List[Dict[str, Optional[str]]]] = None  # {original, thumb, medium, webp} por foto
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -197,6 +199,7 @@ class OrdenTrabajoResponse(OrdenTrabajoBase):
     # Fotos
     foto_entrada: Optional[str] = None
     fotos_entrada_list: Optional[List[str]] = None  # Todas las URLs de fotos de entrada
+    fotos_entrada_variantes: Optional[List[Dict[str, Optional[str]]]] = None  # {original, thumb, medium, webp} por foto
     foto_salida: Optional[str] = None
     
     # Fechas
@@ -264,6 +267,11 @@ class OrdenTrabajoListResponse(BaseModel):
         from_attributes = True
 
 
+class OrdenesPdfLote(BaseModel):
+    orden_ids: List[int] = Field(..., min_length=1, max_length=100)
+    tipo: Optional[str] = Field(None, description="'recepcion' o 'entrega'; por defecto según el estado de cada orden")
+
+
 class CambiarEstadoOrden(BaseModel):
     estatus: str = Field(..., description="Nuevo estado de la orden")
     observaciones: Optional[str] = Field(None, description="Observaciones del cambio de estado")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 
@@ -113,6 +113,16 @@ class OrdenTrabajoPiezaUpdate(BaseModel):
     precio_unitario: Optional[Decimal] = Field(None, ge=0)
 
 
+class OrdenTrabajoPiezasLote(BaseModel):
+    """Varias piezas a agregar a una OT en una sola transacción."""
+    piezas: List[OrdenTrabajoPiezaCreate] = Field(..., min_length=1, max_length=100)
+
+
+class OrdenTrabajoPiezasLoteEliminar(BaseModel):
+    """Usos de pieza a quitar de una OT en una sola transacción (su cantidad regresa al stock)."""
+    uso_ids: List[int] = Field(..., min_length=1, max_length=100)
+
+
 class OrdenTrabajoPiezaResponse(BaseModel):
     id: int
     orden_trabajo_id: int
@@ -126,3 +136,18 @@ class OrdenTrabajoPiezaResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class MovimientoInventarioResponse(BaseModel):
+    id: int
+    pieza_id: Optional[int] = None
+    tipo: str  # "ENTRADA" | "SALIDA" | "AJUSTE"
+    cantidad: int  # Con signo: positiva entra, negativa sale
+    stock_resultante: int
+    concepto: str
+    orden_trabajo_id: Optional[int] = None
+    usuario_id: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -46,6 +46,7 @@ class SolicitudVacacionesResponse(SolicitudVacacionesBase):
     fecha_aprobacion: Optional[datetime] = None
     motivo_rechazo: Optional[str] = None
     pdf_url: Optional[str] = None
+    pdf_status: Optional[str] = None  # LISTO | GENERANDO | ERROR (solo en respuestas que piden el PDF)
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -0,0 +1,206 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List, Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.movimiento_caja import MovimientoCaja, TipoMovimientoCajaEnum
+from app.models.corte_caja import CorteCaja
+from app.models.apertura_caja import AperturaCaja
+from app.models.caja_saldo_diario import CajaSaldoDiario
+
+
+class CajaService:
+    """Servicio de caja: totales del día para resumen y cortes."""
+
+    @staticmethod
+    def resumen_dia(db: Session, fecha: date) -> dict:
+        """
+        Totales del día en una sola consulta: entradas y salidas (SUM con CASE por tipo),
+        apertura del día y saldo final del último corte anterior (subconsultas escalares).
+        Saldo inicial = apertura si existe, si no el último corte (0 si no hay ninguno).
+        """
+        entradas = func.coalesce(func.sum(case(
+            (MovimientoCaja.tipo == TipoMovimientoCajaEnum.ENTRADA, MovimientoCaja.monto), else_=0,
+        )), 0)
+        salidas = func.coalesce(func.sum(case(
+            (MovimientoCaja.tipo == TipoMovimientoCajaEnum.SALIDA, MovimientoCaja.monto), else_=0,
+        )), 0)
+        apertura = (
+            select(AperturaCaja.monto)
+            .where(AperturaCaja.fecha == fecha)
+            .limit(1)
+            .scalar_subquery()
+        )
+        corte_anterior = (
+            select(CorteCaja.saldo_final)
+            .where(CorteCaja.fecha < fecha)
+            .order_by(CorteCaja.fecha.desc(), CorteCaja.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        row = (
+            db.query(entradas, salidas, apertura, corte_anterior)
+            .select_from(MovimientoCaja)
+            .filter(MovimientoCaja.fecha == fecha)
+            .one()
+        )
+        total_entradas, total_salidas, monto_apertura, saldo_corte_anterior = row
+        if monto_apertura is not None:
+            saldo_inicial = float(monto_apertura)
+        else:
+            saldo_inicial = float(saldo_corte_anterior) if saldo_corte_anterior is not None else 0.0
+        return {
+            "total_entradas": float(total_entradas or 0),
+            "total_salidas": float(total_salidas or 0),
+            "tiene_apertura": monto_apertura is not None,
+            "saldo_inicial": saldo_inicial,
+        }
+
+    @staticmethod
+    def resumen_rango(db: Session, desde: date, hasta: date) -> List[dict]:
+        """
+        Resumen por día entre desde y hasta (inclusive), con los mismos saldos que resumen_dia
+        pero en una sola pasada: lee un renglón por día de caja_saldos_diarios, las aperturas
+        del rango y el último corte anterior a `desde`; el resto es un recorrido acumulado.
+        """
+        saldos = {
+            r.fecha: r
+            for r in db.query(CajaSaldoDiario)
+            .filter(CajaSaldoDiario.fecha >= desde, CajaSaldoDiario.fecha <= hasta)
+            .all()
+        }
+        aperturas = dict(
+            db.query(AperturaCaja.fecha, AperturaCaja.monto)
+            .filter(AperturaCaja.fecha >= desde, AperturaCaja.fecha <= hasta)
+            .all()
+        )
+        ultimo_corte = (
+            db.query(CorteCaja.saldo_final)
+            .filter(CorteCaja.fecha < desde)
+            .order_by(CorteCaja.fecha.desc(), CorteCaja.id.desc())
+            .limit(1)
+            .scalar()
+        )
+        saldo_corte = float(ultimo_corte) if ultimo_corte is not None else 0.0
+
+        dias = []
+        fecha = desde
+        while fecha <= hasta:
+            fila = saldos.get(fecha)
+            entradas = float(fila.total_entradas) if fila else 0.0
+            salidas = float(fila.total_salidas) if fila else 0.0
+            apertura = aperturas.get(fecha)
+            saldo_inicial = float(apertura) if apertura is not None else saldo_corte
+            dias.append({
+                "fecha": fecha.isoformat(),
+                "saldo_inicial": round(saldo_inicial, 2),
+                "tiene_apertura": apertura is not None,
+                "total_entradas": round(entradas, 2),
+                "total_salidas": round(salidas, 2),
+                "saldo_final": round(saldo_inicial + entradas - salidas, 2),
+            })
+            # El corte del día es el saldo inicial de los días siguientes (si no tienen apertura)
+            if fila is not None and fila.saldo_final is not None:
+                saldo_corte = float(fila.saldo_final)
+            fecha += timedelta(days=1)
+        return dias
+
+    # --- Saldos diarios (tabla materializada caja_saldos_diarios) ---
+
+    @staticmethod
+    def registrar_movimiento(db: Session, fecha: date, tipo: str, monto) -> None:
+        """Suma un movimiento al renglón del día (UPDATE atómico). No hace commit: va en la transacción del movimiento."""
+        monto = Decimal(str(monto))
+        es_entrada = str(getattr(tipo, "value", tipo)).upper() == "ENTRADA"
+        cambios = {CajaSaldoDiario.num_movimientos: CajaSaldoDiario.num_movimientos + 1}
+        if es_entrada:
+            cambios[CajaSaldoDiario.total_entradas] = CajaSaldoDiario.total_entradas + monto
+        else:
+            cambios[CajaSaldoDiario.total_salidas] = CajaSaldoDiario.total_salidas + monto
+        if not CajaService._actualizar_saldo_diario(db, fecha, cambios):
+            CajaService._crear_saldo_diario(db, fecha)
+            CajaService._actualizar_saldo_diario(db, fecha, cambios)
+
+    @staticmethod
+    def registrar_corte(db: Session, fecha: date, saldo_inicial, saldo_final) -> None:
+        """Guarda en el renglón del día los saldos del corte. No hace commit."""
+        cambios = {
+            CajaSaldoDiario.saldo_inicial: Decimal(str(saldo_inicial)),
+            CajaSaldoDiario.saldo_final: Decimal(str(saldo_final)),
+        }
+        if not CajaService._actualizar_saldo_diario(db, fecha, cambios):
+            CajaService._crear_saldo_diario(db, fecha)
+            CajaService._actualizar_saldo_diario(db, fecha, cambios)
+
+    @staticmethod
+    def reconstruir_saldos_diarios(db: Session, desde: Optional[date] = None, hasta: Optional[date] = None) -> int:
+        """
+        Reconstruye caja_saldos_diarios desde movimientos_caja y cortes_caja (un GROUP BY por tabla).
+        Devuelve el número de días escritos. Hace commit.
+        """
+        filtros_mov, filtros_corte, filtros_saldo = [], [], []
+        if desde:
+            filtros_mov.append(MovimientoCaja.fecha >= desde)
+            filtros_corte.append(CorteCaja.fecha >= desde)
+            filtros_saldo.append(CajaSaldoDiario.fecha >= desde)
+        if hasta:
+            filtros_mov.append(MovimientoCaja.fecha <= hasta)
+            filtros_corte.append(CorteCaja.fecha <= hasta)
+            filtros_saldo.append(CajaSaldoDiario.fecha <= hasta)
+
+        dias = {}
+        totales = (
+            db.query(
+                MovimientoCaja.fecha,
+                func.coalesce(func.sum(case(
+                    (MovimientoCaja.tipo == TipoMovimientoCajaEnum.ENTRADA, MovimientoCaja.monto), else_=0,
+                )), 0),
+                func.coalesce(func.sum(case(
+                    (MovimientoCaja.tipo == TipoMovimientoCajaEnum.SALIDA, MovimientoCaja.monto), else_=0,
+                )), 0),
+                func.count(MovimientoCaja.id),
+            )
+            .filter(*filtros_mov)
+            .group_by(MovimientoCaja.fecha)
+            .all()
+        )
+        for fecha, entradas, salidas, num in totales:
+            dias[fecha] = {
+                "fecha": fecha,
+                "total_entradas": entradas or 0,
+                "total_salidas": salidas or 0,
+                "num_movimientos": num or 0,
+                "saldo_inicial": None,
+                "saldo_final": None,
+            }
+        # El corte que queda en el día es el último registrado (igual que al mantenerlo incrementalmente)
+        cortes = db.query(CorteCaja).filter(*filtros_corte).order_by(CorteCaja.fecha, CorteCaja.id).all()
+        for c in cortes:
+            d = dias.setdefault(c.fecha, {
+                "fecha": c.fecha, "total_entradas": 0, "total_salidas": 0, "num_movimientos": 0,
+            })
+            d["saldo_inicial"] = c.saldo_inicial
+            d["saldo_final"] = c.saldo_final
+
+        db.query(CajaSaldoDiario).filter(*filtros_saldo).delete(synchronize_session=False)
+        if dias:
+            db.bulk_insert_mappings(CajaSaldoDiario, list(dias.values()))
+        db.commit()
+        return len(dias)
+
+    @staticmethod
+    def _actualizar_saldo_diario(db: Session, fecha: date, cambios: dict) -> bool:
+        actualizadas = db.query(CajaSaldoDiario).filter(CajaSaldoDiario.fecha == fecha).update(
+            cambios, synchronize_session=False,
+        )
+        return actualizadas > 0
+
+    @staticmethod
+    def _crear_saldo_diario(db: Session, fecha: date) -> None:
+        try:
+            with db.begin_nested():
+                db.add(CajaSaldoDiario(fecha=fecha, total_entradas=0, total_salidas=0, num_movimientos=0))
+        except IntegrityError:
+            # Otro worker creó el renglón del día al mismo tiempo
+            pass
@@ -0,0 +1,119 @@
+import re
+import unicodedata
+from typing import List, Optional
+
+from sqlalchemy import and_, desc
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Query, Session
+
+from app.models.cliente import Cliente
+
+# InnoDB no indexa palabras más cortas que innodb_ft_min_token_size (3 por defecto)
+MIN_TOKEN_FULLTEXT = 3
+DIGITOS_NUMERO_LOCAL = 8
+
+_RE_TOKEN = re.compile(r"[a-z0-9]+")
+_RE_SEPARADORES_TELEFONO = re.compile(r"[\s\-().+/]")
+
+
+class ClienteBusquedaService:
+    """
+    Búsqueda de clientes sobre la columna normalizada clientes.busqueda.
+
+    La columna guarda nombre, apellidos, razón social, RFC y email en minúsculas y sin acentos, y los
+    teléfonos solo con dígitos (completo y sin lada); se recalcula en cada alta/cambio (evento en
+    app/models/cliente.py).
+    En MariaDB/MySQL se busca con el índice FULLTEXT (MATCH ... AGAINST en modo booleano, por prefijo)
+    y se ordena por relevancia; en otros motores (SQLite de pruebas) se filtra con LIKE y la
+    relevancia se calcula en proceso.
+    """
+
+    @staticmethod
+    def normalizar(texto: Optional[str]) -> str:
+        """Minúsculas y sin acentos/diacríticos ("Peña Núñez" -> "pena nunez")."""
+        if not texto:
+            return ""
+        descompuesto = unicodedata.normalize("NFKD", str(texto))
+        return "".join(c for c in descompuesto if not unicodedata.combining(c)).lower().strip()
+
+    @staticmethod
+    def solo_digitos(texto: Optional[str]) -> str:
+        return "".join(c for c in (texto or "") if c.isdigit())
+
+    @staticmethod
+    def texto_busqueda(cliente) -> str:
+        """Valor de clientes.busqueda para un cliente (modelo o cualquier objeto con los mismos atributos)."""
+        partes = [
+            cliente.nombre,
+            cliente.apellido_paterno,
+            cliente.apellido_materno,
+            cliente.razon_social,
+            cliente.rfc,
+            cliente.email,
+        ]
+        texto = " ".join(ClienteBusquedaService.normalizar(p) for p in partes if p)
+        telefonos = []
+        for telefono in (cliente.telefono, cliente.telefono_alternativo):
+            digitos = ClienteBusquedaService.solo_digitos(telefono)
+            if digitos:
+                telefonos.append(digitos)
+                # Número local sin lada, para que la búsqueda por prefijo encuentre "1234 5678"
+                if len(digitos) > DIGITOS_NUMERO_LOCAL:
+                    telefonos.append(digitos[-DIGITOS_NUMERO_LOCAL:])
+        return " ".join([texto] + telefonos).strip()
+
+    @staticmethod
+    def tokens(termino: str) -> List[str]:
+        """
+        Palabras a buscar. Un término que es un teléfono ("55-1234 5678") se toma como un solo
+        token de dígitos; lo demás se separa igual que el tokenizador de FULLTEXT.
+        """
+        if not termino:
+            return []
+        compacto = _RE_SEPARADORES_TELEFONO.sub("", termino)
+        if compacto.isdigit():
+            return [compacto]
+        return _RE_TOKEN.findall(ClienteBusquedaService.normalizar(termino))
+
+    @staticmethod
+    def _puntaje(texto: str, tokens: List[str]) -> int:
+        """Relevancia en proceso: 2 por token que empieza una palabra, 1 si solo aparece dentro."""
+        palabras = texto.split()
+        return sum(2 if any(p.startswith(t) for p in palabras) else 1 for t in tokens)
+
+    @staticmethod
+    def buscar(db: Session, query: Query, termino: str, skip: int = 0, limit: int = 100) -> List[Cliente]:
+        """
+        Aplica la búsqueda a `query` (db.query(Cliente) con los demás filtros ya puestos) y regresa
+        la página pedida ordenada por relevancia y, a igual relevancia, por fecha de alta descendente.
+        """
+        tokens = ClienteBusquedaService.tokens(termino)
+        if not tokens:
+            return query.order_by(Cliente.created_at.desc()).offset(skip).limit(limit).all()
+
+        cortos = [t for t in tokens if len(t) < MIN_TOKEN_FULLTEXT]
+        largos = [t for t in tokens if len(t) >= MIN_TOKEN_FULLTEXT]
+
+        if db.get_bind().dialect.name in ("mysql", "mariadb"):
+            if cortos:
+                # Palabras de 1-2 letras no están en el índice: se filtran sobre la misma columna
+                query = query.filter(and_(*[Cliente.busqueda.like(f"%{t}%") for t in cortos]))
+            if not largos:
+                return query.order_by(Cliente.created_at.desc()).offset(skip).limit(limit).all()
+            relevancia = match(Cliente.busqueda, against=" ".join(f"+{t}*" for t in largos)).in_boolean_mode()
+            return (
+                query.filter(relevancia)
+                .order_by(desc(relevancia), Cliente.created_at.desc())
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+
+        # Respaldo en proceso (SQLite): LIKE por token y relevancia calculada en Python
+        candidatos = (
+            query.filter(and_(*[Cliente.busqueda.like(f"%{t}%") for t in tokens]))
+            .order_by(Cliente.created_at.desc())
+            .all()
+        )
+        candidatos.sort(key=lambda c: ClienteBusquedaService._puntaje(c.busqueda or "", tokens), reverse=True)
+        return candidatos[skip:skip + limit]
@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.folio_secuencia import FolioSecuencia
+
+
+class FolioService:
+    """
+    Servicio de folios consecutivos (OT-AÑO-XXXX, MAT-AÑO-XXXXX).
+
+    El consecutivo se toma con un UPDATE ... SET ultimo = ultimo + 1 sobre la fila
+    (prefijo, año): InnoDB bloquea la fila hasta el commit, así que dos workers nunca
+    obtienen el mismo número. Como el incremento va en la misma transacción que el
+    INSERT de la orden/pieza, un rollback también lo deshace y no quedan huecos.
+    Los códigos capturados a mano con el mismo formato (piezas importadas o con código) pueden
+    ir delante del consecutivo: siguiente_folio salta los que ya existen y la importación adelanta
+    el consecutivo con avanzar_hasta.
+    """
+
+    @staticmethod
+    def siguiente_folio(db: Session, prefijo: str, columna, ancho: int = 4, anio: Optional[int] = None) -> str:
+        """Reserva el siguiente folio para el prefijo; `columna` es la columna donde se guardan (para la semilla inicial)."""
+        anio = anio or datetime.now().year
+        while True:
+            folio = f"{prefijo}-{anio}-{FolioService.siguiente_consecutivo(db, prefijo, anio, columna):0{ancho}d}"
+            # Un código capturado a mano pudo tomar este folio: se salta (queda consumido en el consecutivo)
+            if columna is None or not db.query(columna).filter(columna == folio).first():
+                return folio
+
+    @staticmethod
+    def siguiente_consecutivo(db: Session, prefijo: str, anio: int, columna=None) -> int:
+        """Incrementa y devuelve el consecutivo. No hace commit: lo hace quien inserta el registro."""
+        if not FolioService._incrementar(db, prefijo, anio):
+            FolioService._crear_secuencia(db, prefijo, anio, columna)
+            FolioService._incrementar(db, prefijo, anio)
+        return db.query(FolioSecuencia.ultimo).filter(
+            FolioSecuencia.prefijo == prefijo,
+            FolioSecuencia.anio == anio,
+        ).scalar()
+
+    @staticmethod
+    def reservar_bloque(
+        db: Session, prefijo: str, cantidad: int, columna, ancho: int = 4, anio: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Reserva `cantidad` folios consecutivos con un solo UPDATE ... SET ultimo = ultimo + n
+        (importaciones masivas). No hace commit, igual que siguiente_folio.
+        """
+        if cantidad <= 0:
+            return []
+        anio = anio or datetime.now().year
+        if not FolioService._incrementar(db, prefijo, anio, cantidad):
+            FolioService._crear_secuencia(db, prefijo, anio, columna)
+            FolioService._incrementar(db, prefijo, anio, cantidad)
+        ultimo = db.query(FolioSecuencia.ultimo).filter(
+            FolioSecuencia.prefijo == prefijo,
+            FolioSecuencia.anio == anio,
+        ).scalar()
+        return [f"{prefijo}-{anio}-{n:0{ancho}d}" for n in range(ultimo - cantidad + 1, ultimo + 1)]
+
+    @staticmethod
+    def avanzar_hasta(db: Session, prefijo: str, codigos: Iterable[str], columna=None) -> None:
+        """
+        Adelanta el consecutivo de cada año hasta el mayor de `codigos` con formato PREFIJO-AÑO-NNN
+        (UPDATE ... SET ultimo = n WHERE ultimo < n, equivalente a GREATEST). Sin commit: va en la
+        transacción que inserta esos códigos.
+        """
+        maximos: Dict[int, int] = {}
+        for codigo in codigos:
+            partes = (codigo or "").split("-")
+            if len(partes) == 3 and partes[0] == prefijo and partes[1].isdigit() and partes[2].isdigit():
+                anio, numero = int(partes[1]), int(partes[2])
+                maximos[anio] = max(maximos.get(anio, 0), numero)
+        for anio, numero in maximos.items():
+            llave = (FolioSecuencia.prefijo == prefijo, FolioSecuencia.anio == anio)
+            if db.query(FolioSecuencia.prefijo).filter(*llave).first() is None:
+                # Sin fila para ese año: se crea desde el mayor código existente (ya incluye estos)
+                FolioService._crear_secuencia(db, prefijo, anio, columna)
+            db.query(FolioSecuencia).filter(*llave, FolioSecuencia.ultimo < numero).update(
+                {FolioSecuencia.ultimo: numero}, synchronize_session=False,
+            )
+
+    @staticmethod
+    def _incrementar(db: Session, prefijo: str, anio: int, cantidad: int = 1) -> bool:
+        actualizadas = db.query(FolioSecuencia).filter(
+            FolioSecuencia.prefijo == prefijo,
+            FolioSecuencia.anio == anio,
+        ).update({FolioSecuencia.ultimo: FolioSecuencia.ultimo + cantidad}, synchronize_session=False)
+        return actualizadas > 0
+
+    @staticmethod
+    def _crear_secuencia(db: Session, prefijo: str, anio: int, columna=None) -> None:
+        """Crea la fila del año partiendo del mayor folio ya existente (una sola vez por prefijo y año)."""
+        inicial = FolioService._max_consecutivo_existente(db, columna, f"{prefijo}-{anio}-") if columna is not None else 0
+        try:
+            with db.begin_nested():
+                db.add(FolioSecuencia(prefijo=prefijo, anio=anio, ultimo=inicial))
+        except IntegrityError:
+            # Otro worker creó la fila al mismo tiempo; se usa la suya
+            pass
+
+    @staticmethod
+    def _max_consecutivo_existente(db: Session, columna, prefijo_completo: str) -> int:
+        maximo = 0
+        for (valor,) in db.query(columna).filter(columna.like(f"{prefijo_completo}%")).all():
+            sufijo = (valor or "")[len(prefijo_completo):]
+            if sufijo.isdigit():
+                maximo = max(maximo, int(sufijo))
+        return maximo
@@ -0,0 +1,194 @@
+import glob
+import logging
+import os
+import time
+import uuid
+from typing import BinaryIO, Dict, Iterable, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.orden_foto_entrada import OrdenFotoEntrada
+from app.models.orden_trabajo import OrdenTrabajo
+from app.models.subtarea_foto_entrada import SubtareaFotoEntrada
+from app.services.image_service import ImageService, VARIANTES
+from app.services.upload_service import UploadService
+
+logger = logging.getLogger(__name__)
+
+RAIZ = os.path.join("uploads", "ordenes")
+CAS_DIR = os.path.join(RAIZ, "cas")
+# Archivos más recientes que esto no se borran: cubre subidas en curso y el tiempo entre
+# guardar el archivo y hacer commit de la fila que lo referencia.
+GRACIA_SEGUNDOS = 3600
+# Formato que detecta Pillow -> extensión en el almacén (los demás formatos usan su nombre en minúsculas)
+EXTENSIONES_FORMATO = {"JPEG": "jpg", "MPO": "jpg", "TIFF": "tif"}
+# Marcas ISO-BMFF de HEIC/HEIF (fotos de iPhone), que Pillow no abre sin plugin
+MARCAS_HEIF = {b"heic", b"heix", b"hevc", b"heim", b"heis", b"mif1", b"msf1"}
+
+
+class FotoStoreService:
+    """
+    Almacén de fotos de órdenes direccionado por contenido:
+    uploads/ordenes/cas/<2 primeros hex>/<sha256>.<ext>.
+
+    La clave es solo el sha256; la extensión sale del formato detectado en los bytes, no del
+    nombre que manda el cliente, así que una misma imagen subida varias veces (misma OT, otra OT o
+    subtarea, como .jpg, .jpeg o .JPG) se guarda una sola vez.
+    Las referencias son las filas de orden_fotos_entrada / subtarea_fotos_entrada y las columnas
+    foto_entrada / foto_salida de ordenes_trabajo; un archivo sin referencias es huérfano.
+    """
+
+    @staticmethod
+    def ruta_para(sha256: str, extension: str) -> str:
+        return os.path.join(CAS_DIR, sha256[:2], f"{sha256}.{extension}")
+
+    @staticmethod
+    def url_de_ruta(ruta: str) -> str:
+        return "/" + ruta.replace(os.sep, "/")
+
+    @staticmethod
+    def ruta_de_url(url: Optional[str]) -> Optional[str]:
+        """'/uploads/ordenes/...' -> ruta local; None si la URL no es de este almacén."""
+        if not url or not url.startswith("/uploads/ordenes/") or ".." in url:
+            return None
+        return os.path.normpath(url.lstrip("/"))
+
+    @staticmethod
+    def _extension(ruta: str) -> str:
+        """Extensión según el contenido del archivo: formato que detecta Pillow (solo lee el encabezado)."""
+        # Pillow se importa al primer uso para no cargarlo en el arranque de cada worker
+        from PIL import Image
+
+        try:
+            with Image.open(ruta) as img:
+                if img.format:
+                    return EXTENSIONES_FORMATO.get(img.format, img.format.lower())
+        except Exception:
+            pass
+        with open(ruta, "rb") as f:
+            cabecera = f.read(12)
+        if cabecera[4:8] == b"ftyp" and cabecera[8:12] in MARCAS_HEIF:
+            return "heic"
+        return "bin"
+
+    @staticmethod
+    def _existente(sha256: str) -> Optional[str]:
+        """Archivo del almacén con ese contenido, sin importar la extensión (incluye los guardados con la del cliente)."""
+        for ruta in glob.glob(os.path.join(CAS_DIR, sha256[:2], f"{sha256}.*")):
+            if not ruta.endswith(".part"):
+                return ruta
+        return None
+
+    @staticmethod
+    def guardar(origen: BinaryIO) -> dict:
+        """
+        Guarda la foto en el almacén (bloqueante; ver UploadService.guardar_archivo).
+        Si ya existía una con el mismo contenido no se escribe de nuevo (`duplicado=True`).
+        """
+        os.makedirs(CAS_DIR, exist_ok=True)
+        temporal = os.path.join(CAS_DIR, f"tmp_{uuid.uuid4().hex}")
+        info = UploadService.guardar_archivo(origen, temporal)
+        destino = FotoStoreService._existente(info["sha256"])
+        duplicado = destino is not None
+        if duplicado:
+            os.remove(temporal)
+            # Renovar mtime para que el recolector no la borre mientras se guarda la nueva referencia
+            os.utime(destino)
+        else:
+            destino = FotoStoreService.ruta_para(info["sha256"], FotoStoreService._extension(temporal))
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            os.replace(temporal, destino)
+        return {
+            "path": destino,
+            "url": FotoStoreService.url_de_ruta(destino),
+            "size": info["size"],
+            "sha256": info["sha256"],
+            "duplicado": duplicado,
+        }
+
+    @staticmethod
+    def contar_referencias(db: Session, urls: Iterable[str]) -> Dict[str, int]:
+        """Número de referencias en BD de cada URL (4 queries agrupadas, sin importar cuántas URLs)."""
+        urls = list(set(u for u in urls if u))
+        conteo = {u: 0 for u in urls}
+        if not urls:
+            return conteo
+        for columna in (OrdenFotoEntrada.url, SubtareaFotoEntrada.url, OrdenTrabajo.foto_entrada, OrdenTrabajo.foto_salida):
+            for url, n in db.query(columna, func.count()).filter(columna.in_(urls)).group_by(columna).all():
+                conteo[url] += n
+        return conteo
+
+    @staticmethod
+    def _urls_referenciadas(db: Session) -> Set[str]:
+        referenciadas: Set[str] = set()
+        for columna in (OrdenFotoEntrada.url, SubtareaFotoEntrada.url, OrdenTrabajo.foto_entrada, OrdenTrabajo.foto_salida):
+            referenciadas.update(u for (u,) in db.query(columna).filter(columna.isnot(None)).distinct())
+        return referenciadas
+
+    @staticmethod
+    def _borrar_con_variantes(ruta: str, ahora: float, gracia_segundos: int) -> int:
+        """Borra el archivo y sus variantes si no fue tocado dentro de la gracia. Devuelve bytes liberados."""
+        try:
+            if ahora - os.path.getmtime(ruta) < gracia_segundos:
+                return 0
+        except FileNotFoundError:
+            return 0
+        liberados = 0
+        for r in [ruta] + [ImageService.ruta_variante(ruta, v) for v in VARIANTES]:
+            try:
+                tamano = os.path.getsize(r)
+                os.remove(r)
+                liberados += tamano
+            except FileNotFoundError:
+                pass
+        return liberados
+
+    @staticmethod
+    def liberar(db: Session, urls: Iterable[str], gracia_segundos: int = 60) -> int:
+        """
+        Tras borrar órdenes/subtareas: elimina del disco las fotos de `urls` que ya no tengan
+        referencias. Llamar después del commit. Devuelve bytes liberados.
+        """
+        ahora = time.time()
+        liberados = 0
+        for url, n in FotoStoreService.contar_referencias(db, urls).items():
+            ruta = FotoStoreService.ruta_de_url(url)
+            if n == 0 and ruta:
+                liberados += FotoStoreService._borrar_con_variantes(ruta, ahora, gracia_segundos)
+        return liberados
+
+    @staticmethod
+    def recolectar_huerfanos(db: Session, gracia_segundos: int = GRACIA_SEGUNDOS, simular: bool = False) -> dict:
+        """
+        Recorre uploads/ordenes (almacén y nombres antiguos) y borra las fotos sin referencias
+        y sus variantes. Con `simular=True` solo cuenta.
+        """
+        ahora = time.time()
+        vivas = {FotoStoreService.ruta_de_url(u) for u in FotoStoreService._urls_referenciadas(db)}
+        bases_vivas = {os.path.splitext(r)[0] for r in vivas if r}
+        sufijos_variante = tuple(f"__{v}" for v in VARIANTES)
+        archivos = bytes_liberados = 0
+        for directorio, _, nombres in os.walk(RAIZ):
+            for nombre in nombres:
+                ruta = os.path.normpath(os.path.join(directorio, nombre))
+                base = os.path.splitext(ruta)[0]
+                if base.endswith(sufijos_variante):
+                    # La variante sigue a su original: se conserva mientras el original tenga referencias
+                    if base.rsplit("__", 1)[0] in bases_vivas:
+                        continue
+                elif ruta in vivas:
+                    continue
+                try:
+                    if ahora - os.path.getmtime(ruta) < gracia_segundos:
+                        continue
+                    tamano = os.path.getsize(ruta)
+                    if not simular:
+                        os.remove(ruta)
+                except FileNotFoundError:
+                    continue
+                archivos += 1
+                bytes_liberados += tamano
+        if archivos:
+            logger.info("Fotos huérfanas %s: %d archivos, %d bytes", "encontradas" if simular else "eliminadas", archivos, bytes_liberados)
+        return {"archivos": archivos, "bytes": bytes_liberados, "simulado": simular}
@@ -0,0 +1,68 @@
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Variantes derivadas de cada foto: nombre -> (lado mayor en px, formato PIL, extensión)
+VARIANTES = {
+    "thumb": (320, "JPEG", "jpg"),
+    "medium": (1280, "JPEG", "jpg"),
+    "webp": (1280, "WEBP", "webp"),
+}
+CALIDAD = {"JPEG": 82, "WEBP": 80}
+
+
+class ImageService:
+    """Miniaturas y variantes redimensionadas de las fotos de órdenes (junto al original)"""
+
+    @staticmethod
+    def ruta_variante(ruta_original: str, variante: str) -> str:
+        """uploads/ordenes/foto.jpg -> uploads/ordenes/foto__thumb.jpg (misma carpeta que el original)."""
+        _, _, ext = VARIANTES[variante]
+        base, _ = os.path.splitext(ruta_original)
+        return f"{base}__{variante}.{ext}"
+
+    @staticmethod
+    def generar_variantes(ruta_original: str) -> List[str]:
+        """
+        Genera thumb, medium y webp de la foto. Pensado para BackgroundTasks tras la subida:
+        nunca lanza excepción (un archivo que no es imagen solo se registra en el log).
+        Devuelve las rutas generadas.
+        """
+        # Pillow se importa al primer uso para no cargarlo en el arranque de cada worker
+        from PIL import Image, ImageOps
+
+        generadas = []
+        try:
+            with Image.open(ruta_original) as img:
+                img = ImageOps.exif_transpose(img)
+                if img.mode not in ("RGB", "L"):
+                    img = img.convert("RGB")
+                for variante, (lado, formato, _) in VARIANTES.items():
+                    destino = ImageService.ruta_variante(ruta_original, variante)
+                    copia = img.copy()
+                    copia.thumbnail((lado, lado), Image.LANCZOS)
+                    temporal = destino + ".part"
+                    copia.save(temporal, format=formato, quality=CALIDAD[formato], optimize=True)
+                    os.replace(temporal, destino)
+                    generadas.append(destino)
+        except Exception as e:
+            logger.warning("No se pudieron generar variantes de %s: %s", ruta_original, e)
+        return generadas
+
+    @staticmethod
+    def variantes_url(url: str) -> Dict[str, Optional[str]]:
+        """
+        URLs de las variantes de una foto ('/uploads/...'); None si la variante aún no existe
+        (se generan en segundo plano) o la foto no es local.
+        """
+        resultado: Dict[str, Optional[str]] = {"original": url}
+        ruta = url.lstrip("/") if url and url.startswith("/uploads/") else None
+        for variante in VARIANTES:
+            if ruta is None:
+                resultado[variante] = None
+                continue
+            ruta_var = ImageService.ruta_variante(ruta, variante)
+            resultado[variante] = "/" + ruta_var.replace(os.sep, "/") if os.path.isfile(ruta_var) else None
+        return resultado
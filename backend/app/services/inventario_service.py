@@ -0,0 +1,217 @@
+from typing import Dict, Iterable, Optional
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.orm import Session
+from app.models.pieza import Pieza
+from app.models.movimiento_inventario import MovimientoInventario, TipoMovimientoInventarioEnum
+from app.services.reorden_service import ReordenService
+
+
+class InventarioService:
+    """
+    Cambios de stock de piezas con su renglón en movimientos_inventario.
+
+    El stock nunca se lee, compara y escribe desde Python: las salidas son un
+    UPDATE piezas SET stock = stock - n WHERE id = :id AND stock >= n, así que dos workers que
+    descuentan la misma pieza a la vez no pueden dejarla en negativo (InnoDB bloquea la fila
+    hasta el commit y el segundo UPDATE vuelve a evaluar la condición con el stock ya descontado).
+    Ningún método hace commit: el movimiento va en la misma transacción que el cambio que lo causa
+    (uso en OT, alta o edición de pieza), así que un rollback deshace ambos.
+    Los movimientos de una OT también actualizan, en el mismo UPDATE, el consumo y punto de
+    reorden de la pieza (ReordenService).
+    """
+
+    @staticmethod
+    def descontar(
+        db: Session,
+        pieza_id: int,
+        cantidad: int,
+        concepto: str,
+        usuario_id: Optional[int] = None,
+        orden_trabajo_id: Optional[int] = None,
+    ) -> Optional[int]:
+        """Saca `cantidad` del stock si alcanza. Devuelve el stock resultante, o None si no alcanzó (no cambia nada)."""
+        cambios = {Pieza.stock: Pieza.stock - cantidad}
+        if orden_trabajo_id is not None:
+            cambios.update(ReordenService.cambios_por_consumo(cantidad))
+        actualizadas = db.query(Pieza).filter(Pieza.id == pieza_id, Pieza.stock >= cantidad).update(
+            cambios, synchronize_session=False,
+        )
+        if not actualizadas:
+            return None
+        return InventarioService._registrar(
+            db, pieza_id, TipoMovimientoInventarioEnum.SALIDA, -cantidad, concepto, usuario_id, orden_trabajo_id,
+        )
+
+    @staticmethod
+    def devolver(
+        db: Session,
+        pieza_id: int,
+        cantidad: int,
+        concepto: str,
+        usuario_id: Optional[int] = None,
+        orden_trabajo_id: Optional[int] = None,
+    ) -> int:
+        """Regresa `cantidad` al stock (pieza quitada de una OT). Devuelve el stock resultante."""
+        cambios = {Pieza.stock: Pieza.stock + cantidad}
+        if orden_trabajo_id is not None:
+            cambios.update(ReordenService.cambios_por_consumo(-cantidad))
+        db.query(Pieza).filter(Pieza.id == pieza_id).update(cambios, synchronize_session=False)
+        return InventarioService._registrar(
+            db, pieza_id, TipoMovimientoInventarioEnum.ENTRADA, cantidad, concepto, usuario_id, orden_trabajo_id,
+        )
+
+    @staticmethod
+    def ajustar(db: Session, pieza_id: int, nuevo_stock: int, concepto: str, usuario_id: Optional[int] = None) -> int:
+        """
+        Fija el stock a `nuevo_stock` (edición manual desde el catálogo). Lee el stock actual con
+        SELECT ... FOR UPDATE para registrar la diferencia exacta aunque haya usos en OT al mismo tiempo.
+        """
+        anterior = db.query(Pieza.stock).filter(Pieza.id == pieza_id).with_for_update().scalar()
+        if anterior is None or anterior == nuevo_stock:
+            return nuevo_stock
+        db.query(Pieza).filter(Pieza.id == pieza_id).update({Pieza.stock: nuevo_stock}, synchronize_session=False)
+        return InventarioService._registrar(
+            db, pieza_id, TipoMovimientoInventarioEnum.AJUSTE, nuevo_stock - anterior, concepto, usuario_id,
+        )
+
+    @staticmethod
+    def registrar_alta(db: Session, pieza: Pieza, usuario_id: Optional[int] = None) -> None:
+        """Movimiento de entrada por el stock inicial de una pieza nueva (ya agregada a la sesión)."""
+        if not pieza.stock:
+            return
+        db.flush()
+        InventarioService._registrar(
+            db, pieza.id, TipoMovimientoInventarioEnum.ENTRADA, pieza.stock, "Alta de pieza", usuario_id,
+            stock_resultante=pieza.stock,
+        )
+
+    # --- Lotes (varias piezas en una transacción) ---
+
+    @staticmethod
+    def registrar_altas(db: Session, stocks: Dict[int, int], usuario_id: Optional[int] = None) -> None:
+        """Movimientos de entrada por el stock inicial de piezas nuevas (pieza_id -> stock), en un solo INSERT."""
+        filas = [
+            {
+                "pieza_id": pieza_id,
+                "tipo": TipoMovimientoInventarioEnum.ENTRADA,
+                "cantidad": stock,
+                "stock_resultante": stock,
+                "concepto": "Alta de pieza",
+                "usuario_id": usuario_id,
+            }
+            for pieza_id, stock in stocks.items() if stock
+        ]
+        if filas:
+            db.execute(insert(MovimientoInventario), filas)
+
+    @staticmethod
+    def bloquear(db: Session, pieza_ids: Iterable[int]) -> Dict[int, Pieza]:
+        """
+        Carga las piezas con un solo SELECT ... WHERE id IN (...) FOR UPDATE. Se bloquean siempre en
+        orden de id, así dos lotes con piezas en común esperan uno al otro en vez de interbloquearse.
+        """
+        piezas = (
+            db.query(Pieza)
+            .filter(Pieza.id.in_(set(pieza_ids)))
+            .order_by(Pieza.id)
+            .with_for_update()
+            .populate_existing()
+            .all()
+        )
+        return {p.id: p for p in piezas}
+
+    @staticmethod
+    def descontar_lote(
+        db: Session,
+        piezas: Dict[int, Pieza],
+        cantidades: Dict[int, int],
+        concepto: str,
+        usuario_id: Optional[int] = None,
+        orden_trabajo_id: Optional[int] = None,
+    ) -> None:
+        """
+        Saca `cantidades` (pieza_id -> cantidad) de piezas ya bloqueadas con `bloquear`; quien llama
+        verifica antes que el stock alcance para todas (las filas no cambian hasta el commit).
+        """
+        InventarioService._aplicar_lote(
+            db, piezas, {pieza_id: -n for pieza_id, n in cantidades.items()},
+            TipoMovimientoInventarioEnum.SALIDA, concepto, usuario_id, orden_trabajo_id,
+        )
+
+    @staticmethod
+    def devolver_lote(
+        db: Session,
+        cantidades: Dict[int, int],
+        concepto: str,
+        usuario_id: Optional[int] = None,
+        orden_trabajo_id: Optional[int] = None,
+    ) -> None:
+        """Regresa `cantidades` (pieza_id -> cantidad) al stock, bloqueando las piezas en una sola consulta."""
+        piezas = InventarioService.bloquear(db, cantidades)
+        InventarioService._aplicar_lote(
+            db, piezas, {pieza_id: n for pieza_id, n in cantidades.items() if pieza_id in piezas},
+            TipoMovimientoInventarioEnum.ENTRADA, concepto, usuario_id, orden_trabajo_id,
+        )
+
+    @staticmethod
+    def _aplicar_lote(
+        db: Session,
+        piezas: Dict[int, Pieza],
+        deltas: Dict[int, int],
+        tipo: TipoMovimientoInventarioEnum,
+        concepto: str,
+        usuario_id: Optional[int],
+        orden_trabajo_id: Optional[int],
+    ) -> None:
+        """Un UPDATE y un INSERT (executemany) para todas las piezas; el stock de `piezas` es el leído al bloquear."""
+        deltas = {pieza_id: d for pieza_id, d in deltas.items() if d}
+        if not deltas:
+            return
+        tabla = Pieza.__table__
+        valores = {"stock": tabla.c.stock + bindparam("delta")}
+        filas = [{"p_id": pieza_id, "delta": d} for pieza_id, d in deltas.items()]
+        if orden_trabajo_id is not None:
+            # Salida de stock hacia una OT = consumo (delta negativo); una devolución lo resta
+            minimo_consumo, minimo_reorden = ReordenService.minimos()
+            valores["consumo_diario"] = ReordenService.acumular(tabla.c.consumo_diario, bindparam("consumo"), minimo_consumo)
+            valores["punto_reorden"] = ReordenService.acumular(tabla.c.punto_reorden, bindparam("reorden"), minimo_reorden)
+            for fila in filas:
+                fila["consumo"], fila["reorden"] = ReordenService.incremento(-fila["delta"])
+        db.execute(update(tabla).where(tabla.c.id == bindparam("p_id")).values(**valores), filas)
+        db.execute(insert(MovimientoInventario), [
+            {
+                "pieza_id": pieza_id,
+                "tipo": tipo,
+                "cantidad": d,
+                "stock_resultante": piezas[pieza_id].stock + d,
+                "concepto": concepto[:255],
+                "orden_trabajo_id": orden_trabajo_id,
+                "usuario_id": usuario_id,
+            }
+            for pieza_id, d in deltas.items()
+        ])
+
+    @staticmethod
+    def _registrar(
+        db: Session,
+        pieza_id: int,
+        tipo: TipoMovimientoInventarioEnum,
+        cantidad: int,
+        concepto: str,
+        usuario_id: Optional[int] = None,
+        orden_trabajo_id: Optional[int] = None,
+        stock_resultante: Optional[int] = None,
+    ) -> int:
+        if stock_resultante is None:
+            # La fila quedó bloqueada por el UPDATE de esta transacción: nadie más la cambia hasta el commit
+            stock_resultante = db.query(Pieza.stock).filter(Pieza.id == pieza_id).scalar()
+        db.add(MovimientoInventario(
+            pieza_id=pieza_id,
+            tipo=tipo,
+            cantidad=cantidad,
+            stock_resultante=stock_resultante,
+            concepto=concepto[:255],
+            orden_trabajo_id=orden_trabajo_id,
+            usuario_id=usuario_id,
+        ))
+        return stock_resultante
@@ -0,0 +1,346 @@
+"""
+Importación masiva del catálogo de piezas (POST /piezas/importar).
+
+El archivo se lee fila por fila (CSV, o XLSX con openpyxl en modo read_only) sin cargarlo completo
+en memoria. Catálogos, subcatálogos y códigos existentes se cargan una vez en diccionarios, así
+que validar una fila no consulta la BD. Las filas válidas se insertan en lotes de LOTE con un solo
+INSERT (executemany) por lote, los folios MAT-AÑO-XXXXX de las filas sin código se reservan por
+bloque (FolioService.reservar_bloque, saltando los que ya usa una pieza o el propio archivo) y se
+hace un commit por lote. Las filas con error no se
+importan y se regresan en el reporte con su número de fila.
+
+Columnas reconocidas (encabezado sin importar mayúsculas ni acentos): codigo, nombre (obligatoria),
+descripcion, precio, stock, unidad, catalogo, subcatalogo, activo. Catálogo y subcatálogo se
+indican por nombre o por id; precio vacío = 0.
+"""
+import codecs
+import csv
+import io
+import logging
+import time
+import unicodedata
+from contextlib import closing
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from zipfile import BadZipFile
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.catalogo_pieza import CatalogoPieza, SubcatalogoPieza
+from app.models.pieza import Pieza
+from app.schemas.pieza import PiezaCreate
+from app.services.folio_service import FolioService
+from app.services.inventario_service import InventarioService
+from app.services.pieza_indice_service import PiezaIndiceService
+
+logger = logging.getLogger(__name__)
+
+LOTE = 1000
+MAX_ERRORES_REPORTE = 500
+MUESTRA_BYTES = 64 * 1024
+
+# Encabezado normalizado -> campo
+COLUMNAS = {
+    "codigo": "codigo",
+    "clave": "codigo",
+    "nombre": "nombre",
+    "descripcion": "descripcion",
+    "precio": "precio",
+    "stock": "stock",
+    "existencia": "stock",
+    "existencias": "stock",
+    "unidad": "unidad",
+    "catalogo": "catalogo",
+    "categoria": "catalogo",
+    "subcatalogo": "subcatalogo",
+    "subcategoria": "subcatalogo",
+    "activo": "activo",
+}
+VERDADEROS = {"", "1", "si", "s", "true", "verdadero", "x", "activo"}
+FALSOS = {"0", "no", "n", "false", "falso", "inactivo"}
+
+
+def _clave(texto) -> str:
+    """Minúsculas, sin acentos ni espacios extremos (para encabezados y nombres de catálogo)."""
+    descompuesto = unicodedata.normalize("NFKD", str(texto or "").strip())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def _numero(texto: str) -> Decimal:
+    """'$1,234.50' -> 1234.50; '120,5' (coma decimal) -> 120.5."""
+    limpio = texto.replace("$", "").replace(" ", "")
+    if "," in limpio and "." in limpio:
+        limpio = limpio.replace(",", "")
+    else:
+        limpio = limpio.replace(",", ".")
+    return Decimal(limpio)
+
+
+class _Mapas:
+    """Catálogos, subcatálogos y códigos existentes, cargados una vez por importación."""
+
+    def __init__(self, db: Session):
+        self.catalogos: Dict[str, int] = {}
+        for cid, nombre in db.query(CatalogoPieza.id, CatalogoPieza.nombre).all():
+            self.catalogos[_clave(nombre)] = cid
+            self.catalogos[str(cid)] = cid
+        self.subcatalogos: Dict[Tuple[int, str], int] = {}
+        self.subcatalogos_por_nombre: Dict[str, List[Tuple[int, int]]] = {}
+        self.catalogo_de_subcatalogo: Dict[int, int] = {}
+        for sid, catalogo_id, nombre in db.query(
+            SubcatalogoPieza.id, SubcatalogoPieza.catalogo_id, SubcatalogoPieza.nombre
+        ).all():
+            self.subcatalogos[(catalogo_id, _clave(nombre))] = sid
+            self.subcatalogos[(catalogo_id, str(sid))] = sid
+            self.subcatalogos_por_nombre.setdefault(_clave(nombre), []).append((sid, catalogo_id))
+            self.catalogo_de_subcatalogo[sid] = catalogo_id
+        self.codigos = {c for (c,) in db.query(Pieza.codigo).filter(Pieza.codigo.isnot(None)).all()}
+
+
+class PiezaImportacionService:
+    """Importación de piezas desde archivo con validación fila por fila e inserción por lotes."""
+
+    @staticmethod
+    def importar(
+        db: Session,
+        archivo: BinaryIO,
+        nombre_archivo: Optional[str],
+        es_admin: bool,
+        usuario_id: Optional[int] = None,
+        solo_validar: bool = False,
+    ) -> dict:
+        """
+        Importa (o con solo_validar, únicamente valida) las filas del archivo. Regresa el conteo de filas,
+        importadas y con error, y hasta MAX_ERRORES_REPORTE errores {fila, errores}.
+        """
+        inicio = time.perf_counter()
+        mapas = _Mapas(db)
+        errores: List[dict] = []
+        con_error = 0
+        filas = 0
+        importadas = 0
+        lote: List[Tuple[int, dict]] = []
+
+        def reportar(fila: int, mensajes: List[str]) -> None:
+            nonlocal con_error
+            con_error += 1
+            if len(errores) < MAX_ERRORES_REPORTE:
+                errores.append({"fila": fila, "errores": mensajes})
+
+        def guardar() -> None:
+            nonlocal importadas
+            if not solo_validar:
+                fallo = PiezaImportacionService._insertar_lote(db, [d for _, d in lote], mapas, usuario_id)
+                if fallo:
+                    for fila, _ in lote:
+                        reportar(fila, [fallo])
+                    lote.clear()
+                    return
+            importadas += len(lote)
+            lote.clear()
+
+        with closing(PiezaImportacionService._leer(archivo, nombre_archivo)) as renglones:
+            for fila, valores in renglones:
+                filas += 1
+                datos, mensajes = PiezaImportacionService._validar(valores, mapas, es_admin)
+                if mensajes:
+                    reportar(fila, mensajes)
+                    continue
+                if datos["codigo"]:
+                    mapas.codigos.add(datos["codigo"])
+                lote.append((fila, datos))
+                if len(lote) >= LOTE:
+                    guardar()
+        if lote:
+            guardar()
+
+        if importadas and not solo_validar:
+            PiezaIndiceService.invalidar()
+        return {
+            "filas": filas,
+            "importadas": importadas,
+            "con_error": con_error,
+            "errores": errores,
+            "errores_omitidos": con_error - len(errores),
+            "solo_validar": solo_validar,
+            "segundos": round(time.perf_counter() - inicio, 2),
+        }
+
+    # --- Lectura ---
+
+    @staticmethod
+    def _leer(archivo: BinaryIO, nombre_archivo: Optional[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """(número de fila en el archivo, {campo: texto}) por cada fila con datos."""
+        if (nombre_archivo or "").lower().endswith(".xlsx"):
+            renglones = PiezaImportacionService._renglones_xlsx(archivo)
+        else:
+            renglones = PiezaImportacionService._renglones_csv(archivo)
+        with closing(renglones):
+            encabezado = next(renglones, None)
+            if not encabezado:
+                raise HTTPException(status_code=400, detail="El archivo está vacío")
+            campos = [COLUMNAS.get(_clave(h).replace(" ", "").replace("_", "")) for h in encabezado]
+            if "nombre" not in campos:
+                raise HTTPException(status_code=400, detail="El archivo debe tener una columna 'nombre'")
+            for numero, renglon in enumerate(renglones, start=2):
+                valores = {
+                    campo: ("" if valor is None else str(valor)).strip()
+                    for campo, valor in zip(campos, renglon) if campo
+                }
+                if any(valores.values()):
+                    yield numero, valores
+
+    @staticmethod
+    def _renglones_csv(archivo: BinaryIO) -> Iterator[List[str]]:
+        # Codificación y separador a partir del inicio del archivo (Excel guarda en cp1252 y con ';')
+        muestra = archivo.read(MUESTRA_BYTES)
+        archivo.seek(0)
+        try:
+            texto_muestra = codecs.getincrementaldecoder("utf-8-sig")().decode(muestra, final=False)
+            codificacion = "utf-8-sig"
+        except UnicodeDecodeError:
+            texto_muestra = muestra.decode("cp1252", errors="replace")
+            codificacion = "cp1252"
+        try:
+            dialecto = csv.Sniffer().sniff(texto_muestra.split("\n", 1)[0], delimiters=",;\t")
+            separador = dialecto.delimiter
+        except csv.Error:
+            separador = ","
+        texto = io.TextIOWrapper(archivo, encoding=codificacion, errors="replace", newline="")
+        try:
+            yield from csv.reader(texto, delimiter=separador)
+        finally:
+            texto.detach()  # El archivo lo cierra quien lo abrió (UploadFile)
+
+    @staticmethod
+    def _renglones_xlsx(archivo: BinaryIO) -> Iterator[tuple]:
+        # openpyxl se importa solo cuando llega un .xlsx, no al arrancar el worker
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+
+        try:
+            libro = load_workbook(archivo, read_only=True, data_only=True)
+        except (BadZipFile, InvalidFileException, KeyError):
+            # Archivo dañado o CSV renombrado (KeyError: zip sin las partes de un libro de Excel)
+            raise HTTPException(status_code=400, detail="El archivo .xlsx no es válido")
+        try:
+            yield from libro.active.iter_rows(values_only=True)
+        finally:
+            libro.close()
+
+    # --- Validación ---
+
+    @staticmethod
+    def _validar(valores: Dict[str, str], mapas: _Mapas, es_admin: bool) -> Tuple[Optional[dict], List[str]]:
+        mensajes: List[str] = []
+        datos = {
+            "codigo": valores.get("codigo") or None,
+            "nombre": valores.get("nombre", ""),
+            "descripcion": valores.get("descripcion") or None,
+            "unidad": valores.get("unidad") or "pza",
+        }
+        if datos["codigo"] and datos["codigo"] in mapas.codigos:
+            mensajes.append(f"Ya existe una pieza con el código {datos['codigo']}")
+
+        try:
+            datos["precio"] = _numero(valores.get("precio") or "0") if es_admin else Decimal("0.00")
+        except InvalidOperation:
+            mensajes.append(f"Precio inválido: {valores.get('precio')}")
+        try:
+            stock = _numero(valores.get("stock") or "0")
+            if stock != stock.to_integral_value():
+                raise InvalidOperation
+            datos["stock"] = int(stock)
+        except InvalidOperation:
+            mensajes.append(f"Stock inválido: {valores.get('stock')}")
+
+        activo = _clave(valores.get("activo"))
+        if activo in VERDADEROS:
+            datos["activo"] = True
+        elif activo in FALSOS:
+            datos["activo"] = False
+        else:
+            mensajes.append(f"Activo inválido: {valores.get('activo')} (use sí/no)")
+
+        catalogo_id, subcatalogo_id = PiezaImportacionService._catalogos(valores, mapas, mensajes)
+        datos["catalogo_id"] = catalogo_id
+        datos["subcatalogo_id"] = subcatalogo_id
+        if mensajes:
+            return None, mensajes
+
+        try:
+            return PiezaCreate(**datos).model_dump(), []
+        except ValidationError as e:
+            return None, [f"{'.'.join(str(x) for x in err['loc'])}: {err['msg']}" for err in e.errors()]
+
+    @staticmethod
+    def _catalogos(valores: Dict[str, str], mapas: _Mapas, mensajes: List[str]) -> Tuple[Optional[int], Optional[int]]:
+        catalogo_id = None
+        if valores.get("catalogo"):
+            catalogo_id = mapas.catalogos.get(_clave(valores["catalogo"]))
+            if catalogo_id is None:
+                mensajes.append(f"Catálogo no encontrado: {valores['catalogo']}")
+                return None, None
+        if not valores.get("subcatalogo"):
+            return catalogo_id, None
+        nombre = _clave(valores["subcatalogo"])
+        if catalogo_id is not None:
+            subcatalogo_id = mapas.subcatalogos.get((catalogo_id, nombre))
+            if subcatalogo_id is None:
+                mensajes.append(f"Subcatálogo '{valores['subcatalogo']}' no encontrado en el catálogo {valores['catalogo']}")
+            return catalogo_id, subcatalogo_id
+        # Sin catálogo: el subcatálogo (por id o por nombre, si no se repite) determina el catálogo
+        if nombre.isdigit() and int(nombre) in mapas.catalogo_de_subcatalogo:
+            return mapas.catalogo_de_subcatalogo[int(nombre)], int(nombre)
+        opciones = mapas.subcatalogos_por_nombre.get(nombre, [])
+        if len(opciones) == 1:
+            subcatalogo_id, catalogo_id = opciones[0]
+            return catalogo_id, subcatalogo_id
+        if opciones:
+            mensajes.append(f"Subcatálogo '{valores['subcatalogo']}' existe en varios catálogos; indique el catálogo")
+        else:
+            mensajes.append(f"Subcatálogo no encontrado: {valores['subcatalogo']}")
+        return None, None
+
+    # --- Inserción ---
+
+    @staticmethod
+    def _asignar_folios(db: Session, filas: List[dict], mapas: _Mapas) -> None:
+        """
+        Folio MAT-AÑO-XXXXX para las filas sin código. Un folio que ya es el código de una pieza o de
+        otra fila del archivo (códigos capturados a mano) se salta y se reserva otro en su lugar.
+        """
+        pendientes = [f for f in filas if not f["codigo"]]
+        while pendientes:
+            folios = [
+                folio for folio in FolioService.reservar_bloque(db, "MAT", len(pendientes), Pieza.codigo, ancho=5)
+                if folio not in mapas.codigos
+            ]
+            for fila, folio in zip(pendientes, folios):
+                fila["codigo"] = folio
+                mapas.codigos.add(folio)
+            pendientes = pendientes[len(folios):]
+
+    @staticmethod
+    def _insertar_lote(db: Session, filas: List[dict], mapas: _Mapas, usuario_id: Optional[int]) -> Optional[str]:
+        """Inserta un lote y su stock inicial en movimientos_inventario; commit. Regresa el error si el lote falló."""
+        try:
+            PiezaImportacionService._asignar_folios(db, filas, mapas)
+            db.execute(insert(Pieza), filas)
+            # Códigos MAT-AÑO-NNNNN capturados en el archivo por delante del consecutivo
+            FolioService.avanzar_hasta(db, "MAT", (f["codigo"] for f in filas), Pieza.codigo)
+            con_stock = {f["codigo"]: f["stock"] for f in filas if f["stock"]}
+            if con_stock:
+                ids = db.query(Pieza.id, Pieza.codigo).filter(Pieza.codigo.in_(con_stock)).all()
+                InventarioService.registrar_altas(db, {pid: con_stock[codigo] for pid, codigo in ids}, usuario_id)
+            db.commit()
+            return None
+        except IntegrityError:
+            # Otro usuario registró al mismo tiempo un código del lote
+            db.rollback()
+            logger.exception("Error al guardar un lote de la importación de piezas")
+            return "No se pudo guardar el lote de esta fila (código duplicado o dato inválido); vuelva a importarla"
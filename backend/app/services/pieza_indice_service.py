@@ -0,0 +1,291 @@
+"""
+Índice de búsqueda de piezas en memoria (trigramas).
+
+Cada worker guarda el catálogo de piezas (id, nombre, código, activo, catálogo/subcatálogo) en un
+índice de dos niveles, al estilo de pg_trgm: trigramas -> palabras del vocabulario (minúsculas,
+sin acentos) y palabra -> piezas. Cada palabra buscada se compara por trigramas contra el
+vocabulario (mucho más chico que el catálogo), lo que tolera errores de dedo y acentos faltantes,
+y las piezas de las palabras parecidas se intersectan entre palabras buscadas. No se toca la BD;
+list_piezas después carga solo la página de ids encontrada.
+
+create_pieza / update_pieza / delete_pieza actualizan el índice del worker que atiende la petición;
+los demás workers reconstruyen el suyo en segundo plano cuando tiene más de
+PIEZAS_INDICE_TTL_SECONDS (misma cota de desactualización que la caché de usuarios).
+"""
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.pieza import Pieza
+
+logger = logging.getLogger(__name__)
+
+# Fracción mínima de trigramas de la palabra buscada que debe tener una palabra del vocabulario
+# (0.4 deja pasar una transposición de letras en palabras de 6: "baltaa" -> "balata")
+SIMILITUD_MINIMA = 0.4
+
+_RE_PALABRA = re.compile(r"[a-z0-9]+")
+
+_lock = threading.Lock()
+_lock_construccion = threading.Lock()
+# trigrama -> palabras del vocabulario; las que tienen dígitos (códigos) van aparte para que no
+# estorben en la búsqueda difusa de palabras ("ref" no debe recorrer "ref00001", "ref00002", ...)
+_trigramas: Dict[str, Set[str]] = defaultdict(set)
+_trigramas_codigos: Dict[str, Set[str]] = defaultdict(set)
+_vocabulario: Dict[str, Set[int]] = {}  # palabra -> ids de pieza
+# id -> (texto normalizado, palabras, activo, catalogo_id, subcatalogo_id)
+_piezas: Dict[int, Tuple[str, Set[str], bool, Optional[int], Optional[int]]] = {}
+_inactivas: Set[int] = set()
+_construido_en: Optional[float] = None
+_reconstruyendo = False
+# Mientras reconstruir() lee la BD: id -> datos de _agregar (None = quitada) de los cambios hechos
+# por actualizar()/quitar(), que se vuelven a aplicar sobre las filas leídas (pueden ser más viejas)
+_cambios: Optional[Dict[int, Optional[tuple]]] = None
+
+
+def _normalizar(texto: Optional[str]) -> str:
+    if not texto:
+        return ""
+    descompuesto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def _palabras(nombre: Optional[str], codigo: Optional[str] = None) -> List[str]:
+    palabras = _RE_PALABRA.findall(_normalizar(nombre))
+    if codigo:
+        partes = _RE_PALABRA.findall(_normalizar(codigo))
+        palabras += partes
+        if len(partes) > 1:
+            palabras.append("".join(partes))  # "MAT-2026-0001" también como "mat20260001"
+    return palabras
+
+
+def _trigramas_de(palabra: str) -> Set[str]:
+    relleno = f"  {palabra} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def _es_codigo(palabra: str) -> bool:
+    return any(c.isdigit() for c in palabra)
+
+
+def _agregar(pieza_id: int, nombre, codigo, activo, catalogo_id, subcatalogo_id) -> None:
+    palabras = _palabras(nombre, codigo)
+    unicas = set(palabras)
+    _piezas[pieza_id] = (" ".join(palabras), unicas, bool(activo), catalogo_id, subcatalogo_id)
+    if not activo:
+        _inactivas.add(pieza_id)
+    for palabra in unicas:
+        ids = _vocabulario.get(palabra)
+        if ids is None:
+            ids = _vocabulario[palabra] = set()
+            trigramas = _trigramas_codigos if _es_codigo(palabra) else _trigramas
+            for g in _trigramas_de(palabra):
+                trigramas[g].add(palabra)
+        ids.add(pieza_id)
+
+
+def _quitar(pieza_id: int) -> None:
+    entrada = _piezas.pop(pieza_id, None)
+    _inactivas.discard(pieza_id)
+    if entrada is None:
+        return
+    for palabra in entrada[1]:
+        ids = _vocabulario.get(palabra)
+        if ids is None:
+            continue
+        ids.discard(pieza_id)
+        if not ids:
+            del _vocabulario[palabra]
+            trigramas = _trigramas_codigos if _es_codigo(palabra) else _trigramas
+            for g in _trigramas_de(palabra):
+                palabras = trigramas.get(g)
+                if palabras is not None:
+                    palabras.discard(palabra)
+                    if not palabras:
+                        del trigramas[g]
+
+
+def _parecidas(palabra: str) -> Dict[str, float]:
+    """
+    Palabras del vocabulario parecidas a `palabra` -> similitud (fracción de sus trigramas, +0.5 si es
+    idéntica). Palabras con dígitos (códigos, medidas) solo coinciden por prefijo, sin tolerancia a errores.
+    """
+    if _es_codigo(palabra):
+        relleno = f"  {palabra}"
+        listas = sorted((_trigramas_codigos.get(relleno[i:i + 3], set()) for i in range(len(relleno) - 2)), key=len)
+        candidatas = listas[0].intersection(*listas[1:])
+        return {c: 1.0 + (0.5 if c == palabra else 0) for c in candidatas if c.startswith(palabra)}
+    grams = _trigramas_de(palabra)
+    comunes: Dict[str, int] = defaultdict(int)
+    for g in grams:
+        for candidata in _trigramas.get(g, ()):
+            comunes[candidata] += 1
+    minimo = SIMILITUD_MINIMA * len(grams)
+    return {c: n / len(grams) + (0.5 if c == palabra else 0) for c, n in comunes.items() if n >= minimo}
+
+
+class PiezaIndiceService:
+    """Búsqueda difusa de piezas por nombre y código sobre el índice de trigramas del worker."""
+
+    @staticmethod
+    def reconstruir(db: Optional[Session] = None) -> int:
+        """
+        Carga todas las piezas de BD y reemplaza el índice. Regresa cuántas piezas indexó.
+        Los cambios que llegan por actualizar()/quitar() mientras se lee la BD se aplican después
+        del reemplazo, para que la lectura no los pise.
+        """
+        global _construido_en, _cambios
+        propia = db is None
+        db = db or SessionLocal()
+        with _lock:
+            _cambios = {}
+        try:
+            filas = db.query(
+                Pieza.id, Pieza.nombre, Pieza.codigo, Pieza.activo, Pieza.catalogo_id, Pieza.subcatalogo_id
+            ).all()
+        except Exception:
+            with _lock:
+                _cambios = None
+            raise
+        finally:
+            if propia:
+                db.close()
+        with _lock:
+            _trigramas.clear()
+            _trigramas_codigos.clear()
+            _vocabulario.clear()
+            _piezas.clear()
+            _inactivas.clear()
+            for fila in filas:
+                _agregar(*fila)
+            for pieza_id, datos in _cambios.items():
+                _quitar(pieza_id)
+                if datos is not None:
+                    _agregar(pieza_id, *datos)
+            _cambios = None
+            _construido_en = time.monotonic()
+        return len(filas)
+
+    @staticmethod
+    def _vigente() -> bool:
+        ttl = settings.PIEZAS_INDICE_TTL_SECONDS
+        return _construido_en is not None and (ttl <= 0 or time.monotonic() - _construido_en < ttl)
+
+    @staticmethod
+    def _reconstruir_en_segundo_plano() -> None:
+        global _reconstruyendo
+
+        def tarea():
+            global _reconstruyendo
+            try:
+                with _lock_construccion:
+                    if not PiezaIndiceService._vigente():
+                        PiezaIndiceService.reconstruir()
+            except Exception as e:
+                logger.warning("No se pudo reconstruir el índice de piezas: %s", e)
+            finally:
+                _reconstruyendo = False
+
+        with _lock:
+            if _reconstruyendo:
+                return
+            _reconstruyendo = True
+        threading.Thread(target=tarea, name="indice-piezas", daemon=True).start()
+
+    @staticmethod
+    def _asegurar(db: Optional[Session]) -> None:
+        """Sin índice: se construye en esta petición. Caducado: se sigue usando y se reconstruye en un hilo."""
+        if PiezaIndiceService._vigente():
+            return
+        if _construido_en is None:
+            with _lock_construccion:
+                if _construido_en is None:
+                    PiezaIndiceService.reconstruir(db)
+            return
+        PiezaIndiceService._reconstruir_en_segundo_plano()
+
+    @staticmethod
+    def actualizar(pieza: Pieza) -> None:
+        """Agrega o reemplaza una pieza en el índice (después del commit)."""
+        datos = (pieza.nombre, pieza.codigo, pieza.activo, pieza.catalogo_id, pieza.subcatalogo_id)
+        with _lock:
+            if _cambios is not None:
+                _cambios[pieza.id] = datos
+            if _construido_en is None:
+                return
+            _quitar(pieza.id)
+            _agregar(pieza.id, *datos)
+
+    @staticmethod
+    def quitar(pieza_id: int) -> None:
+        with _lock:
+            if _cambios is not None:
+                _cambios[pieza_id] = None
+            _quitar(pieza_id)
+
+    @staticmethod
+    def invalidar() -> None:
+        """Fuerza reconstruir en la siguiente búsqueda (cambios masivos, ej. borrar catálogos)."""
+        global _construido_en
+        with _lock:
+            _construido_en = None
+
+    @staticmethod
+    def buscar(
+        termino: str,
+        activo: Optional[bool] = None,
+        catalogo_id: Optional[int] = None,
+        subcatalogo_id: Optional[int] = None,
+        limite: int = 500,
+        db: Optional[Session] = None,
+    ) -> List[int]:
+        """
+        Ids de hasta `limite` piezas que tienen, para cada palabra del término, alguna palabra parecida,
+        de la más a la menos parecida (suma de similitudes, +1 si el término aparece tal cual).
+        """
+        PiezaIndiceService._asegurar(db)
+        palabras = list(dict.fromkeys(_palabras(termino)))
+        if not palabras:
+            return []
+        consulta = " ".join(palabras)
+        with _lock:
+            parecidas = [_parecidas(p) for p in palabras]
+            # Piezas que tienen algo parecido a cada palabra buscada (operaciones de conjuntos, en C)
+            grupos = sorted((set().union(*(_vocabulario[c] for c in m)) for m in parecidas), key=len)
+            candidatas = grupos[0].intersection(*grupos[1:])
+            if activo is not None:
+                candidatas = candidatas - _inactivas if activo else candidatas & _inactivas
+            if catalogo_id is not None or subcatalogo_id is not None:
+                candidatas = {
+                    i for i in candidatas
+                    if (catalogo_id is None or _piezas[i][3] == catalogo_id)
+                    and (subcatalogo_id is None or _piezas[i][4] == subcatalogo_id)
+                }
+            # Puntaje por palabra buscada: la similitud de la palabra más parecida que tenga cada pieza
+            puntajes: Optional[Dict[int, float]] = None
+            for coincidencias in parecidas:
+                mejor: Dict[int, float] = {}
+                for palabra in sorted(coincidencias, key=coincidencias.get, reverse=True):
+                    nuevas = (_vocabulario[palabra] & candidatas).difference(mejor)
+                    mejor.update(dict.fromkeys(nuevas, coincidencias[palabra]))
+                puntajes = mejor if puntajes is None else {i: p + mejor[i] for i, p in puntajes.items()}
+            resultado = [
+                (-(p + (consulta in _piezas[i][0])), _piezas[i][0], i) for i, p in puntajes.items()
+            ]
+        mejores = heapq.nsmallest(limite, resultado)
+        return [pieza_id for _, _, pieza_id in mejores]
+
+    @staticmethod
+    def iniciar() -> None:
+        """Construye el índice en un hilo al arrancar el worker, sin retrasar el arranque."""
+        PiezaIndiceService._reconstruir_en_segundo_plano()
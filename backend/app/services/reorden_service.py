@@ -0,0 +1,106 @@
+import math
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Optional, Tuple
+from sqlalchemy import case, func, or_, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.orden_trabajo import OrdenTrabajo
+from app.models.orden_trabajo_pieza import OrdenTrabajoPieza
+from app.models.pieza import Pieza
+
+
+class ReordenService:
+    """
+    Puntos de reorden de piezas (columnas piezas.consumo_diario y piezas.punto_reorden).
+
+    consumo_diario = piezas usadas en OTs recibidas en los últimos REORDEN_VENTANA_DIAS / ventana;
+    punto_reorden = consumo_diario * REORDEN_DIAS_COBERTURA. Una pieza se debe reabastecer cuando su
+    stock llega al punto de reorden.
+
+    Los valores se mantienen al registrar cada uso: el mismo UPDATE que mueve el stock
+    (InventarioService) suma o resta el consumo, así GET /piezas/reabastecer solo lee piezas. Como
+    ese incremento no "olvida" los usos que salen de la ventana, `recalcular` (una sola agregación
+    GROUP BY sobre el historial) se corre a diario: scripts/recalcular_puntos_reorden.py.
+    La ventana se mide por la fecha de recepción de la OT (los usos no tienen fecha propia), pero el
+    incremento cuenta el uso el día que se registra: una pieza agregada hoy a una OT recibida hace
+    más de REORDEN_VENTANA_DIAS suma consumo hasta el siguiente `recalcular`, que la excluye.
+    Las columnas guardan valores redondeados, así que agregar y devolver las mismas piezas puede
+    dejar un residuo (consumo 0.0000 con punto 0.01); `acumular` lo lleva a 0.
+    """
+
+    @staticmethod
+    def incremento(cantidad: int) -> Tuple[Decimal, Decimal]:
+        """(consumo_diario, punto_reorden) que agrega usar hoy `cantidad` piezas (negativa si se devuelven)."""
+        consumo = Decimal(cantidad) / Decimal(max(settings.REORDEN_VENTANA_DIAS, 1))
+        return consumo, consumo * settings.REORDEN_DIAS_COBERTURA
+
+    @staticmethod
+    def minimos() -> Tuple[Decimal, Decimal]:
+        """Mitad de lo que aporta una sola pieza: por debajo de eso un valor es residuo de redondeo."""
+        consumo, reorden = ReordenService.incremento(1)
+        return consumo / 2, reorden / 2
+
+    @staticmethod
+    def acumular(columna, incremento, minimo):
+        """Expresión SQL columna + incremento, en 0 si queda por debajo de `minimo` (ver minimos)."""
+        nuevo = columna + incremento
+        return case((nuevo < minimo, 0), else_=nuevo)
+
+    @staticmethod
+    def cambios_por_consumo(cantidad: int) -> dict:
+        """Valores para un Query.update() que registran el consumo de `cantidad` piezas."""
+        consumo, reorden = ReordenService.incremento(cantidad)
+        minimo_consumo, minimo_reorden = ReordenService.minimos()
+        return {
+            Pieza.consumo_diario: ReordenService.acumular(Pieza.consumo_diario, consumo, minimo_consumo),
+            Pieza.punto_reorden: ReordenService.acumular(Pieza.punto_reorden, reorden, minimo_reorden),
+        }
+
+    @staticmethod
+    def recalcular(db: Session, hoy: Optional[datetime] = None) -> int:
+        """
+        Recalcula consumo y punto de reorden de todas las piezas con una sola consulta agregada
+        (SUM(cantidad) GROUP BY pieza_id sobre las OTs de la ventana) y un UPDATE por lote.
+        Devuelve cuántas piezas tienen consumo. Hace commit.
+        """
+        ventana = max(settings.REORDEN_VENTANA_DIAS, 1)
+        desde = (hoy or datetime.now()) - timedelta(days=ventana)
+        consumos = (
+            db.query(OrdenTrabajoPieza.pieza_id, func.sum(OrdenTrabajoPieza.cantidad))
+            .join(OrdenTrabajo, OrdenTrabajo.id == OrdenTrabajoPieza.orden_trabajo_id)
+            .filter(OrdenTrabajo.fecha_recepcion >= desde)
+            .group_by(OrdenTrabajoPieza.pieza_id)
+            .all()
+        )
+        db.query(Pieza).filter(or_(Pieza.consumo_diario != 0, Pieza.punto_reorden != 0)).update(
+            {Pieza.consumo_diario: 0, Pieza.punto_reorden: 0}, synchronize_session=False,
+        )
+        filas = []
+        for pieza_id, total in consumos:
+            consumo = Decimal(int(total or 0)) / ventana
+            if consumo > 0:
+                filas.append({
+                    "id": pieza_id,
+                    "consumo_diario": round(consumo, 4),
+                    "punto_reorden": round(consumo * settings.REORDEN_DIAS_COBERTURA, 2),
+                })
+        if filas:
+            db.execute(update(Pieza), filas)
+        db.commit()
+        return len(filas)
+
+    @staticmethod
+    def sugerencia(pieza: Pieza) -> dict:
+        """
+        Datos de compra de una pieza: días que alcanza el stock al consumo actual y cantidad
+        sugerida para volver a tener dos coberturas (punto de reorden x 2).
+        """
+        consumo = float(pieza.consumo_diario or 0)
+        punto = float(pieza.punto_reorden or 0)
+        return {
+            "consumo_diario": round(consumo, 4),
+            "punto_reorden": round(punto, 2),
+            "dias_restantes": round(pieza.stock / consumo, 1) if consumo > 0 else None,
+            "cantidad_sugerida": max(math.ceil(punto * 2) - pieza.stock, 0),
+        }
@@ -0,0 +1,59 @@
+import hashlib
+import os
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+# Tamaño de bloque para copiar el archivo subido a disco
+CHUNK_SIZE = 256 * 1024
+
+
+class UploadService:
+    """Guardado de archivos subidos (fotos de órdenes y subtareas)"""
+
+    @staticmethod
+    def nombre_seguro(filename: Optional[str], default: str = "archivo") -> str:
+        """Nombre de archivo del cliente sin rutas ni caracteres problemáticos."""
+        nombre = os.path.basename((filename or "").replace("\\", "/")).strip()
+        nombre = "".join(c if c.isalnum() or c in "._-" else "_" for c in nombre)
+        return nombre.lstrip(".") or default
+
+    @staticmethod
+    def guardar_archivo(origen: BinaryIO, destino: str, max_bytes: Optional[int] = None) -> dict:
+        """
+        Copiar el archivo subido a `destino` por bloques, calculando SHA-256 y cortando en cuanto
+        supera `max_bytes` (default settings.MAX_UPLOAD_SIZE) con 413. Para las fotos el cuerpo ya
+        se limitó al recibirlo (app/core/limite_subidas.py); aquí se valida el archivo en sí.
+
+        Es bloqueante: llamarlo desde endpoints `def` (FastAPI los ejecuta en el threadpool),
+        nunca directamente desde un `async def`. Escribe en `destino.part` y renombra al final,
+        así nunca queda un archivo a medias con el nombre definitivo.
+        """
+        limite = settings.MAX_UPLOAD_SIZE if max_bytes is None else max_bytes
+        temporal = destino + ".part"
+        sha256 = hashlib.sha256()
+        tamano = 0
+        try:
+            with open(temporal, "wb") as buffer:
+                while True:
+                    bloque = origen.read(CHUNK_SIZE)
+                    if not bloque:
+                        break
+                    tamano += len(bloque)
+                    if tamano > limite:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"El archivo excede el tamaño máximo de {limite // (1024 * 1024)} MB"
+                        )
+                    sha256.update(bloque)
+                    buffer.write(bloque)
+            if tamano == 0:
+                raise HTTPException(status_code=400, detail="El archivo está vacío")
+            os.replace(temporal, destino)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        return {"path": destino, "size": tamano, "sha256": sha256.hexdigest()}
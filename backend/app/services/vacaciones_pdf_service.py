@@ -0,0 +1,181 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from types import SimpleNamespace
+from typing import Dict, Optional, Set
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PDF_DIR = os.path.join("uploads", "vacaciones")
+
+# Valores de pdf_status
+PDF_LISTO = "LISTO"
+PDF_GENERANDO = "GENERANDO"
+PDF_ERROR = "ERROR"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_pendientes: Dict[str, Future] = {}
+# Rutas cuya generación falló en este proceso (se reintenta al volver a pedir el PDF con encolar)
+_fallidos: Set[str] = set()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.PDF_WORKERS, thread_name_prefix="pdf-vacaciones")
+        return _executor
+
+
+class VacacionesPdfService:
+    """
+    Cola de generación de PDFs de solicitudes de vacaciones con caché en disco.
+
+    Cada PDF se guarda como uploads/vacaciones/vacaciones_<id>_<hash>.pdf, donde el hash es el de
+    todos los datos que aparecen en el documento (solicitud, empleado, aprobador). Si nada cambió se
+    sirve el mismo archivo; si cambió, el nombre es otro y se genera de nuevo en el pool de hilos.
+
+    La cola es de cada worker de uvicorn; lo único compartido es el disco. Cada render escribe en
+    su propio temporal (pid + uuid) y lo publica con os.replace, así que si dos workers generan el
+    mismo documento a la vez el último reemplazo gana con un archivo completo. estado() solo
+    consulta: un worker que no tiene el PDF en su cola ni en disco no sabe si otro lo está
+    generando y reporta GENERANDO; lo que vuelve a encolar es pedir /pdf de nuevo.
+    """
+
+    @staticmethod
+    def _datos(solicitud, aprobador=None):
+        """Copia de los datos del PDF (independiente de la sesión de BD, segura para otro hilo) y su hash."""
+        empleado = solicitud.empleado
+        if aprobador is None and solicitud.aprobada_por_id:
+            aprobador = solicitud.aprobada_por
+        sol = SimpleNamespace(
+            id=solicitud.id,
+            tipo=solicitud.tipo,
+            estado=solicitud.estado,
+            fecha_inicio=solicitud.fecha_inicio,
+            fecha_fin=solicitud.fecha_fin,
+            cantidad=solicitud.cantidad,
+            fecha_solicitud=solicitud.fecha_solicitud,
+            fecha_aprobacion=solicitud.fecha_aprobacion,
+            observaciones=solicitud.observaciones,
+        )
+        emp = SimpleNamespace(
+            id=empleado.id,
+            nombre_completo=empleado.nombre_completo,
+            rfc=empleado.rfc,
+            departamento=empleado.departamento,
+            puesto_especifico=empleado.puesto_especifico,
+            fecha_ingreso=empleado.fecha_ingreso,
+        )
+        apr = SimpleNamespace(nombre_completo=aprobador.nombre_completo) if aprobador else None
+        estado = json.dumps(
+            [vars(sol), vars(emp), vars(apr) if apr else None],
+            default=lambda v: getattr(v, "value", None) or str(v),
+            sort_keys=True,
+        )
+        return sol, emp, apr, hashlib.sha256(estado.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def ruta_pdf(solicitud, aprobador=None) -> str:
+        *_, clave = VacacionesPdfService._datos(solicitud, aprobador)
+        return os.path.join(PDF_DIR, f"vacaciones_{solicitud.id}_{clave}.pdf")
+
+    @staticmethod
+    def _generar(sol, emp, apr, ruta: str) -> str:
+        # ReportLab se importa al generar el primer PDF, no al arrancar el worker
+        from app.utils.pdf_generator import generar_pdf_solicitud_vacaciones
+
+        temporal = f"{ruta}.{os.getpid()}.{uuid.uuid4().hex}.part"
+        try:
+            generar_pdf_solicitud_vacaciones(sol, emp, apr, filepath=temporal)
+            os.replace(temporal, ruta)
+        except BaseException:
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            raise
+        # Versiones anteriores del mismo documento ya no se sirven
+        for anterior in glob.glob(os.path.join(PDF_DIR, f"vacaciones_{sol.id}_*.pdf")):
+            if os.path.normpath(anterior) != os.path.normpath(ruta):
+                try:
+                    os.remove(anterior)
+                except OSError:
+                    pass
+        return ruta
+
+    @staticmethod
+    def _terminar(ruta: str, futuro: Future) -> None:
+        with _lock:
+            if _pendientes.get(ruta) is futuro:
+                del _pendientes[ruta]
+                if futuro.exception() is not None:
+                    _fallidos.add(ruta)
+        if futuro.exception() is not None:
+            logger.error("Error al generar PDF %s: %s", ruta, futuro.exception())
+
+    @staticmethod
+    def encolar(solicitud, aprobador=None) -> str:
+        """
+        Pide el PDF del estado actual de la solicitud. Regresa de inmediato con la ruta
+        (pdf_url); si aún no existe queda en cola. Ver estado() para el pdf_status.
+        """
+        sol, emp, apr, clave = VacacionesPdfService._datos(solicitud, aprobador)
+        ruta = os.path.join(PDF_DIR, f"vacaciones_{sol.id}_{clave}.pdf")
+        if os.path.exists(ruta):
+            return ruta
+        os.makedirs(PDF_DIR, exist_ok=True)
+        executor = _get_executor()
+        with _lock:
+            if ruta in _pendientes:
+                return ruta
+            _fallidos.discard(ruta)
+            futuro = executor.submit(VacacionesPdfService._generar, sol, emp, apr, ruta)
+            _pendientes[ruta] = futuro
+        futuro.add_done_callback(lambda f: VacacionesPdfService._terminar(ruta, f))
+        return ruta
+
+    @staticmethod
+    def estado(ruta: Optional[str], solicitud=None) -> Optional[str]:
+        """
+        pdf_status de una ruta devuelta por encolar(): LISTO, GENERANDO, ERROR o None si no se pidió.
+        Solo consulta, no encola. Si la ruta no está en disco ni en la cola de este worker (la pidió
+        otro worker) se reporta GENERANDO; con la `solicitud`, ERROR si la ruta ya no corresponde a
+        su estado actual. En ambos casos pedir /pdf de nuevo la (re)genera.
+        """
+        if not ruta:
+            return None
+        if os.path.exists(ruta):
+            return PDF_LISTO
+        with _lock:
+            if ruta in _pendientes:
+                return PDF_GENERANDO
+            if ruta in _fallidos:
+                return PDF_ERROR
+        if solicitud is not None and VacacionesPdfService.ruta_pdf(solicitud) != ruta:
+            # Los datos cambiaron desde que se pidió: esa versión ya no se genera
+            return PDF_ERROR
+        return PDF_GENERANDO
+
+    @staticmethod
+    def esperar(ruta: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Espera a que la ruta esté generada (bloqueante). None si no terminó en `timeout` segundos."""
+        with _lock:
+            futuro = _pendientes.get(ruta)
+        if futuro is not None:
+            try:
+                futuro.result(timeout=settings.PDF_ESPERA_SEGUNDOS if timeout is None else timeout)
+            except FutureTimeoutError:
+                return None
+            except Exception:
+                # El error ya quedó en el log (_terminar)
+                return None
+        return ruta if os.path.exists(ruta) else None
@@ -1,3 +1,11 @@
-from .pdf_generator import generar_pdf_solicitud_vacaciones
+# Los generadores de PDF importan ReportLab; se cargan al primer uso (PEP 562) y no al importar app.utils
+
+
+def __getattr__(nombre):
+    if nombre == "generar_pdf_solicitud_vacaciones":
+        from .pdf_generator import generar_pdf_solicitud_vacaciones
+        return generar_pdf_solicitud_vacaciones
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
 
 __all__ = ['generar_pdf_solicitud_vacaciones']
@@ -0,0 +1,146 @@
+"""
+Base compartida para los PDFs del sistema (ReportLab).
+
+Estilos de párrafo, estilos de tabla, fuentes y márgenes se construyen una sola vez al importar
+el módulo y se reutilizan en cada documento; los generadores (pdf_generator.py, etc.) solo arman
+el contenido. Los objetos de estilo son de solo lectura, por lo que se pueden usar desde varios
+hilos (cola de PDFs) al mismo tiempo.
+"""
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+# Fuentes (Type 1 estándar, no requieren registro)
+FUENTE = "Helvetica"
+FUENTE_NEGRITA = "Helvetica-Bold"
+
+# Colores
+AZUL = colors.HexColor("#1976d2")
+AZUL_CLARO = colors.HexColor("#e3f2fd")
+VERDE = colors.HexColor("#2e7d32")
+VERDE_CLARO = colors.HexColor("#e8f5e9")
+GRIS_CLARO = colors.HexColor("#f5f5f5")
+
+# Márgenes de página por defecto
+MARGENES = {
+    "topMargin": 0.5 * inch,
+    "bottomMargin": 0.5 * inch,
+    "leftMargin": 0.75 * inch,
+    "rightMargin": 0.75 * inch,
+}
+
+_base = getSampleStyleSheet()
+
+ESTILOS = {
+    "titulo": ParagraphStyle(
+        "CustomTitle",
+        parent=_base["Heading1"],
+        fontSize=16,
+        textColor=AZUL,
+        spaceAfter=10,
+        alignment=TA_CENTER,
+        fontName=FUENTE_NEGRITA,
+    ),
+    "encabezado": ParagraphStyle(
+        "CustomHeading",
+        parent=_base["Heading2"],
+        fontSize=12,
+        textColor=AZUL,
+        spaceAfter=6,
+        spaceBefore=6,
+        fontName=FUENTE_NEGRITA,
+    ),
+    "normal": ParagraphStyle(
+        "CustomNormal",
+        parent=_base["Normal"],
+        fontSize=10,
+        spaceAfter=3,
+    ),
+    "pequeno": ParagraphStyle(
+        "CustomSmall",
+        parent=_base["Normal"],
+        fontSize=8,
+        textColor=colors.grey,
+    ),
+    "derecha": ParagraphStyle(
+        "CustomRight",
+        parent=_base["Normal"],
+        fontSize=10,
+        alignment=TA_RIGHT,
+    ),
+}
+
+
+def _estilo_tabla_datos(fondo, texto) -> TableStyle:
+    """Tabla etiqueta/valor: primera columna resaltada, cuadrícula gris."""
+    return TableStyle([
+        ("BACKGROUND", (0, 0), (0, -1), fondo),
+        ("TEXTCOLOR", (0, 0), (0, -1), texto),
+        ("FONTNAME", (0, 0), (0, -1), FUENTE_NEGRITA),
+        ("FONTNAME", (1, 0), (1, -1), FUENTE),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 8),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ])
+
+
+ESTILOS_TABLA = {
+    "datos_azul": _estilo_tabla_datos(AZUL_CLARO, AZUL),
+    "datos_verde": _estilo_tabla_datos(VERDE_CLARO, VERDE),
+    # Tabla con encabezado en la primera fila (listas de conceptos, piezas, etc.)
+    "lista": TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), AZUL),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("FONTNAME", (0, 0), (-1, 0), FUENTE_NEGRITA),
+        ("FONTNAME", (0, 1), (-1, -1), FUENTE),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, GRIS_CLARO]),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("TOPPADDING", (0, 0), (-1, -1), 3),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+    ]),
+    # Bloque de firmas: línea, nombre en negritas y leyenda
+    "firmas": TableStyle([
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 2), (-1, 2), FUENTE_NEGRITA),
+        ("FONTNAME", (0, 3), (-1, 3), FUENTE),
+        ("FONTSIZE", (0, 0), (-1, 1), 9),
+        ("FONTSIZE", (0, 2), (-1, 2), 9),
+        ("FONTSIZE", (0, 3), (-1, 3), 8),
+        ("TOPPADDING", (0, 0), (-1, 0), 8),
+        ("BOTTOMPADDING", (0, 1), (-1, 1), 2),
+        ("TOPPADDING", (0, 2), (-1, 2), 4),
+        ("TOPPADDING", (0, 3), (-1, 3), 2),
+    ]),
+}
+
+
+def documento(destino, pagesize=letter, **margenes) -> SimpleDocTemplate:
+    """SimpleDocTemplate con los márgenes estándar. `destino` puede ser ruta o archivo (BytesIO)."""
+    return SimpleDocTemplate(destino, pagesize=pagesize, **{**MARGENES, **margenes})
+
+
+def tabla(filas, estilo: str, col_widths) -> Table:
+    """Table con uno de los estilos precompilados de ESTILOS_TABLA."""
+    t = Table(filas, colWidths=col_widths)
+    t.setStyle(ESTILOS_TABLA[estilo])
+    return t
+
+
+def tabla_firmas(izquierda: str, derecha: str, leyenda_izquierda: str, leyenda_derecha: str) -> Table:
+    """Bloque de dos firmas con línea, nombre y leyenda."""
+    filas = [
+        ["", ""],
+        ["_" * 40, "_" * 40],
+        [izquierda, derecha],
+        [leyenda_izquierda, leyenda_derecha],
+    ]
+    return tabla(filas, "firmas", [3 * inch, 3 * inch])
@@ -1,14 +1,12 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.platypus import Paragraph, Spacer
 from datetime import datetime
 import os
 
+from app.utils.pdf_base import ESTILOS, documento, tabla, tabla_firmas
 
-def generar_pdf_solicitud_vacaciones(solicitud, empleado, aprobador=None):
+
+def generar_pdf_solicitud_vacaciones(solicitud, empleado, aprobador=None, filepath=None):
     """
     Genera un PDF de solicitud de vacaciones
     
@@ -16,57 +14,26 @@ def generar_pdf_solicitud_vacaciones(solicitud, empleado, aprobador=None):
         solicitud: Objeto SolicitudVacaciones
         empleado: Objeto User (empleado que solicita)
         aprobador: Objeto User (quien aprobó) - opcional
+        filepath: Ruta destino - opcional (default: uploads/vacaciones con timestamp)
     
     Returns:
         str: Ruta del archivo PDF generado
     """
-    # Crear directorio si no existe
-    pdf_dir = "uploads/vacaciones"
-    os.makedirs(pdf_dir, exist_ok=True)
-    
-    # Nombre del archivo
-    filename = f"solicitud_vacaciones_{solicitud.id}_{empleado.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    filepath = os.path.join(pdf_dir, filename)
-    
-    # Crear documento con márgenes reducidos
-    doc = SimpleDocTemplate(
-        filepath, 
-        pagesize=letter,
-        topMargin=0.5*inch,
-        bottomMargin=0.5*inch,
-        leftMargin=0.75*inch,
-        rightMargin=0.75*inch
-    )
+    if filepath is None:
+        # Crear directorio si no existe
+        pdf_dir = "uploads/vacaciones"
+        os.makedirs(pdf_dir, exist_ok=True)
+        
+        # Nombre del archivo
+        filename = f"solicitud_vacaciones_{solicitud.id}_{empleado.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        filepath = os.path.join(pdf_dir, filename)
+    
+    # Documento con márgenes estándar; estilos precompilados en pdf_base
+    doc = documento(filepath)
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Estilos personalizados
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.HexColor('#1976d2'),
-        spaceAfter=10,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=12,
-        textColor=colors.HexColor('#1976d2'),
-        spaceAfter=6,
-        spaceBefore=6,
-        fontName='Helvetica-Bold'
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=3
-    )
+    title_style = ESTILOS["titulo"]
+    heading_style = ESTILOS["encabezado"]
+    normal_style = ESTILOS["normal"]
     
     # Título
     story.append(Paragraph("SOLICITUD DE VACACIONES", title_style))
@@ -89,20 +56,7 @@ def generar_pdf_solicitud_vacaciones(solicitud, empleado, aprobador=None):
         ['Fecha de Ingreso:', empleado.fecha_ingreso.strftime('%d/%m/%Y') if empleado.fecha_ingreso else 'N/A']
     ]
     
-    empleado_table = Table(empleado_data, colWidths=[2*inch, 4*inch])
-    empleado_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e3f2fd')),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#1976d2')),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    empleado_table = tabla(empleado_data, "datos_azul", [2*inch, 4*inch])
     story.append(empleado_table)
     story.append(Spacer(1, 0.1*inch))
     
@@ -126,20 +80,7 @@ def generar_pdf_solicitud_vacaciones(solicitud, empleado, aprobador=None):
     if solicitud.observaciones:
         solicitud_data.append(['Observaciones:', solicitud.observaciones])
     
-    solicitud_table = Table(solicitud_data, colWidths=[2*inch, 4*inch])
-    solicitud_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f5e9')),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2e7d32')),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    solicitud_table = tabla(solicitud_data, "datos_verde", [2*inch, 4*inch])
     story.append(solicitud_table)
     story.append(Spacer(1, 0.15*inch))
     
@@ -158,29 +99,12 @@ def generar_pdf_solicitud_vacaciones(solicitud, empleado, aprobador=None):
     if aprobador:
         nombre_aprobador = str(aprobador.nombre_completo).upper()
     
-    firmas_data = [
-        ['', ''],
-        ['_' * 40, '_' * 40],
-        [
-            str(empleado.nombre_completo).upper(),
-            nombre_aprobador
-        ],
-        ['Empleado Solicitante', 'Autoriza']
-    ]
-    
-    firmas_table = Table(firmas_data, colWidths=[3*inch, 3*inch])
-    firmas_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 3), (-1, 3), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, 1), 9),
-        ('FONTSIZE', (0, 2), (-1, 2), 9),
-        ('FONTSIZE', (0, 3), (-1, 3), 8),
-        ('TOPPADDING', (0, 0), (-1, 0), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, 1), 2),
-        ('TOPPADDING', (0, 2), (-1, 2), 4),
-        ('TOPPADDING', (0, 3), (-1, 3), 2),
-    ]))
+    firmas_table = tabla_firmas(
+        str(empleado.nombre_completo).upper(),
+        nombre_aprobador,
+        'Empleado Solicitante',
+        'Autoriza'
+    )
     story.append(firmas_table)
     
     # Construir PDF
@@ -0,0 +1,184 @@
+"""
+Comprobantes de órdenes de trabajo (recepción / entrega) en PDF.
+
+Recibe los dicts que arma _orden_to_response_dict (api/v1/ordenes.py) y genera todas las órdenes
+en un solo documento, una por página, con un único doc.build. Las fotos se insertan como
+miniaturas: se usa la variante __thumb si existe y, si no, se reduce el original en memoria una
+sola vez por lote.
+"""
+import io
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from PIL import Image as PILImage, ImageOps
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, PageBreak, Paragraph, Spacer, Table, TableStyle
+
+from app.services.image_service import ImageService
+from app.utils.pdf_base import ESTILOS, documento, tabla, tabla_firmas
+
+logger = logging.getLogger(__name__)
+
+TIPO_RECEPCION = "recepcion"
+TIPO_ENTREGA = "entrega"
+ESTADOS_ENTREGA = {"ENTREGADO", "FINALIZADO"}
+
+MAX_FOTOS = 6
+LADO_MINIATURA_PX = 320
+ANCHO_FOTO = 1.9 * inch
+
+
+def _fecha(valor, con_hora: bool = True) -> str:
+    if not valor:
+        return "N/A"
+    if isinstance(valor, str):
+        try:
+            valor = datetime.fromisoformat(valor)
+        except ValueError:
+            return valor
+    return valor.strftime("%d/%m/%Y %H:%M" if con_hora and isinstance(valor, datetime) else "%d/%m/%Y")
+
+
+def _dinero(valor) -> str:
+    try:
+        return f"${float(valor or 0):,.2f}"
+    except (TypeError, ValueError):
+        return "$0.00"
+
+
+def _texto(valor) -> str:
+    """Texto libre listo para un Paragraph: se escapan <, > y & (ReportLab los interpreta como marcado) y se conservan los saltos de línea."""
+    return escape(str(valor or "")).replace("\n", "<br/>")
+
+
+def _miniatura(url: str, cache: Dict[str, Optional[tuple]]) -> Optional[Image]:
+    """Flowable con la miniatura de la foto (variante thumb o reducción del original); los bytes se cachean por lote."""
+    if url not in cache:
+        cache[url] = None
+        thumb = ImageService.variantes_url(url).get("thumb")
+        ruta = (thumb or url or "").lstrip("/")
+        try:
+            if ruta and os.path.isfile(ruta):
+                with PILImage.open(ruta) as img:
+                    img = ImageOps.exif_transpose(img)
+                    if img.mode not in ("RGB", "L"):
+                        img = img.convert("RGB")
+                    img.thumbnail((LADO_MINIATURA_PX, LADO_MINIATURA_PX))
+                    buf = io.BytesIO()
+                    img.save(buf, format="JPEG", quality=75)
+                    cache[url] = (buf.getvalue(), img.size[0], img.size[1])
+        except Exception as e:
+            logger.warning("No se pudo insertar la foto %s en el PDF: %s", url, e)
+    if cache[url] is None:
+        return None
+    datos, ancho, alto = cache[url]
+    return Image(io.BytesIO(datos), width=ANCHO_FOTO, height=ANCHO_FOTO * alto / ancho)
+
+
+def _tabla_fotos(urls: List[str], cache: Dict[str, Optional[tuple]]) -> Optional[Table]:
+    imagenes = [img for img in (_miniatura(u, cache) for u in urls[:MAX_FOTOS]) if img is not None]
+    if not imagenes:
+        return None
+    filas = [imagenes[i:i + 3] for i in range(0, len(imagenes), 3)]
+    filas[-1] += [""] * (3 - len(filas[-1]))
+    t = Table(filas, colWidths=[ANCHO_FOTO + 0.2 * inch] * 3)
+    t.setStyle(TableStyle([("ALIGN", (0, 0), (-1, -1), "CENTER"), ("VALIGN", (0, 0), (-1, -1), "MIDDLE")]))
+    return t
+
+
+def _story_orden(orden: dict, tipo: str, cache: Dict[str, Optional[tuple]]) -> list:
+    normal = ESTILOS["normal"]
+    encabezado = ESTILOS["encabezado"]
+    entrega = tipo == TIPO_ENTREGA
+    story = [
+        Paragraph("COMPROBANTE DE ENTREGA" if entrega else "COMPROBANTE DE RECEPCIÓN", ESTILOS["titulo"]),
+        Paragraph(f"<b>Folio:</b> {_texto(orden.get('folio'))}", normal),
+        Paragraph(f"<b>Fecha de emisión:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}", normal),
+        Spacer(1, 0.1 * inch),
+        Paragraph("DATOS DE LA ORDEN", encabezado),
+    ]
+    datos = [
+        ["Cliente:", orden.get("cliente_nombre") or "N/A"],
+        ["Sucursal:", orden.get("sucursal_nombre") or "N/A"],
+        ["Categoría:", " / ".join(x for x in (orden.get("categoria_nombre"), orden.get("subcategoria_nombre")) if x) or "N/A"],
+        ["Recibió:", orden.get("usuario_recepcion_nombre") or "N/A"],
+        ["Técnico:", orden.get("tecnico_nombre") or "Sin asignar"],
+        ["Prioridad / Estado:", f"{orden.get('prioridad')} / {orden.get('estatus')}"],
+        ["Fecha de recepción:", _fecha(orden.get("fecha_recepcion"))],
+        ["Fecha promesa:", _fecha(orden.get("fecha_promesa"))],
+    ]
+    if entrega:
+        datos.append(["Fecha de entrega:", _fecha(orden.get("fecha_entrega") or datetime.now())])
+    story.append(tabla(datos, "datos_azul", [2 * inch, 4.5 * inch]))
+    story.append(Spacer(1, 0.1 * inch))
+
+    story.append(Paragraph("DESCRIPCIÓN DEL TRABAJO", encabezado))
+    story.append(Paragraph(_texto(orden.get("descripcion")), normal))
+    if orden.get("observaciones"):
+        story.append(Paragraph(f"<b>Observaciones:</b> {_texto(orden['observaciones'])}", normal))
+
+    subtareas = orden.get("subtareas") or []
+    if subtareas:
+        story.append(Paragraph("SUBTAREAS", encabezado))
+        filas = [["Subtarea", "Técnico", "Estado"]] + [
+            [st.get("titulo") or "", st.get("tecnico_nombre") or "", st.get("estado") or ""] for st in subtareas
+        ]
+        story.append(tabla(filas, "lista", [3.5 * inch, 2 * inch, 1 * inch]))
+
+    piezas = orden.get("piezas_usadas") or []
+    if entrega and piezas:
+        story.append(Paragraph("PIEZAS", encabezado))
+        filas = [["Código", "Pieza", "Cant.", "Subtotal"]] + [
+            [p.get("pieza_codigo") or "", p.get("pieza_nombre") or "", str(p.get("cantidad") or 0), _dinero(p.get("subtotal"))]
+            for p in piezas
+        ]
+        story.append(tabla(filas, "lista", [1.2 * inch, 3.3 * inch, 0.7 * inch, 1.3 * inch]))
+
+    story.append(Paragraph("IMPORTES", encabezado))
+    importes = [["Precio estimado:", _dinero(orden.get("precio_estimado"))], ["Anticipo:", _dinero(orden.get("anticipo"))]]
+    if entrega:
+        importes += [
+            ["Total:", _dinero(orden.get("total_final"))],
+            ["Saldo pendiente:", _dinero(orden.get("saldo_pendiente_total"))],
+        ]
+    story.append(tabla(importes, "datos_verde", [2 * inch, 4.5 * inch]))
+
+    fotos = [orden["foto_salida"]] if entrega and orden.get("foto_salida") else (orden.get("fotos_entrada_list") or [])
+    tabla_fotos = _tabla_fotos(fotos, cache)
+    if tabla_fotos is not None:
+        story.append(Paragraph("FOTOS DE SALIDA" if entrega else "FOTOS DE ENTRADA", encabezado))
+        story.append(tabla_fotos)
+
+    story.append(Spacer(1, 0.3 * inch))
+    story.append(tabla_firmas(
+        str(orden.get("usuario_recepcion_nombre") or "").upper() if not entrega else "",
+        str(orden.get("cliente_nombre") or "").upper(),
+        "Entrega taller" if entrega else "Recibe taller",
+        "Recibe cliente" if entrega else "Entrega cliente",
+    ))
+    return story
+
+
+def tipo_comprobante(orden: dict, tipo: Optional[str] = None) -> str:
+    """Tipo pedido o, si no se indica, entrega para órdenes entregadas y recepción para las demás."""
+    if tipo in (TIPO_RECEPCION, TIPO_ENTREGA):
+        return tipo
+    return TIPO_ENTREGA if orden.get("estatus") in ESTADOS_ENTREGA else TIPO_RECEPCION
+
+
+def generar_pdf_ordenes(ordenes: List[dict], destino, tipo: Optional[str] = None):
+    """
+    Genera los comprobantes de `ordenes` (dicts de _orden_to_response_dict) en un solo PDF,
+    una orden por página. `destino` puede ser ruta o archivo (BytesIO).
+    """
+    cache: Dict[str, Optional[tuple]] = {}
+    story = []
+    for i, orden in enumerate(ordenes):
+        if i:
+            story.append(PageBreak())
+        story += _story_orden(orden, tipo_comprobante(orden, tipo), cache)
+    documento(destino, title="Comprobantes de órdenes de trabajo").build(story)
+    return destino
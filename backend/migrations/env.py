@@ -0,0 +1,67 @@
+"""
+Entorno de Alembic.
+
+Usa DATABASE_URL de app/config.py y los modelos de app.models como metadata de referencia
+(autogenerate). scripts/migrar.py pasa su propia conexión en config.attributes["connection"].
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.types import TypeDecorator
+
+from app.config import settings
+from app.database import Base
+import app.models  # noqa: F401  (registra todas las tablas en Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configurar_logging", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _render_item(tipo, obj, autogen_context):
+    """Los TypeDecorator de los modelos (enums guardados como VARCHAR) se escriben con su tipo base."""
+    if tipo == "type" and isinstance(obj, TypeDecorator):
+        return f"sa.{obj.impl!r}"
+    return False
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL sin conectarse (alembic upgrade head --sql)."""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        compare_type=True,
+        render_item=_render_item,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _configurar_y_migrar(connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata, compare_type=True, render_item=_render_item
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configurar_y_migrar(connection)
+        return
+    engine = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _configurar_y_migrar(connection)
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
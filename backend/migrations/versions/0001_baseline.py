@@ -0,0 +1,598 @@
+"""Esquema base
+
+Esquema completo tal como lo dejaban init.sql más el bloque de DDL de arranque de app/main.py
+(tablas de fotos, sub-órdenes, piezas, caja, folios; columnas sub_orden_id, catalogo_id,
+subcatalogo_id, usuarios.codigo, gastos.categoria; índice de paginación de órdenes).
+
+Bases nuevas: crea todo. Bases existentes sin tabla alembic_version: scripts/migrar.py completa lo
+que falte con el mismo DDL idempotente de antes y las marca (stamp) en esta revisión.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('caja_saldos_diarios',
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('total_entradas', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_salidas', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('num_movimientos', sa.Integer(), nullable=False),
+    sa.Column('saldo_inicial', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('saldo_final', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('fecha')
+    )
+    op.create_table('catalogos_pieza',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=False),
+    sa.Column('descripcion', sa.String(length=255), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_catalogos_pieza_id'), 'catalogos_pieza', ['id'], unique=False)
+    op.create_index(op.f('ix_catalogos_pieza_nombre'), 'catalogos_pieza', ['nombre'], unique=False)
+    op.create_table('categorias_orden',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=False),
+    sa.Column('descripcion', sa.String(length=255), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_categorias_orden_id'), 'categorias_orden', ['id'], unique=False)
+    op.create_index(op.f('ix_categorias_orden_nombre'), 'categorias_orden', ['nombre'], unique=True)
+    op.create_table('clientes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tipo_cliente', sa.Enum('PERSONA_FISICA', 'PERSONA_MORAL', name='tipoclienteenum'), nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=False),
+    sa.Column('apellido_paterno', sa.String(length=100), nullable=True),
+    sa.Column('apellido_materno', sa.String(length=100), nullable=True),
+    sa.Column('razon_social', sa.String(length=200), nullable=True),
+    sa.Column('rfc', sa.String(length=13), nullable=True),
+    sa.Column('email', sa.String(length=100), nullable=True),
+    sa.Column('telefono', sa.String(length=15), nullable=False),
+    sa.Column('telefono_alternativo', sa.String(length=15), nullable=True),
+    sa.Column('calle', sa.String(length=200), nullable=True),
+    sa.Column('numero_exterior', sa.String(length=20), nullable=True),
+    sa.Column('numero_interior', sa.String(length=20), nullable=True),
+    sa.Column('colonia', sa.String(length=100), nullable=True),
+    sa.Column('codigo_postal', sa.String(length=5), nullable=True),
+    sa.Column('ciudad', sa.String(length=100), nullable=True),
+    sa.Column('estado', sa.String(length=100), nullable=True),
+    sa.Column('fecha_nacimiento', sa.Date(), nullable=True),
+    sa.Column('notas', sa.Text(), nullable=True),
+    sa.Column('preferencias', sa.Text(), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_clientes_email'), 'clientes', ['email'], unique=False)
+    op.create_index(op.f('ix_clientes_id'), 'clientes', ['id'], unique=False)
+    op.create_index(op.f('ix_clientes_nombre'), 'clientes', ['nombre'], unique=False)
+    op.create_index(op.f('ix_clientes_rfc'), 'clientes', ['rfc'], unique=True)
+    op.create_table('folio_secuencias',
+    sa.Column('prefijo', sa.String(length=10), nullable=False),
+    sa.Column('anio', sa.Integer(), nullable=False),
+    sa.Column('ultimo', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('prefijo', 'anio')
+    )
+    op.create_table('usuarios',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('nombre_completo', sa.String(length=100), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('rol', sa.Enum('ADMIN', 'TECNICO', 'RECEPCION', 'CAJA', 'AUXILIAR', 'JEFE_TALLER', name='rolenum'), nullable=False),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.Column('codigo', sa.String(length=4), nullable=True),
+    sa.Column('rfc', sa.String(length=13), nullable=True),
+    sa.Column('curp', sa.String(length=18), nullable=True),
+    sa.Column('nss', sa.String(length=11), nullable=True),
+    sa.Column('fecha_nacimiento', sa.Date(), nullable=True),
+    sa.Column('telefono', sa.String(length=15), nullable=True),
+    sa.Column('telefono_emergencia', sa.String(length=15), nullable=True),
+    sa.Column('contacto_emergencia', sa.String(length=100), nullable=True),
+    sa.Column('estado_civil', sa.Enum('SOLTERO', 'CASADO', 'DIVORCIADO', 'VIUDO', 'UNION_LIBRE', name='estadocivilenum'), nullable=True),
+    sa.Column('calle', sa.String(length=100), nullable=True),
+    sa.Column('numero', sa.String(length=20), nullable=True),
+    sa.Column('colonia', sa.String(length=100), nullable=True),
+    sa.Column('codigo_postal', sa.String(length=5), nullable=True),
+    sa.Column('ciudad', sa.String(length=100), nullable=True),
+    sa.Column('estado', sa.String(length=50), nullable=True),
+    sa.Column('fecha_ingreso', sa.Date(), nullable=True),
+    sa.Column('fecha_baja', sa.Date(), nullable=True),
+    sa.Column('motivo_baja', sa.Text(), nullable=True),
+    sa.Column('tipo_contrato', sa.Enum('PLANTA', 'TEMPORAL', 'POR_OBRA', name='tipocontratoenum'), nullable=True),
+    sa.Column('salario_base_diario', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('horario_trabajo', sa.String(length=100), nullable=True),
+    sa.Column('dias_descanso', sa.String(length=50), nullable=True),
+    sa.Column('departamento', sa.String(length=100), nullable=True),
+    sa.Column('puesto_especifico', sa.String(length=100), nullable=True),
+    sa.Column('jefe_directo_id', sa.Integer(), nullable=True),
+    sa.Column('dias_vacaciones_anio', sa.Integer(), nullable=False),
+    sa.Column('dias_vacaciones_disponibles', sa.Integer(), nullable=False),
+    sa.Column('dias_vacaciones_tomados', sa.Integer(), nullable=False),
+    sa.Column('dias_vacaciones_pendientes_anios_anteriores', sa.Integer(), nullable=False),
+    sa.Column('foto_url', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['jefe_directo_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_usuarios_codigo'), 'usuarios', ['codigo'], unique=True)
+    op.create_index(op.f('ix_usuarios_curp'), 'usuarios', ['curp'], unique=False)
+    op.create_index(op.f('ix_usuarios_email'), 'usuarios', ['email'], unique=True)
+    op.create_index(op.f('ix_usuarios_id'), 'usuarios', ['id'], unique=False)
+    op.create_index(op.f('ix_usuarios_rfc'), 'usuarios', ['rfc'], unique=False)
+    op.create_index(op.f('ix_usuarios_username'), 'usuarios', ['username'], unique=True)
+    op.create_table('aperturas_caja',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('monto', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_aperturas_caja_fecha'), 'aperturas_caja', ['fecha'], unique=True)
+    op.create_index(op.f('ix_aperturas_caja_id'), 'aperturas_caja', ['id'], unique=False)
+    op.create_index(op.f('ix_aperturas_caja_usuario_id'), 'aperturas_caja', ['usuario_id'], unique=False)
+    op.create_table('asistencias',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('empleado_id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('hora_entrada', sa.Time(), nullable=True),
+    sa.Column('hora_salida', sa.Time(), nullable=True),
+    sa.Column('tipo', sa.Enum('NORMAL', 'RETARDO', 'FALTA', 'FALTA_JUSTIFICADA', 'PERMISO', 'INCAPACIDAD', 'VACACIONES', 'DIA_FESTIVO', name='tipoasistenciaenum'), nullable=False),
+    sa.Column('observaciones', sa.Text(), nullable=True),
+    sa.Column('justificacion', sa.Text(), nullable=True),
+    sa.Column('documento_url', sa.String(length=255), nullable=True),
+    sa.Column('registrado_por_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['empleado_id'], ['usuarios.id'], ),
+    sa.ForeignKeyConstraint(['registrado_por_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_asistencias_fecha'), 'asistencias', ['fecha'], unique=False)
+    op.create_index(op.f('ix_asistencias_id'), 'asistencias', ['id'], unique=False)
+    op.create_table('cortes_caja',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('tipo', sa.String(length=20), nullable=False),
+    sa.Column('saldo_inicial', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_entradas', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_salidas', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('saldo_final', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('cerrado_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('usuario_cierre_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['usuario_cierre_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cortes_caja_fecha'), 'cortes_caja', ['fecha'], unique=False)
+    op.create_index(op.f('ix_cortes_caja_id'), 'cortes_caja', ['id'], unique=False)
+    op.create_index(op.f('ix_cortes_caja_tipo'), 'cortes_caja', ['tipo'], unique=False)
+    op.create_index(op.f('ix_cortes_caja_usuario_cierre_id'), 'cortes_caja', ['usuario_cierre_id'], unique=False)
+    op.create_table('documentos_empleado',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('empleado_id', sa.Integer(), nullable=False),
+    sa.Column('tipo_documento', sa.Enum('INE', 'ACTA_NACIMIENTO', 'CURP', 'RFC', 'COMPROBANTE_DOMICILIO', 'COMPROBANTE_ESTUDIOS', 'CONTRATO', 'CARTA_RECOMENDACION', 'CERTIFICADO_MEDICO', 'ANTECEDENTES_NO_PENALES', 'NSS', 'LICENCIA_CONDUCIR', 'OTRO', name='tipodocumentoenum'), nullable=False),
+    sa.Column('nombre_documento', sa.String(length=200), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('archivo_url', sa.String(length=255), nullable=False),
+    sa.Column('fecha_emision', sa.Date(), nullable=True),
+    sa.Column('fecha_vencimiento', sa.Date(), nullable=True),
+    sa.Column('estado', sa.Enum('VIGENTE', 'POR_VENCER', 'VENCIDO', 'NO_APLICA', name='estadodocumentoenum'), nullable=False),
+    sa.Column('verificado', sa.Boolean(), nullable=True),
+    sa.Column('verificado_por_id', sa.Integer(), nullable=True),
+    sa.Column('fecha_verificacion', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['empleado_id'], ['usuarios.id'], ),
+    sa.ForeignKeyConstraint(['verificado_por_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_documentos_empleado_id'), 'documentos_empleado', ['id'], unique=False)
+    op.create_table('incidencias_empleado',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('empleado_id', sa.Integer(), nullable=False),
+    sa.Column('fecha_incidencia', sa.Date(), nullable=False),
+    sa.Column('tipo', sa.Enum('RETARDO', 'FALTA_INJUSTIFICADA', 'LLAMADA_ATENCION', 'SANCION', 'SUSPENSION', 'RECONOCIMIENTO', 'BONO', 'AUMENTO', 'PROMOCION', 'CAPACITACION', 'ACCIDENTE_TRABAJO', 'OTRO', name='tipoincidenciaenum'), nullable=False),
+    sa.Column('severidad', sa.Enum('LEVE', 'MODERADA', 'GRAVE', 'MUY_GRAVE', 'POSITIVA', name='severidadenum'), nullable=False),
+    sa.Column('titulo', sa.String(length=200), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=False),
+    sa.Column('consecuencias', sa.Text(), nullable=True),
+    sa.Column('documento_url', sa.String(length=255), nullable=True),
+    sa.Column('registrado_por_id', sa.Integer(), nullable=False),
+    sa.Column('fecha_registro', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('requiere_seguimiento', sa.Integer(), nullable=True),
+    sa.Column('fecha_seguimiento', sa.Date(), nullable=True),
+    sa.Column('seguimiento_completado', sa.Integer(), nullable=True),
+    sa.Column('notas_seguimiento', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['empleado_id'], ['usuarios.id'], ),
+    sa.ForeignKeyConstraint(['registrado_por_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_incidencias_empleado_fecha_incidencia'), 'incidencias_empleado', ['fecha_incidencia'], unique=False)
+    op.create_index(op.f('ix_incidencias_empleado_id'), 'incidencias_empleado', ['id'], unique=False)
+    op.create_table('solicitudes_vacaciones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('empleado_id', sa.Integer(), nullable=False),
+    sa.Column('fecha_solicitud', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('fecha_inicio', sa.Date(), nullable=False),
+    sa.Column('fecha_fin', sa.Date(), nullable=False),
+    sa.Column('tipo', sa.Enum('DIAS_COMPLETOS', 'MEDIO_DIA', 'HORAS', name='tiposolicitudenum'), nullable=False),
+    sa.Column('cantidad', sa.Numeric(precision=5, scale=2), nullable=False),
+    sa.Column('estado', sa.Enum('PENDIENTE', 'APROBADA', 'RECHAZADA', 'TOMADA', 'CANCELADA', name='estadosolicitudenum'), nullable=False),
+    sa.Column('aprobada_por_id', sa.Integer(), nullable=True),
+    sa.Column('fecha_aprobacion', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('observaciones', sa.Text(), nullable=True),
+    sa.Column('motivo_rechazo', sa.Text(), nullable=True),
+    sa.Column('pdf_url', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['aprobada_por_id'], ['usuarios.id'], ),
+    sa.ForeignKeyConstraint(['empleado_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_solicitudes_vacaciones_id'), 'solicitudes_vacaciones', ['id'], unique=False)
+    op.create_table('subcatalogos_pieza',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('catalogo_id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=False),
+    sa.Column('descripcion', sa.String(length=255), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['catalogo_id'], ['catalogos_pieza.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_subcatalogos_pieza_catalogo_id'), 'subcatalogos_pieza', ['catalogo_id'], unique=False)
+    op.create_index(op.f('ix_subcatalogos_pieza_id'), 'subcatalogos_pieza', ['id'], unique=False)
+    op.create_index(op.f('ix_subcatalogos_pieza_nombre'), 'subcatalogos_pieza', ['nombre'], unique=False)
+    op.create_table('subcategorias_orden',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('categoria_id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=False),
+    sa.Column('descripcion', sa.String(length=255), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['categoria_id'], ['categorias_orden.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_subcategorias_orden_categoria_id'), 'subcategorias_orden', ['categoria_id'], unique=False)
+    op.create_index(op.f('ix_subcategorias_orden_id'), 'subcategorias_orden', ['id'], unique=False)
+    op.create_index(op.f('ix_subcategorias_orden_nombre'), 'subcategorias_orden', ['nombre'], unique=False)
+    op.create_table('sucursales',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=False),
+    sa.Column('nombre_sucursal', sa.String(length=200), nullable=False),
+    sa.Column('codigo_sucursal', sa.String(length=50), nullable=True),
+    sa.Column('telefono', sa.String(length=15), nullable=True),
+    sa.Column('telefono_alternativo', sa.String(length=15), nullable=True),
+    sa.Column('email', sa.String(length=100), nullable=True),
+    sa.Column('calle', sa.String(length=200), nullable=True),
+    sa.Column('numero_exterior', sa.String(length=20), nullable=True),
+    sa.Column('numero_interior', sa.String(length=20), nullable=True),
+    sa.Column('colonia', sa.String(length=100), nullable=True),
+    sa.Column('codigo_postal', sa.String(length=5), nullable=True),
+    sa.Column('ciudad', sa.String(length=100), nullable=True),
+    sa.Column('estado', sa.String(length=100), nullable=True),
+    sa.Column('notas', sa.Text(), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sucursales_cliente_id'), 'sucursales', ['cliente_id'], unique=False)
+    op.create_index(op.f('ix_sucursales_id'), 'sucursales', ['id'], unique=False)
+    op.create_index(op.f('ix_sucursales_nombre_sucursal'), 'sucursales', ['nombre_sucursal'], unique=False)
+    op.create_table('ordenes_trabajo',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('folio', sa.String(length=20), nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=False),
+    sa.Column('sucursal_id', sa.Integer(), nullable=True),
+    sa.Column('categoria_id', sa.Integer(), nullable=True),
+    sa.Column('subcategoria_id', sa.Integer(), nullable=True),
+    sa.Column('usuario_recepcion_id', sa.Integer(), nullable=False),
+    sa.Column('tecnico_asignado_id', sa.Integer(), nullable=True),
+    sa.Column('descripcion', sa.Text(), nullable=False),
+    sa.Column('observaciones', sa.Text(), nullable=True),
+    sa.Column('foto_entrada', sa.String(length=255), nullable=True),
+    sa.Column('foto_salida', sa.String(length=255), nullable=True),
+    sa.Column('nombre_contacto_notificacion', sa.String(length=200), nullable=True),
+    sa.Column('telefono_contacto_notificacion', sa.String(length=15), nullable=True),
+    sa.Column('tipo_permiso', sa.Enum('COTIZACION', 'ORDEN_COMPRA', 'REQUISICION', 'SERVICIO_DIRECTO', name='tipopermisoenum'), nullable=True),
+    sa.Column('numero_permiso', sa.String(length=50), nullable=True),
+    sa.Column('precio_estimado', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('anticipo', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('precio_final', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('estatus', sa.String(length=20), nullable=False),
+    sa.Column('prioridad', sa.String(length=20), nullable=False),
+    sa.Column('fecha_recepcion', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('fecha_promesa', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('fecha_inicio_trabajo', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('fecha_terminado', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('fecha_entrega', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['categoria_id'], ['categorias_orden.id'], ),
+    sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ),
+    sa.ForeignKeyConstraint(['subcategoria_id'], ['subcategorias_orden.id'], ),
+    sa.ForeignKeyConstraint(['sucursal_id'], ['sucursales.id'], ),
+    sa.ForeignKeyConstraint(['tecnico_asignado_id'], ['usuarios.id'], ),
+    sa.ForeignKeyConstraint(['usuario_recepcion_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ordenes_trabajo_categoria_id'), 'ordenes_trabajo', ['categoria_id'], unique=False)
+    op.create_index(op.f('ix_ordenes_trabajo_cliente_id'), 'ordenes_trabajo', ['cliente_id'], unique=False)
+    op.create_index(op.f('ix_ordenes_trabajo_estatus'), 'ordenes_trabajo', ['estatus'], unique=False)
+    op.create_index(op.f('ix_ordenes_trabajo_fecha_promesa'), 'ordenes_trabajo', ['fecha_promesa'], unique=False)
+    op.create_index('ix_ordenes_trabajo_fecha_recepcion_id', 'ordenes_trabajo', ['fecha_recepcion', 'id'], unique=False)
+    op.create_index(op.f('ix_ordenes_trabajo_folio'), 'ordenes_trabajo', ['folio'], unique=True)
+    op.create_index(op.f('ix_ordenes_trabajo_id'), 'ordenes_trabajo', ['id'], unique=False)
+    op.create_index(op.f('ix_ordenes_trabajo_prioridad'), 'ordenes_trabajo', ['prioridad'], unique=False)
+    op.create_index(op.f('ix_ordenes_trabajo_subcategoria_id'), 'ordenes_trabajo', ['subcategoria_id'], unique=False)
+    op.create_index(op.f('ix_ordenes_trabajo_sucursal_id'), 'ordenes_trabajo', ['sucursal_id'], unique=False)
+    op.create_index(op.f('ix_ordenes_trabajo_tecnico_asignado_id'), 'ordenes_trabajo', ['tecnico_asignado_id'], unique=False)
+    op.create_index(op.f('ix_ordenes_trabajo_usuario_recepcion_id'), 'ordenes_trabajo', ['usuario_recepcion_id'], unique=False)
+    op.create_table('piezas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('codigo', sa.String(length=50), nullable=True),
+    sa.Column('catalogo_id', sa.Integer(), nullable=True),
+    sa.Column('subcatalogo_id', sa.Integer(), nullable=True),
+    sa.Column('nombre', sa.String(length=200), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('precio', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('stock', sa.Integer(), nullable=False),
+    sa.Column('unidad', sa.String(length=20), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['catalogo_id'], ['catalogos_pieza.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['subcatalogo_id'], ['subcatalogos_pieza.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_piezas_catalogo_id'), 'piezas', ['catalogo_id'], unique=False)
+    op.create_index(op.f('ix_piezas_codigo'), 'piezas', ['codigo'], unique=True)
+    op.create_index(op.f('ix_piezas_id'), 'piezas', ['id'], unique=False)
+    op.create_index(op.f('ix_piezas_nombre'), 'piezas', ['nombre'], unique=False)
+    op.create_index(op.f('ix_piezas_subcatalogo_id'), 'piezas', ['subcatalogo_id'], unique=False)
+    op.create_table('movimientos_caja',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('tipo', sa.String(length=20), nullable=False),
+    sa.Column('concepto', sa.String(length=255), nullable=False),
+    sa.Column('monto', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('orden_trabajo_id', sa.Integer(), nullable=True),
+    sa.Column('corte_id', sa.Integer(), nullable=True),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['corte_id'], ['cortes_caja.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['orden_trabajo_id'], ['ordenes_trabajo.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_movimientos_caja_corte_id'), 'movimientos_caja', ['corte_id'], unique=False)
+    op.create_index(op.f('ix_movimientos_caja_fecha'), 'movimientos_caja', ['fecha'], unique=False)
+    op.create_index(op.f('ix_movimientos_caja_id'), 'movimientos_caja', ['id'], unique=False)
+    op.create_index(op.f('ix_movimientos_caja_orden_trabajo_id'), 'movimientos_caja', ['orden_trabajo_id'], unique=False)
+    op.create_index(op.f('ix_movimientos_caja_tipo'), 'movimientos_caja', ['tipo'], unique=False)
+    op.create_index(op.f('ix_movimientos_caja_usuario_id'), 'movimientos_caja', ['usuario_id'], unique=False)
+    op.create_table('orden_fotos_entrada',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('orden_id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=512), nullable=False),
+    sa.ForeignKeyConstraint(['orden_id'], ['ordenes_trabajo.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_orden_fotos_entrada_id'), 'orden_fotos_entrada', ['id'], unique=False)
+    op.create_index(op.f('ix_orden_fotos_entrada_orden_id'), 'orden_fotos_entrada', ['orden_id'], unique=False)
+    op.create_table('sub_ordenes_trabajo',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('orden_trabajo_id', sa.Integer(), nullable=False),
+    sa.Column('titulo', sa.String(length=200), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('orden', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['orden_trabajo_id'], ['ordenes_trabajo.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sub_ordenes_trabajo_id'), 'sub_ordenes_trabajo', ['id'], unique=False)
+    op.create_index(op.f('ix_sub_ordenes_trabajo_orden_trabajo_id'), 'sub_ordenes_trabajo', ['orden_trabajo_id'], unique=False)
+    op.create_table('subtareas_orden',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('orden_trabajo_id', sa.Integer(), nullable=False),
+    sa.Column('tecnico_asignado_id', sa.Integer(), nullable=True),
+    sa.Column('titulo', sa.String(length=200), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('orden', sa.Integer(), nullable=False),
+    sa.Column('estado', sa.Enum('PENDIENTE', 'EN_PROCESO', 'COMPLETADA', 'CANCELADA', name='estadosubtareaenum'), nullable=False),
+    sa.Column('fecha_inicio', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('fecha_completada', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['orden_trabajo_id'], ['ordenes_trabajo.id'], ),
+    sa.ForeignKeyConstraint(['tecnico_asignado_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_subtareas_orden_estado'), 'subtareas_orden', ['estado'], unique=False)
+    op.create_index(op.f('ix_subtareas_orden_id'), 'subtareas_orden', ['id'], unique=False)
+    op.create_index(op.f('ix_subtareas_orden_orden_trabajo_id'), 'subtareas_orden', ['orden_trabajo_id'], unique=False)
+    op.create_index(op.f('ix_subtareas_orden_tecnico_asignado_id'), 'subtareas_orden', ['tecnico_asignado_id'], unique=False)
+    op.create_table('gastos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('orden_trabajo_id', sa.Integer(), nullable=True),
+    sa.Column('sub_orden_id', sa.Integer(), nullable=True),
+    sa.Column('descripcion', sa.String(length=255), nullable=False),
+    sa.Column('monto', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('tipo', sa.String(length=20), nullable=False),
+    sa.Column('categoria', sa.String(length=20), nullable=True),
+    sa.Column('usuario_registro_id', sa.Integer(), nullable=False),
+    sa.Column('fecha_gasto', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['orden_trabajo_id'], ['ordenes_trabajo.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['sub_orden_id'], ['sub_ordenes_trabajo.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['usuario_registro_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_gastos_categoria'), 'gastos', ['categoria'], unique=False)
+    op.create_index(op.f('ix_gastos_fecha_gasto'), 'gastos', ['fecha_gasto'], unique=False)
+    op.create_index(op.f('ix_gastos_id'), 'gastos', ['id'], unique=False)
+    op.create_index(op.f('ix_gastos_orden_trabajo_id'), 'gastos', ['orden_trabajo_id'], unique=False)
+    op.create_index(op.f('ix_gastos_sub_orden_id'), 'gastos', ['sub_orden_id'], unique=False)
+    op.create_index(op.f('ix_gastos_tipo'), 'gastos', ['tipo'], unique=False)
+    op.create_index(op.f('ix_gastos_usuario_registro_id'), 'gastos', ['usuario_registro_id'], unique=False)
+    op.create_table('orden_trabajo_piezas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('orden_trabajo_id', sa.Integer(), nullable=False),
+    sa.Column('sub_orden_id', sa.Integer(), nullable=True),
+    sa.Column('pieza_id', sa.Integer(), nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=False),
+    sa.Column('precio_unitario', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['orden_trabajo_id'], ['ordenes_trabajo.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['pieza_id'], ['piezas.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['sub_orden_id'], ['sub_ordenes_trabajo.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_orden_trabajo_piezas_id'), 'orden_trabajo_piezas', ['id'], unique=False)
+    op.create_index(op.f('ix_orden_trabajo_piezas_orden_trabajo_id'), 'orden_trabajo_piezas', ['orden_trabajo_id'], unique=False)
+    op.create_index(op.f('ix_orden_trabajo_piezas_pieza_id'), 'orden_trabajo_piezas', ['pieza_id'], unique=False)
+    op.create_index(op.f('ix_orden_trabajo_piezas_sub_orden_id'), 'orden_trabajo_piezas', ['sub_orden_id'], unique=False)
+    op.create_table('subtarea_fotos_entrada',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('subtarea_id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=512), nullable=False),
+    sa.ForeignKeyConstraint(['subtarea_id'], ['subtareas_orden.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_subtarea_fotos_entrada_id'), 'subtarea_fotos_entrada', ['id'], unique=False)
+    op.create_index(op.f('ix_subtarea_fotos_entrada_subtarea_id'), 'subtarea_fotos_entrada', ['subtarea_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_subtarea_fotos_entrada_subtarea_id'), table_name='subtarea_fotos_entrada')
+    op.drop_index(op.f('ix_subtarea_fotos_entrada_id'), table_name='subtarea_fotos_entrada')
+    op.drop_table('subtarea_fotos_entrada')
+    op.drop_index(op.f('ix_orden_trabajo_piezas_sub_orden_id'), table_name='orden_trabajo_piezas')
+    op.drop_index(op.f('ix_orden_trabajo_piezas_pieza_id'), table_name='orden_trabajo_piezas')
+    op.drop_index(op.f('ix_orden_trabajo_piezas_orden_trabajo_id'), table_name='orden_trabajo_piezas')
+    op.drop_index(op.f('ix_orden_trabajo_piezas_id'), table_name='orden_trabajo_piezas')
+    op.drop_table('orden_trabajo_piezas')
+    op.drop_index(op.f('ix_gastos_usuario_registro_id'), table_name='gastos')
+    op.drop_index(op.f('ix_gastos_tipo'), table_name='gastos')
+    op.drop_index(op.f('ix_gastos_sub_orden_id'), table_name='gastos')
+    op.drop_index(op.f('ix_gastos_orden_trabajo_id'), table_name='gastos')
+    op.drop_index(op.f('ix_gastos_id'), table_name='gastos')
+    op.drop_index(op.f('ix_gastos_fecha_gasto'), table_name='gastos')
+    op.drop_index(op.f('ix_gastos_categoria'), table_name='gastos')
+    op.drop_table('gastos')
+    op.drop_index(op.f('ix_subtareas_orden_tecnico_asignado_id'), table_name='subtareas_orden')
+    op.drop_index(op.f('ix_subtareas_orden_orden_trabajo_id'), table_name='subtareas_orden')
+    op.drop_index(op.f('ix_subtareas_orden_id'), table_name='subtareas_orden')
+    op.drop_index(op.f('ix_subtareas_orden_estado'), table_name='subtareas_orden')
+    op.drop_table('subtareas_orden')
+    op.drop_index(op.f('ix_sub_ordenes_trabajo_orden_trabajo_id'), table_name='sub_ordenes_trabajo')
+    op.drop_index(op.f('ix_sub_ordenes_trabajo_id'), table_name='sub_ordenes_trabajo')
+    op.drop_table('sub_ordenes_trabajo')
+    op.drop_index(op.f('ix_orden_fotos_entrada_orden_id'), table_name='orden_fotos_entrada')
+    op.drop_index(op.f('ix_orden_fotos_entrada_id'), table_name='orden_fotos_entrada')
+    op.drop_table('orden_fotos_entrada')
+    op.drop_index(op.f('ix_movimientos_caja_usuario_id'), table_name='movimientos_caja')
+    op.drop_index(op.f('ix_movimientos_caja_tipo'), table_name='movimientos_caja')
+    op.drop_index(op.f('ix_movimientos_caja_orden_trabajo_id'), table_name='movimientos_caja')
+    op.drop_index(op.f('ix_movimientos_caja_id'), table_name='movimientos_caja')
+    op.drop_index(op.f('ix_movimientos_caja_fecha'), table_name='movimientos_caja')
+    op.drop_index(op.f('ix_movimientos_caja_corte_id'), table_name='movimientos_caja')
+    op.drop_table('movimientos_caja')
+    op.drop_index(op.f('ix_piezas_subcatalogo_id'), table_name='piezas')
+    op.drop_index(op.f('ix_piezas_nombre'), table_name='piezas')
+    op.drop_index(op.f('ix_piezas_id'), table_name='piezas')
+    op.drop_index(op.f('ix_piezas_codigo'), table_name='piezas')
+    op.drop_index(op.f('ix_piezas_catalogo_id'), table_name='piezas')
+    op.drop_table('piezas')
+    op.drop_index(op.f('ix_ordenes_trabajo_usuario_recepcion_id'), table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_tecnico_asignado_id'), table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_sucursal_id'), table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_subcategoria_id'), table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_prioridad'), table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_id'), table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_folio'), table_name='ordenes_trabajo')
+    op.drop_index('ix_ordenes_trabajo_fecha_recepcion_id', table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_fecha_promesa'), table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_estatus'), table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_cliente_id'), table_name='ordenes_trabajo')
+    op.drop_index(op.f('ix_ordenes_trabajo_categoria_id'), table_name='ordenes_trabajo')
+    op.drop_table('ordenes_trabajo')
+    op.drop_index(op.f('ix_sucursales_nombre_sucursal'), table_name='sucursales')
+    op.drop_index(op.f('ix_sucursales_id'), table_name='sucursales')
+    op.drop_index(op.f('ix_sucursales_cliente_id'), table_name='sucursales')
+    op.drop_table('sucursales')
+    op.drop_index(op.f('ix_subcategorias_orden_nombre'), table_name='subcategorias_orden')
+    op.drop_index(op.f('ix_subcategorias_orden_id'), table_name='subcategorias_orden')
+    op.drop_index(op.f('ix_subcategorias_orden_categoria_id'), table_name='subcategorias_orden')
+    op.drop_table('subcategorias_orden')
+    op.drop_index(op.f('ix_subcatalogos_pieza_nombre'), table_name='subcatalogos_pieza')
+    op.drop_index(op.f('ix_subcatalogos_pieza_id'), table_name='subcatalogos_pieza')
+    op.drop_index(op.f('ix_subcatalogos_pieza_catalogo_id'), table_name='subcatalogos_pieza')
+    op.drop_table('subcatalogos_pieza')
+    op.drop_index(op.f('ix_solicitudes_vacaciones_id'), table_name='solicitudes_vacaciones')
+    op.drop_table('solicitudes_vacaciones')
+    op.drop_index(op.f('ix_incidencias_empleado_id'), table_name='incidencias_empleado')
+    op.drop_index(op.f('ix_incidencias_empleado_fecha_incidencia'), table_name='incidencias_empleado')
+    op.drop_table('incidencias_empleado')
+    op.drop_index(op.f('ix_documentos_empleado_id'), table_name='documentos_empleado')
+    op.drop_table('documentos_empleado')
+    op.drop_index(op.f('ix_cortes_caja_usuario_cierre_id'), table_name='cortes_caja')
+    op.drop_index(op.f('ix_cortes_caja_tipo'), table_name='cortes_caja')
+    op.drop_index(op.f('ix_cortes_caja_id'), table_name='cortes_caja')
+    op.drop_index(op.f('ix_cortes_caja_fecha'), table_name='cortes_caja')
+    op.drop_table('cortes_caja')
+    op.drop_index(op.f('ix_asistencias_id'), table_name='asistencias')
+    op.drop_index(op.f('ix_asistencias_fecha'), table_name='asistencias')
+    op.drop_table('asistencias')
+    op.drop_index(op.f('ix_aperturas_caja_usuario_id'), table_name='aperturas_caja')
+    op.drop_index(op.f('ix_aperturas_caja_id'), table_name='aperturas_caja')
+    op.drop_index(op.f('ix_aperturas_caja_fecha'), table_name='aperturas_caja')
+    op.drop_table('aperturas_caja')
+    op.drop_index(op.f('ix_usuarios_username'), table_name='usuarios')
+    op.drop_index(op.f('ix_usuarios_rfc'), table_name='usuarios')
+    op.drop_index(op.f('ix_usuarios_id'), table_name='usuarios')
+    op.drop_index(op.f('ix_usuarios_email'), table_name='usuarios')
+    op.drop_index(op.f('ix_usuarios_curp'), table_name='usuarios')
+    op.drop_index(op.f('ix_usuarios_codigo'), table_name='usuarios')
+    op.drop_table('usuarios')
+    op.drop_table('folio_secuencias')
+    op.drop_index(op.f('ix_clientes_rfc'), table_name='clientes')
+    op.drop_index(op.f('ix_clientes_nombre'), table_name='clientes')
+    op.drop_index(op.f('ix_clientes_id'), table_name='clientes')
+    op.drop_index(op.f('ix_clientes_email'), table_name='clientes')
+    op.drop_table('clientes')
+    op.drop_index(op.f('ix_categorias_orden_nombre'), table_name='categorias_orden')
+    op.drop_index(op.f('ix_categorias_orden_id'), table_name='categorias_orden')
+    op.drop_table('categorias_orden')
+    op.drop_index(op.f('ix_catalogos_pieza_nombre'), table_name='catalogos_pieza')
+    op.drop_index(op.f('ix_catalogos_pieza_id'), table_name='catalogos_pieza')
+    op.drop_table('catalogos_pieza')
+    op.drop_table('caja_saldos_diarios')
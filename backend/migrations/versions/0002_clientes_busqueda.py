@@ -0,0 +1,81 @@
+"""Búsqueda de clientes: columna normalizada y FULLTEXT
+
+Agrega clientes.busqueda (texto sin acentos, teléfonos solo dígitos), la llena para los clientes
+existentes y crea el índice FULLTEXT ft_clientes_busqueda (índice normal en motores sin FULLTEXT).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+LOTE = 1000
+DIGITOS_NUMERO_LOCAL = 8
+
+
+# Copia congelada de ClienteBusquedaService.texto_busqueda al crear esta revisión: la migración no
+# importa código de la app, así que un cambio posterior del servicio no altera lo que hace.
+def _normalizar(texto) -> str:
+    if not texto:
+        return ""
+    descompuesto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).lower().strip()
+
+
+def _solo_digitos(texto) -> str:
+    return "".join(c for c in (texto or "") if c.isdigit())
+
+
+def _texto_busqueda(cliente) -> str:
+    partes = [
+        cliente.nombre,
+        cliente.apellido_paterno,
+        cliente.apellido_materno,
+        cliente.razon_social,
+        cliente.rfc,
+        cliente.email,
+    ]
+    texto = " ".join(_normalizar(p) for p in partes if p)
+    telefonos = []
+    for telefono in (cliente.telefono, cliente.telefono_alternativo):
+        digitos = _solo_digitos(telefono)
+        if digitos:
+            telefonos.append(digitos)
+            if len(digitos) > DIGITOS_NUMERO_LOCAL:
+                telefonos.append(digitos[-DIGITOS_NUMERO_LOCAL:])
+    return " ".join([texto] + telefonos).strip()
+
+
+def upgrade() -> None:
+    op.add_column('clientes', sa.Column('busqueda', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    columnas = "id, nombre, apellido_paterno, apellido_materno, razon_social, rfc, email, telefono, telefono_alternativo"
+    ultimo_id = 0
+    while True:
+        filas = conn.execute(
+            sa.text(f"SELECT {columnas} FROM clientes WHERE id > :ultimo ORDER BY id LIMIT {LOTE}"),
+            {"ultimo": ultimo_id},
+        ).fetchall()
+        if not filas:
+            break
+        conn.execute(
+            sa.text("UPDATE clientes SET busqueda = :busqueda WHERE id = :id"),
+            [{"id": f.id, "busqueda": _texto_busqueda(f)} for f in filas],
+        )
+        ultimo_id = filas[-1].id
+
+    op.create_index('ft_clientes_busqueda', 'clientes', ['busqueda'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    op.drop_index('ft_clientes_busqueda', table_name='clientes')
+    op.drop_column('clientes', 'busqueda')
@@ -0,0 +1,54 @@
+"""Bitácora de movimientos de inventario
+
+Crea movimientos_inventario (un renglón por cada cambio de stock de una pieza) y registra el stock
+actual de cada pieza como movimiento de ajuste inicial, para que la suma de movimientos de una
+pieza coincida con su stock desde el principio.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('movimientos_inventario',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('pieza_id', sa.Integer(), nullable=True),
+    sa.Column('tipo', sa.String(length=20), nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=False),
+    sa.Column('stock_resultante', sa.Integer(), nullable=False),
+    sa.Column('concepto', sa.String(length=255), nullable=False),
+    sa.Column('orden_trabajo_id', sa.Integer(), nullable=True),
+    sa.Column('usuario_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['orden_trabajo_id'], ['ordenes_trabajo.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['pieza_id'], ['piezas.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_movimientos_inventario_id'), 'movimientos_inventario', ['id'], unique=False)
+    op.create_index(op.f('ix_movimientos_inventario_orden_trabajo_id'), 'movimientos_inventario', ['orden_trabajo_id'], unique=False)
+    op.create_index(op.f('ix_movimientos_inventario_pieza_id'), 'movimientos_inventario', ['pieza_id'], unique=False)
+    op.create_index(op.f('ix_movimientos_inventario_tipo'), 'movimientos_inventario', ['tipo'], unique=False)
+    op.create_index(op.f('ix_movimientos_inventario_usuario_id'), 'movimientos_inventario', ['usuario_id'], unique=False)
+
+    op.execute(
+        "INSERT INTO movimientos_inventario (pieza_id, tipo, cantidad, stock_resultante, concepto) "
+        "SELECT id, 'ajuste', stock, stock, 'Stock inicial' FROM piezas WHERE stock <> 0"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_movimientos_inventario_usuario_id'), table_name='movimientos_inventario')
+    op.drop_index(op.f('ix_movimientos_inventario_tipo'), table_name='movimientos_inventario')
+    op.drop_index(op.f('ix_movimientos_inventario_pieza_id'), table_name='movimientos_inventario')
+    op.drop_index(op.f('ix_movimientos_inventario_orden_trabajo_id'), table_name='movimientos_inventario')
+    op.drop_index(op.f('ix_movimientos_inventario_id'), table_name='movimientos_inventario')
+    op.drop_table('movimientos_inventario')
@@ -0,0 +1,56 @@
+"""Puntos de reorden de piezas
+
+Agrega piezas.consumo_diario y piezas.punto_reorden y los calcula con el historial de usos en OTs
+(misma fórmula que ReordenService.recalcular con los valores por defecto de REORDEN_VENTANA_DIAS y
+REORDEN_DIAS_COBERTURA; si la configuración es otra, scripts/recalcular_puntos_reorden.py los ajusta).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# Valores por defecto de la configuración al crear esta revisión (la migración no lee app.config)
+VENTANA_DIAS = 90
+DIAS_COBERTURA = 14
+
+
+def upgrade() -> None:
+    op.add_column('piezas', sa.Column('consumo_diario', sa.Numeric(precision=12, scale=4), server_default='0', nullable=False))
+    op.add_column('piezas', sa.Column('punto_reorden', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False))
+    op.create_index(op.f('ix_piezas_punto_reorden'), 'piezas', ['punto_reorden'], unique=False)
+
+    conn = op.get_bind()
+    consumos = conn.execute(
+        sa.text(
+            "SELECT otp.pieza_id, SUM(otp.cantidad) AS total FROM orden_trabajo_piezas otp "
+            "JOIN ordenes_trabajo ot ON ot.id = otp.orden_trabajo_id "
+            "WHERE ot.fecha_recepcion >= :desde GROUP BY otp.pieza_id"
+        ),
+        {"desde": datetime.now() - timedelta(days=VENTANA_DIAS)},
+    ).fetchall()
+    filas = []
+    for c in consumos:
+        consumo = (c.total or 0) / VENTANA_DIAS
+        if consumo > 0:
+            filas.append({
+                "id": c.pieza_id,
+                "consumo": round(consumo, 4),
+                "reorden": round(consumo * DIAS_COBERTURA, 2),
+            })
+    if filas:
+        conn.execute(sa.text("UPDATE piezas SET consumo_diario = :consumo, punto_reorden = :reorden WHERE id = :id"), filas)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_piezas_punto_reorden'), table_name='piezas')
+    op.drop_column('piezas', 'punto_reorden')
+    op.drop_column('piezas', 'consumo_diario')
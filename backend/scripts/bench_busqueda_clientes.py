@@ -0,0 +1,125 @@
+"""
+Benchmark de la búsqueda de clientes (GET /clientes?buscar=...).
+Genera clientes sintéticos y compara el filtro anterior (ILIKE '%termino%' en siete columnas)
+contra ClienteBusquedaService (FULLTEXT en MariaDB/MySQL, respaldo LIKE en SQLite).
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.bench_busqueda_clientes
+
+  Variables de entorno (opcionales):
+    BENCH_DATABASE_URL - BD donde generar los datos (default: sqlite:///bench_clientes.db)
+    BENCH_CLIENTES     - Cantidad de clientes a generar (default: 200000)
+    BENCH_REPETICIONES - Veces que se mide cada término (default: 10)
+
+ATENCIÓN: borra y recrea la tabla clientes en BENCH_DATABASE_URL; nunca apuntar a producción.
+En MariaDB la tabla se crea con el índice FULLTEXT del modelo.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Cliente, Sucursal
+from app.services.cliente_busqueda_service import ClienteBusquedaService
+
+BENCH_DATABASE_URL = os.environ.get("BENCH_DATABASE_URL", "sqlite:///bench_clientes.db")
+BENCH_CLIENTES = int(os.environ.get("BENCH_CLIENTES", "200000"))
+BENCH_REPETICIONES = int(os.environ.get("BENCH_REPETICIONES", "10"))
+
+NOMBRES = ["José", "María", "Juan", "Guadalupe", "Francisco", "Verónica", "Ramón", "Sofía", "Andrés", "Lucía"]
+APELLIDOS = ["Hernández", "García", "Martínez", "López", "González", "Pérez", "Rodríguez", "Sánchez", "Ramírez", "Núñez",
+             "Peña", "Domínguez", "Gutiérrez", "Ortiz", "Muñoz", "Castañeda", "Vázquez", "Jiménez", "Ibáñez", "Ávila"]
+TERMINOS = ["peña", "jose nunez", "ramirez", "5512", "1234 5678", "castaneda@", "zzzz"]
+
+
+def preparar_datos(Session):
+    engine = Session.kw["bind"]
+    Sucursal.__table__.drop(engine, checkfirst=True)
+    Cliente.__table__.drop(engine, checkfirst=True)
+    Cliente.__table__.create(engine)
+
+    rnd = random.Random(42)
+    db = Session()
+    lote = []
+    for i in range(BENCH_CLIENTES):
+        datos = SimpleNamespace(
+            nombre=rnd.choice(NOMBRES),
+            apellido_paterno=rnd.choice(APELLIDOS),
+            apellido_materno=rnd.choice(APELLIDOS),
+            razon_social=None,
+            rfc=None,
+            email=f"cliente{i}.{rnd.choice(APELLIDOS).lower()}@correo.mx" if i % 3 == 0 else None,
+            telefono=f"55{rnd.randrange(10**8):08d}",
+            telefono_alternativo=None,
+        )
+        # bulk_insert_mappings no dispara before_insert: la columna se calcula aquí
+        lote.append({**vars(datos), "tipo_cliente": "PERSONA_FISICA", "activo": True,
+                     "busqueda": ClienteBusquedaService.texto_busqueda(datos)})
+        if len(lote) == 5000:
+            db.bulk_insert_mappings(Cliente, lote)
+            db.commit()
+            lote = []
+    if lote:
+        db.bulk_insert_mappings(Cliente, lote)
+        db.commit()
+    db.close()
+
+
+def busqueda_anterior(db, termino):
+    filtro = f"%{termino}%"
+    return (
+        db.query(Cliente)
+        .filter(
+            Cliente.nombre.ilike(filtro) | Cliente.apellido_paterno.ilike(filtro) | Cliente.apellido_materno.ilike(filtro)
+            | Cliente.razon_social.ilike(filtro) | Cliente.rfc.ilike(filtro) | Cliente.telefono.ilike(filtro)
+            | Cliente.email.ilike(filtro)
+        )
+        .order_by(Cliente.created_at.desc())
+        .limit(100)
+        .all()
+    )
+
+
+def medir(Session, funcion, termino):
+    tiempos = []
+    db = Session()
+    for _ in range(BENCH_REPETICIONES):
+        db.expunge_all()
+        t = time.perf_counter()
+        resultado = funcion(db, termino)
+        tiempos.append((time.perf_counter() - t) * 1000)
+    db.close()
+    return statistics.median(tiempos), len(resultado)
+
+
+def main():
+    print("=" * 72)
+    print("Benchmark: búsqueda de clientes")
+    print("=" * 72)
+    print(f"BD: {BENCH_DATABASE_URL}  clientes={BENCH_CLIENTES}")
+
+    engine = create_engine(BENCH_DATABASE_URL)
+    Session = sessionmaker(bind=engine)
+    t0 = time.perf_counter()
+    preparar_datos(Session)
+    print(f"Datos generados en {time.perf_counter() - t0:.1f}s (motor: {engine.dialect.name})")
+
+    nueva = lambda db, termino: ClienteBusquedaService.buscar(db, db.query(Cliente), termino, limit=100)  # noqa: E731
+    print(f"{'término':<14} {'ILIKE ms':>10} {'filas':>6} {'nueva ms':>10} {'filas':>6}")
+    for termino in TERMINOS:
+        ms_ant, n_ant = medir(Session, busqueda_anterior, termino)
+        ms_nueva, n_nueva = medir(Session, nueva, termino)
+        print(f"{termino:<14} {ms_ant:>10.2f} {n_ant:>6} {ms_nueva:>10.2f} {n_nueva:>6}")
+    print("(mediana de cada término; la búsqueda anterior no encuentra acentos distintos ni teléfonos con separadores)")
+    print("=" * 72)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
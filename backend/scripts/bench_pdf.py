@@ -0,0 +1,93 @@
+"""
+Benchmark de generación de PDFs.
+Genera N solicitudes de vacaciones en memoria (BytesIO) con la base compartida de app/utils/pdf_base.py
+y, como referencia, mide cuánto costaría reconstruir la hoja de estilos en cada documento.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.bench_pdf
+
+  Variables de entorno (opcionales):
+    BENCH_DOCUMENTOS - Cantidad de PDFs a generar (default: 1000)
+"""
+import io
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+from app.models.solicitud_vacaciones import TipoSolicitudEnum, EstadoSolicitudEnum
+from app.utils.pdf_generator import generar_pdf_solicitud_vacaciones
+
+BENCH_DOCUMENTOS = int(os.environ.get("BENCH_DOCUMENTOS", "1000"))
+
+
+def datos(i):
+    solicitud = SimpleNamespace(
+        id=i,
+        tipo=TipoSolicitudEnum.DIAS_COMPLETOS,
+        estado=EstadoSolicitudEnum.APROBADA,
+        fecha_inicio=date(2026, 3, 2),
+        fecha_fin=date(2026, 3, 6),
+        cantidad=Decimal("5"),
+        fecha_solicitud=datetime(2026, 2, 20, 10, 30),
+        fecha_aprobacion=datetime(2026, 2, 21, 9, 0),
+        observaciones="Vacaciones de prueba" if i % 2 else None,
+    )
+    empleado = SimpleNamespace(
+        id=i,
+        nombre_completo=f"Empleado de Prueba {i}",
+        rfc="XAXX010101000",
+        departamento="Taller",
+        puesto_especifico="Técnico",
+        fecha_ingreso=date(2018, 5, 14),
+    )
+    aprobador = SimpleNamespace(nombre_completo="Jefe de Taller")
+    return solicitud, empleado, aprobador
+
+
+def costo_estilos_por_documento(n):
+    """Lo que antes se pagaba en cada PDF: hoja de estilos + 3 ParagraphStyle."""
+    inicio = time.perf_counter()
+    for _ in range(n):
+        styles = getSampleStyleSheet()
+        ParagraphStyle("T", parent=styles["Heading1"], fontSize=16)
+        ParagraphStyle("H", parent=styles["Heading2"], fontSize=12)
+        ParagraphStyle("N", parent=styles["Normal"], fontSize=10)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    print("=" * 60)
+    print("Benchmark: generación de PDFs de vacaciones")
+    print("=" * 60)
+
+    tiempos = []
+    tamano_total = 0
+    inicio_total = time.perf_counter()
+    for i in range(1, BENCH_DOCUMENTOS + 1):
+        destino = io.BytesIO()
+        t = time.perf_counter()
+        generar_pdf_solicitud_vacaciones(*datos(i), filepath=destino)
+        tiempos.append((time.perf_counter() - t) * 1000)
+        tamano_total += destino.getbuffer().nbytes
+    total = time.perf_counter() - inicio_total
+
+    tiempos.sort()
+    print(f"Documentos: {BENCH_DOCUMENTOS}  total={total:.2f}s  ({BENCH_DOCUMENTOS / total:.0f} PDF/s)")
+    print(f"  por documento: mediana={statistics.median(tiempos):.2f} ms  "
+          f"p95={tiempos[int(len(tiempos) * 0.95) - 1]:.2f} ms  tamaño medio={tamano_total / BENCH_DOCUMENTOS / 1024:.1f} KB")
+    ahorro = costo_estilos_por_documento(BENCH_DOCUMENTOS)
+    print(f"  estilos reconstruidos por documento costarían: {ahorro:.0f} ms en total "
+          f"({ahorro / BENCH_DOCUMENTOS:.3f} ms/documento)")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
@@ -0,0 +1,108 @@
+"""
+Benchmark de GET /caja/resumen-rango (CajaService.resumen_rango).
+Genera movimientos de caja sintéticos, reconstruye caja_saldos_diarios y mide el tiempo
+de un resumen de un año.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.bench_resumen_rango
+
+  Variables de entorno (opcionales):
+    BENCH_DATABASE_URL - BD donde generar los datos (default: sqlite:///bench_caja.db)
+    BENCH_MOVIMIENTOS  - Cantidad de movimientos a generar (default: 100000)
+    BENCH_REPETICIONES - Veces que se mide el resumen (default: 20)
+
+ATENCIÓN: borra y recrea las tablas de caja en BENCH_DATABASE_URL; nunca apuntar a producción.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import User, MovimientoCaja, CorteCaja, AperturaCaja, CajaSaldoDiario
+from app.services.caja_service import CajaService
+
+BENCH_DATABASE_URL = os.environ.get("BENCH_DATABASE_URL", "sqlite:///bench_caja.db")
+BENCH_MOVIMIENTOS = int(os.environ.get("BENCH_MOVIMIENTOS", "100000"))
+BENCH_REPETICIONES = int(os.environ.get("BENCH_REPETICIONES", "20"))
+
+INICIO = date(2024, 1, 1)
+DIAS = 3 * 365
+
+
+def preparar_datos(Session):
+    """Crea tablas, un usuario, movimientos repartidos en 3 años y un corte por mes."""
+    engine = Session.kw["bind"]
+    tablas = [User.__table__, CorteCaja.__table__, MovimientoCaja.__table__, AperturaCaja.__table__, CajaSaldoDiario.__table__]
+    for t in reversed(tablas):
+        t.drop(engine, checkfirst=True)
+    for t in tablas:
+        t.create(engine, checkfirst=True)
+
+    db = Session()
+    usuario = User(username="bench", email="bench@example.com", nombre_completo="Bench", password_hash="x")
+    db.add(usuario)
+    db.commit()
+
+    rnd = random.Random(42)
+    lote = []
+    for i in range(BENCH_MOVIMIENTOS):
+        lote.append({
+            "fecha": INICIO + timedelta(days=rnd.randrange(DIAS)),
+            "tipo": "ENTRADA" if rnd.random() < 0.6 else "SALIDA",
+            "concepto": f"Movimiento {i}",
+            "monto": round(rnd.uniform(10, 5000), 2),
+            "usuario_id": usuario.id,
+        })
+        if len(lote) == 5000:
+            db.bulk_insert_mappings(MovimientoCaja, lote)
+            lote = []
+    if lote:
+        db.bulk_insert_mappings(MovimientoCaja, lote)
+    for mes in range(36):
+        fecha = date(2024 + mes // 12, mes % 12 + 1, 28)
+        db.add(CorteCaja(fecha=fecha, tipo="CIERRE_DIA", saldo_inicial=0, total_entradas=0, total_salidas=0, saldo_final=1000 + mes))
+    db.commit()
+    dias = CajaService.reconstruir_saldos_diarios(db)
+    db.close()
+    return dias
+
+
+def main():
+    print("=" * 60)
+    print("Benchmark: resumen de caja por rango")
+    print("=" * 60)
+    print(f"BD: {BENCH_DATABASE_URL}  movimientos={BENCH_MOVIMIENTOS}")
+
+    engine = create_engine(BENCH_DATABASE_URL)
+    Session = sessionmaker(bind=engine)
+
+    t0 = time.perf_counter()
+    dias = preparar_datos(Session)
+    print(f"Datos generados y saldos reconstruidos ({dias} días) en {time.perf_counter() - t0:.1f}s")
+
+    desde, hasta = date(2025, 1, 1), date(2025, 12, 31)
+    tiempos = []
+    db = Session()
+    for _ in range(BENCH_REPETICIONES):
+        db.expire_all()
+        t = time.perf_counter()
+        resultado = CajaService.resumen_rango(db, desde, hasta)
+        tiempos.append((time.perf_counter() - t) * 1000)
+    db.close()
+
+    tiempos.sort()
+    p95 = tiempos[max(0, int(len(tiempos) * 0.95) - 1)]
+    print(f"Rango {desde} .. {hasta}: {len(resultado)} días")
+    print(f"  mediana={statistics.median(tiempos):.2f} ms  p95={p95:.2f} ms  max={tiempos[-1]:.2f} ms")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
@@ -0,0 +1,36 @@
+"""
+Recolector de fotos huérfanas en uploads/ordenes.
+Borra las fotos (y sus miniaturas/variantes) que ya no referencia ninguna orden ni subtarea,
+por ejemplo las que quedaron de órdenes eliminadas antes de que existiera el almacén por contenido.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.gc_fotos --simular     (solo cuenta, no borra)
+    python -m scripts.gc_fotos
+    python -m scripts.gc_fotos --gracia 600  (segundos; no toca archivos más recientes)
+"""
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.services.foto_store_service import FotoStoreService, GRACIA_SEGUNDOS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eliminar fotos huérfanas de órdenes")
+    parser.add_argument("--simular", action="store_true", help="Solo reportar, no borrar")
+    parser.add_argument("--gracia", type=int, default=GRACIA_SEGUNDOS, help="Antigüedad mínima en segundos")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        r = FotoStoreService.recolectar_huerfanos(db, gracia_segundos=args.gracia, simular=args.simular)
+    finally:
+        db.close()
+    accion = "encontrados" if args.simular else "eliminados"
+    print(f"Archivos huérfanos {accion}: {r['archivos']} ({r['bytes'] / (1024 * 1024):.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
@@ -0,0 +1,48 @@
+"""
+Genera miniaturas y variantes (thumb, medium, webp) de las fotos ya existentes en uploads/ordenes.
+Las fotos nuevas las genera el backend al subirlas; esto es para las anteriores.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.generar_variantes_fotos
+    python -m scripts.generar_variantes_fotos --forzar   (regenera aunque ya existan)
+"""
+import argparse
+import os
+import sys
+
+from app.services.image_service import ImageService, VARIANTES
+
+UPLOAD_DIR = "uploads/ordenes"
+EXTENSIONES = (".jpg", ".jpeg", ".png", ".webp", ".heic", ".bmp", ".gif")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generar variantes de fotos de órdenes")
+    parser.add_argument("--forzar", action="store_true", help="Regenerar aunque las variantes ya existan")
+    args = parser.parse_args()
+
+    if not os.path.isdir(UPLOAD_DIR):
+        print(f"No existe {UPLOAD_DIR}; nada que hacer.")
+        return 0
+
+    procesadas = omitidas = fallidas = 0
+    for nombre in sorted(os.listdir(UPLOAD_DIR)):
+        ruta = os.path.join(UPLOAD_DIR, nombre)
+        base, ext = os.path.splitext(nombre)
+        if ext.lower() not in EXTENSIONES or any(base.endswith(f"__{v}") for v in VARIANTES):
+            continue
+        if not args.forzar and all(os.path.isfile(ImageService.ruta_variante(ruta, v)) for v in VARIANTES):
+            omitidas += 1
+            continue
+        if ImageService.generar_variantes(ruta):
+            procesadas += 1
+        else:
+            fallidas += 1
+
+    print(f"Fotos procesadas: {procesadas}  ya tenían variantes: {omitidas}  con error: {fallidas}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
@@ -0,0 +1,235 @@
+"""
+Aplica las migraciones de esquema (Alembic) hasta la última revisión.
+Se ejecuta una vez por despliegue, antes de levantar uvicorn; los workers ya no hacen DDL al arrancar.
+
+Bases de datos creadas antes de Alembic (sin tabla alembic_version) se completan con el DDL
+idempotente que antes corría en el startup de app/main.py y se marcan en la revisión base (0001);
+después se aplican las revisiones posteriores.
+
+En MySQL/MariaDB se toma un candado con GET_LOCK para que dos ejecuciones simultáneas
+(por ejemplo dos contenedores arrancando a la vez) no migren al mismo tiempo.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.migrar              (aplica hasta head)
+    python -m scripts.migrar --actual     (solo muestra la revisión actual)
+"""
+import argparse
+import os
+import sys
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, pool, text
+
+from app.config import settings
+
+REVISION_BASE = "0001"
+CANDADO = "crm_talleres_migraciones"
+CANDADO_TIMEOUT = 300
+
+# DDL que hacía startup_create_tables en cada arranque (solo para bases anteriores a Alembic).
+# Congelado tal como queda en la revisión base (0001), no tomado de los modelos actuales: las
+# columnas agregadas después (p. ej. piezas.consumo_diario en 0004) las crean sus migraciones.
+_legado = sa.MetaData()
+# Tablas que ya existían en toda base anterior a Alembic; solo se declaran para resolver las FK
+for _tabla in ("usuarios", "ordenes_trabajo", "subtareas_orden"):
+    sa.Table(_tabla, _legado, sa.Column("id", sa.Integer(), primary_key=True))
+
+TABLAS_LEGADO = (
+    sa.Table(
+        "catalogos_pieza", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("nombre", sa.String(100), nullable=False, index=True),
+        sa.Column("descripcion", sa.String(255), nullable=True),
+        sa.Column("activo", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ),
+    sa.Table(
+        "subcatalogos_pieza", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("catalogo_id", sa.Integer(), sa.ForeignKey("catalogos_pieza.id", ondelete="CASCADE"), nullable=False, index=True),
+        sa.Column("nombre", sa.String(100), nullable=False, index=True),
+        sa.Column("descripcion", sa.String(255), nullable=True),
+        sa.Column("activo", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ),
+    sa.Table(
+        "piezas", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("codigo", sa.String(50), nullable=True, unique=True, index=True),
+        sa.Column("catalogo_id", sa.Integer(), sa.ForeignKey("catalogos_pieza.id", ondelete="SET NULL"), nullable=True, index=True),
+        sa.Column("subcatalogo_id", sa.Integer(), sa.ForeignKey("subcatalogos_pieza.id", ondelete="SET NULL"), nullable=True, index=True),
+        sa.Column("nombre", sa.String(200), nullable=False, index=True),
+        sa.Column("descripcion", sa.Text(), nullable=True),
+        sa.Column("precio", sa.Numeric(10, 2), nullable=False),
+        sa.Column("stock", sa.Integer(), nullable=False),
+        sa.Column("unidad", sa.String(20), nullable=True),
+        sa.Column("activo", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ),
+    sa.Table(
+        "orden_fotos_entrada", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("orden_id", sa.Integer(), sa.ForeignKey("ordenes_trabajo.id", ondelete="CASCADE"), nullable=False, index=True),
+        sa.Column("url", sa.String(512), nullable=False),
+    ),
+    sa.Table(
+        "sub_ordenes_trabajo", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("orden_trabajo_id", sa.Integer(), sa.ForeignKey("ordenes_trabajo.id", ondelete="CASCADE"), nullable=False, index=True),
+        sa.Column("titulo", sa.String(200), nullable=False),
+        sa.Column("descripcion", sa.Text(), nullable=True),
+        sa.Column("orden", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ),
+    sa.Table(
+        "subtarea_fotos_entrada", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("subtarea_id", sa.Integer(), sa.ForeignKey("subtareas_orden.id", ondelete="CASCADE"), nullable=False, index=True),
+        sa.Column("url", sa.String(512), nullable=False),
+    ),
+    sa.Table(
+        "orden_trabajo_piezas", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("orden_trabajo_id", sa.Integer(), sa.ForeignKey("ordenes_trabajo.id", ondelete="CASCADE"), nullable=False, index=True),
+        sa.Column("sub_orden_id", sa.Integer(), sa.ForeignKey("sub_ordenes_trabajo.id", ondelete="SET NULL"), nullable=True, index=True),
+        sa.Column("pieza_id", sa.Integer(), sa.ForeignKey("piezas.id", ondelete="RESTRICT"), nullable=False, index=True),
+        sa.Column("cantidad", sa.Integer(), nullable=False),
+        sa.Column("precio_unitario", sa.Numeric(10, 2), nullable=False),
+    ),
+    sa.Table(
+        "cortes_caja", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("fecha", sa.Date(), nullable=False, index=True),
+        sa.Column("tipo", sa.String(20), nullable=False, index=True),
+        sa.Column("saldo_inicial", sa.Numeric(12, 2), nullable=False),
+        sa.Column("total_entradas", sa.Numeric(12, 2), nullable=False),
+        sa.Column("total_salidas", sa.Numeric(12, 2), nullable=False),
+        sa.Column("saldo_final", sa.Numeric(12, 2), nullable=False),
+        sa.Column("cerrado_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("usuario_cierre_id", sa.Integer(), sa.ForeignKey("usuarios.id"), nullable=True, index=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ),
+    sa.Table(
+        "movimientos_caja", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("fecha", sa.Date(), nullable=False, index=True),
+        sa.Column("tipo", sa.String(20), nullable=False, index=True),
+        sa.Column("concepto", sa.String(255), nullable=False),
+        sa.Column("monto", sa.Numeric(12, 2), nullable=False),
+        sa.Column("orden_trabajo_id", sa.Integer(), sa.ForeignKey("ordenes_trabajo.id", ondelete="SET NULL"), nullable=True, index=True),
+        sa.Column("corte_id", sa.Integer(), sa.ForeignKey("cortes_caja.id", ondelete="SET NULL"), nullable=True, index=True),
+        sa.Column("usuario_id", sa.Integer(), sa.ForeignKey("usuarios.id"), nullable=False, index=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ),
+    sa.Table(
+        "aperturas_caja", _legado,
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("fecha", sa.Date(), nullable=False, unique=True, index=True),
+        sa.Column("monto", sa.Numeric(12, 2), nullable=False),
+        sa.Column("usuario_id", sa.Integer(), sa.ForeignKey("usuarios.id"), nullable=False, index=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ),
+    sa.Table(
+        "caja_saldos_diarios", _legado,
+        sa.Column("fecha", sa.Date(), primary_key=True),
+        sa.Column("total_entradas", sa.Numeric(12, 2), nullable=False),
+        sa.Column("total_salidas", sa.Numeric(12, 2), nullable=False),
+        sa.Column("num_movimientos", sa.Integer(), nullable=False),
+        sa.Column("saldo_inicial", sa.Numeric(12, 2), nullable=True),
+        sa.Column("saldo_final", sa.Numeric(12, 2), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    ),
+    sa.Table(
+        "folio_secuencias", _legado,
+        sa.Column("prefijo", sa.String(10), primary_key=True),
+        sa.Column("anio", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("ultimo", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    ),
+)
+COLUMNAS_LEGADO = (
+    ("orden_trabajo_piezas", "sub_orden_id", "INT NULL"),
+    ("gastos", "sub_orden_id", "INT NULL"),
+    ("piezas", "catalogo_id", "INT NULL"),
+    ("piezas", "subcatalogo_id", "INT NULL"),
+    ("usuarios", "codigo", "VARCHAR(4) NULL UNIQUE"),
+    ("gastos", "categoria", "VARCHAR(20) NULL"),
+)
+INDICES_LEGADO = (
+    ("ordenes_trabajo", "ix_ordenes_trabajo_fecha_recepcion_id", "(fecha_recepcion, id)"),
+)
+
+
+def _config(connection) -> Config:
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    cfg = Config(os.path.join(base, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(base, "migrations"))
+    cfg.attributes["connection"] = connection
+    return cfg
+
+
+def _completar_esquema_legado(connection) -> None:
+    """Crea las tablas, columnas e índices que falten en una base anterior a Alembic."""
+    for tabla in TABLAS_LEGADO:
+        tabla.create(connection, checkfirst=True)
+    inspector = inspect(connection)
+    for tabla, columna, definicion in COLUMNAS_LEGADO:
+        if columna not in {c["name"] for c in inspector.get_columns(tabla)}:
+            connection.execute(text(f"ALTER TABLE {tabla} ADD COLUMN {columna} {definicion}"))
+            print(f"Columna {tabla}.{columna} creada.")
+    for tabla, indice, columnas in INDICES_LEGADO:
+        if indice not in {i["name"] for i in inspector.get_indexes(tabla)}:
+            connection.execute(text(f"CREATE INDEX {indice} ON {tabla} {columnas}"))
+            print(f"Índice {indice} creado.")
+
+
+def migrar(connection) -> None:
+    cfg = _config(connection)
+    tablas = set(inspect(connection).get_table_names())
+    if "alembic_version" not in tablas and "usuarios" in tablas:
+        print("Base de datos sin control de versiones: completando esquema y marcando revisión base...")
+        _completar_esquema_legado(connection)
+        command.stamp(cfg, REVISION_BASE)
+    command.upgrade(cfg, "head")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplicar migraciones de base de datos")
+    parser.add_argument("--actual", action="store_true", help="Solo mostrar la revisión actual")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    es_mysql = engine.dialect.name in ("mysql", "mariadb")
+    try:
+        with engine.connect() as connection:
+            if args.actual:
+                command.current(_config(connection), verbose=True)
+                return 0
+            if es_mysql:
+                obtenido = connection.execute(
+                    text("SELECT GET_LOCK(:nombre, :timeout)"), {"nombre": CANDADO, "timeout": CANDADO_TIMEOUT}
+                ).scalar()
+                if obtenido != 1:
+                    print("No se obtuvo el candado de migraciones (otra ejecución en curso).")
+                    return 1
+            try:
+                migrar(connection)
+                connection.commit()
+            finally:
+                if es_mysql:
+                    connection.execute(text("SELECT RELEASE_LOCK(:nombre)"), {"nombre": CANDADO})
+    finally:
+        engine.dispose()
+    print("Migraciones aplicadas.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
@@ -0,0 +1,36 @@
+"""
+Recalcula consumo diario y punto de reorden de todas las piezas desde el historial de usos en OTs.
+Los usos nuevos actualizan los valores al momento; este recálculo saca de la cuenta los usos que
+ya quedaron fuera de la ventana (REORDEN_VENTANA_DIAS), así que conviene correrlo una vez al día.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.recalcular_puntos_reorden
+
+  Ejemplo de cron (diario, 3:00 am):
+    0 3 * * * cd /app && python -m scripts.recalcular_puntos_reorden
+"""
+import sys
+import time
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.reorden_service import ReordenService
+
+
+def main():
+    db = SessionLocal()
+    try:
+        inicio = time.perf_counter()
+        piezas = ReordenService.recalcular(db)
+        print(
+            f"Puntos de reorden recalculados: {piezas} pieza(s) con consumo en los últimos "
+            f"{settings.REORDEN_VENTANA_DIAS} días ({(time.perf_counter() - inicio) * 1000:.0f} ms)."
+        )
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
@@ -0,0 +1,36 @@
+"""
+Reconstruye la tabla caja_saldos_diarios desde el historial de movimientos y cortes de caja.
+Útil la primera vez (datos anteriores a la tabla) o si se corrigieron movimientos directo en BD.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.reconstruir_saldos_caja
+    python -m scripts.reconstruir_saldos_caja --desde 2026-01-01 --hasta 2026-12-31
+"""
+import argparse
+import sys
+from datetime import date
+
+from app.database import SessionLocal
+from app.models import CajaSaldoDiario
+from app.services.caja_service import CajaService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruir saldos diarios de caja")
+    parser.add_argument("--desde", type=date.fromisoformat, default=None, help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument("--hasta", type=date.fromisoformat, default=None, help="Fecha final (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        CajaSaldoDiario.__table__.create(db.get_bind(), checkfirst=True)
+        dias = CajaService.reconstruir_saldos_diarios(db, desde=args.desde, hasta=args.hasta)
+        print(f"Saldos diarios reconstruidos: {dias} día(s).")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
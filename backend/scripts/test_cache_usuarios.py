@@ -0,0 +1,114 @@
+"""
+Prueba de la caché de usuarios autenticados.
+Crea un usuario temporal, lo desactiva y valida que sus peticiones sean rechazadas (403)
+a más tardar en AUTH_CACHE_TTL_SECONDS, aunque la petición caiga en otro worker de uvicorn.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.test_cache_usuarios
+
+  Variables de entorno (opcionales):
+    API_BASE_URL           - Base URL del API (default: http://localhost:8000)
+    TEST_USERNAME          - Usuario con rol ADMIN
+    TEST_PASSWORD          - Contraseña del usuario
+    AUTH_CACHE_TTL_SECONDS - TTL configurado en el backend (default: 30)
+"""
+import os
+import sys
+import time
+
+from scripts.test_crear_orden import request, API_BASE_URL, TEST_USERNAME, TEST_PASSWORD
+
+AUTH_CACHE_TTL_SECONDS = float(os.environ.get("AUTH_CACHE_TTL_SECONDS", "30"))
+MARGEN_SEGUNDOS = 2.0
+
+
+def main():
+    print("=" * 60)
+    print("Prueba: Caché de usuarios autenticados")
+    print("=" * 60)
+    print(f"API: {API_BASE_URL}  TTL={AUTH_CACHE_TTL_SECONDS:g}s")
+    print()
+
+    if not TEST_USERNAME or not TEST_PASSWORD:
+        print("ERROR: Define TEST_USERNAME y TEST_PASSWORD (usuario con rol ADMIN).")
+        sys.exit(1)
+
+    # 1. Login admin
+    print("1. Iniciando sesión como administrador...")
+    code, body = request("POST", "/api/v1/auth/login/json", {
+        "username": TEST_USERNAME,
+        "password": TEST_PASSWORD,
+    })
+    if code != 200 or not body.get("access_token"):
+        print(f"   ERROR login: {code} - {body}")
+        sys.exit(1)
+    token_admin = body["access_token"]
+    print("   OK - Token obtenido.")
+
+    # 2. Usuario temporal
+    sufijo = str(int(time.time()))
+    username = f"cache_{sufijo}"
+    password = f"Prueba{sufijo}"
+    print(f"2. Creando usuario temporal {username}...")
+    code, body = request("POST", "/api/v1/users/", {
+        "username": username,
+        "email": f"{username}@example.com",
+        "nombre_completo": "Prueba Cache Usuarios",
+        "password": password,
+        "rol": "RECEPCION",
+    }, token=token_admin)
+    if code not in (200, 201):
+        print(f"   ERROR crear usuario: {code} - {body}")
+        sys.exit(1)
+    user_id = body["id"]
+    print(f"   OK - Usuario id={user_id}.")
+
+    resultado = 1
+    try:
+        # 3. Login del usuario y peticiones para poblar la caché en los workers
+        code, body = request("POST", "/api/v1/auth/login/json", {"username": username, "password": password})
+        if code != 200:
+            print(f"   ERROR login usuario temporal: {code} - {body}")
+            return 1
+        token_usuario = body["access_token"]
+        for _ in range(6):
+            code, body = request("GET", "/api/v1/clientes?limit=1", token=token_usuario)
+            if code != 200:
+                print(f"   ERROR petición con usuario activo: {code} - {body}")
+                return 1
+        print("3. OK - Usuario activo autenticado (caché poblada).")
+
+        # 4. Desactivar y medir cuánto tarda en ser rechazado
+        print("4. Desactivando usuario y esperando rechazo...")
+        code, body = request("PUT", f"/api/v1/users/{user_id}", {"activo": False}, token=token_admin)
+        if code != 200:
+            print(f"   ERROR desactivar: {code} - {body}")
+            return 1
+        inicio = time.monotonic()
+        limite = AUTH_CACHE_TTL_SECONDS + MARGEN_SEGUNDOS
+        while True:
+            code, body = request("GET", "/api/v1/clientes?limit=1", token=token_usuario)
+            transcurrido = time.monotonic() - inicio
+            if code == 403:
+                break
+            if transcurrido > limite:
+                print(f"   ERROR: el usuario desactivado sigue pasando tras {transcurrido:.1f}s (código {code}).")
+                return 1
+            time.sleep(0.5)
+        print(f"   OK - Rechazado (403) a los {transcurrido:.1f}s (límite {limite:g}s).")
+        resultado = 0
+    finally:
+        # 5. Limpiar
+        code, _ = request("DELETE", f"/api/v1/users/{user_id}", token=token_admin)
+        print(f"5. Usuario temporal eliminado (código {code}).")
+
+    print()
+    print("=" * 60)
+    print("Resultado: PRUEBA EXITOSA - Un usuario desactivado se rechaza dentro del TTL de la caché.")
+    print("=" * 60)
+    return resultado
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
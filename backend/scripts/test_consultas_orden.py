@@ -0,0 +1,122 @@
+"""
+Prueba del número de consultas al armar la respuesta de una orden de trabajo.
+Crea en una base SQLite temporal órdenes con distinta cantidad de subtareas y fotos de entrada,
+las carga como el endpoint de detalle (_opciones_detalle_orden) y cuenta con un listener
+before_cursor_execute las sentencias que ejecutan _orden_to_response_dict y _cargar_fotos_entrada.
+Valida que sean las mismas sin importar cuántas subtareas y fotos tenga la orden (sin N+1).
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.test_consultas_orden
+
+No usa la base de datos configurada: DATABASE_URL se reemplaza por un archivo SQLite temporal.
+"""
+import os
+import sys
+import tempfile
+
+_db_temporal = tempfile.NamedTemporaryFile(prefix="consultas_orden_", suffix=".db", delete=False)
+_db_temporal.close()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_temporal.name}"
+
+from sqlalchemy import event  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registra todas las tablas en Base.metadata)
+from app.api.v1.ordenes import _cargar_fotos_entrada, _opciones_detalle_orden, _orden_to_response_dict  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Cliente, OrdenFotoEntrada, OrdenTrabajo, RolEnum, SubtareaFotoEntrada, SubtareaOrden, User,
+)
+
+# (subtareas, fotos por subtarea, fotos de la OT)
+CASOS = [(1, 1, 1), (5, 3, 4), (30, 6, 10)]
+
+
+def crear_orden(db, usuario, cliente, i, subtareas, fotos_subtarea, fotos_orden):
+    orden = OrdenTrabajo(
+        folio=f"OT-TEST-{i:04d}",
+        cliente_id=cliente.id,
+        usuario_recepcion_id=usuario.id,
+        tecnico_asignado_id=usuario.id,
+        descripcion="Prueba de consultas",
+    )
+    db.add(orden)
+    db.flush()
+    db.add_all(OrdenFotoEntrada(orden_id=orden.id, url=f"/uploads/ordenes/{i}_{n}.jpg") for n in range(fotos_orden))
+    for s in range(subtareas):
+        subtarea = SubtareaOrden(orden_trabajo_id=orden.id, titulo=f"Subtarea {s}", orden=s, tecnico_asignado_id=usuario.id)
+        db.add(subtarea)
+        db.flush()
+        db.add_all(
+            SubtareaFotoEntrada(subtarea_id=subtarea.id, url=f"/uploads/subtareas/{subtarea.id}_{n}.jpg")
+            for n in range(fotos_subtarea)
+        )
+    db.commit()
+    return orden.id
+
+
+def contar(db, funcion) -> int:
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        funcion()
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+    return len(sentencias)
+
+
+def main():
+    print("=" * 60)
+    print("Prueba: Consultas al armar la respuesta de una orden")
+    print("=" * 60)
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        usuario = User(
+            username="consultas", email="consultas@example.com", nombre_completo="Prueba Consultas",
+            password_hash="x", rol=RolEnum.ADMIN,
+        )
+        cliente = Cliente(nombre="Cliente", apellido_paterno="Prueba", telefono="5512345678")
+        db.add_all([usuario, cliente])
+        db.commit()
+        ids = [crear_orden(db, usuario, cliente, i, *caso) for i, caso in enumerate(CASOS, start=1)]
+        db.expunge_all()
+
+        conteos = []
+        for orden_id, (subtareas, fotos_subtarea, fotos_orden) in zip(ids, CASOS):
+            orden = db.query(OrdenTrabajo).options(*_opciones_detalle_orden()).filter(OrdenTrabajo.id == orden_id).one()
+            fotos = contar(db, lambda: _cargar_fotos_entrada(db, orden))
+            respuesta = {}
+            total = contar(db, lambda: respuesta.update(_orden_to_response_dict(db, orden, include_gastos=True)))
+            esperadas = subtareas * fotos_subtarea
+            obtenidas = sum(len(st["fotos_entrada_list"]) for st in respuesta["subtareas"])
+            if len(respuesta["subtareas"]) != subtareas or obtenidas != esperadas or len(respuesta["fotos_entrada_list"]) != fotos_orden:
+                print(f"   ERROR: la respuesta no trae todas las subtareas/fotos (orden {orden_id})")
+                sys.exit(1)
+            print(f"   {subtareas:>3} subtareas, {esperadas:>3} fotos de subtarea, {fotos_orden:>2} de OT: "
+                  f"_cargar_fotos_entrada={fotos}  _orden_to_response_dict={total}")
+            conteos.append((fotos, total))
+            db.expunge_all()
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(_db_temporal.name)
+
+    if len(set(conteos)) != 1:
+        print(f"   ERROR: el número de consultas cambia con las subtareas/fotos: {conteos}")
+        sys.exit(1)
+
+    print()
+    print("=" * 60)
+    print(f"Resultado: PRUEBA EXITOSA - Siempre {conteos[0][1]} consultas ({conteos[0][0]} de fotos).")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
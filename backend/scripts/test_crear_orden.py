@@ -36,7 +36,8 @@ def request(method, path, data=None, token=None):
     ctx.verify_mode = ssl.CERT_NONE
     try:
         with urllib.request.urlopen(req, timeout=15, context=ctx) as resp:
-            return resp.getcode(), json.loads(resp.read().decode())
+            raw = resp.read().decode()
+            return resp.getcode(), json.loads(raw) if raw else {}
     except urllib.error.HTTPError as e:
         body = e.read().decode() if e.fp else "{}"
         try:
@@ -0,0 +1,101 @@
+"""
+Prueba de concurrencia de folios de órdenes de trabajo.
+Crea muchas órdenes en paralelo (varios hilos contra los workers de uvicorn) y valida
+que los folios OT-AÑO-XXXX sean únicos y consecutivos, sin huecos.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.test_folios_concurrentes
+
+  Variables de entorno (opcionales):
+    API_BASE_URL  - Base URL del API (default: http://localhost:8000)
+    TEST_USERNAME - Usuario con rol ADMIN o RECEPCION
+    TEST_PASSWORD - Contraseña del usuario
+    TEST_ORDENES  - Cantidad de órdenes a crear (default: 200)
+    TEST_HILOS    - Hilos en paralelo (default: 16)
+
+ATENCIÓN: crea órdenes reales; usar solo contra una base de datos de pruebas.
+"""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.test_crear_orden import request, API_BASE_URL, TEST_USERNAME, TEST_PASSWORD
+
+TEST_ORDENES = int(os.environ.get("TEST_ORDENES", "200"))
+TEST_HILOS = int(os.environ.get("TEST_HILOS", "16"))
+
+
+def main():
+    print("=" * 60)
+    print("Prueba: Folios concurrentes de Órdenes de Trabajo")
+    print("=" * 60)
+    print(f"API: {API_BASE_URL}  órdenes={TEST_ORDENES}  hilos={TEST_HILOS}")
+    print()
+
+    if not TEST_USERNAME or not TEST_PASSWORD:
+        print("ERROR: Define TEST_USERNAME y TEST_PASSWORD (usuario con rol ADMIN o RECEPCION).")
+        sys.exit(1)
+
+    # 1. Login
+    print("1. Iniciando sesión...")
+    code, body = request("POST", "/api/v1/auth/login/json", {
+        "username": TEST_USERNAME,
+        "password": TEST_PASSWORD,
+    })
+    if code != 200 or not body.get("access_token"):
+        print(f"   ERROR login: {code} - {body}")
+        sys.exit(1)
+    token = body["access_token"]
+    print("   OK - Token obtenido.")
+
+    # 2. Cliente para las órdenes
+    print("2. Obteniendo cliente...")
+    code, body = request("GET", "/api/v1/clientes?limit=1", token=token)
+    clientes = body if code == 200 and isinstance(body, list) else []
+    if not clientes:
+        print("   ERROR: Se necesita al menos un cliente (ejecuta antes scripts.test_crear_orden).")
+        sys.exit(1)
+    cliente_id = clientes[0].get("id")
+    print(f"   OK - Usando cliente id={cliente_id}.")
+
+    # 3. Crear órdenes en paralelo
+    print(f"3. Creando {TEST_ORDENES} órdenes en paralelo...")
+    payload = {
+        "cliente_id": cliente_id,
+        "descripcion": "Prueba automatizada de concurrencia de folios de orden de trabajo.",
+        "prioridad": "NORMAL",
+        "estatus": "RECIBIDO",
+        "anticipo": 0,
+    }
+
+    def crear(_):
+        return request("POST", "/api/v1/ordenes", payload, token=token)
+
+    with ThreadPoolExecutor(max_workers=TEST_HILOS) as pool:
+        resultados = list(pool.map(crear, range(TEST_ORDENES)))
+
+    errores = [(c, b) for c, b in resultados if c not in (200, 201)]
+    folios = [b.get("folio") for c, b in resultados if c in (200, 201)]
+    if errores:
+        print(f"   ERROR: {len(errores)} órdenes fallaron. Primer error: {errores[0]}")
+        sys.exit(1)
+
+    # 4. Validar folios únicos y consecutivos
+    duplicados = len(folios) - len(set(folios))
+    numeros = sorted(int(f.rsplit("-", 1)[1]) for f in folios)
+    huecos = [n for n in range(numeros[0], numeros[-1] + 1) if n not in set(numeros)]
+    if duplicados or huecos:
+        print(f"   ERROR: duplicados={duplicados} huecos={huecos[:10]}")
+        sys.exit(1)
+
+    print(f"   OK - {len(folios)} folios únicos y consecutivos ({min(folios)} .. {max(folios)}).")
+    print()
+    print("=" * 60)
+    print("Resultado: PRUEBA EXITOSA - Los folios no se duplican bajo concurrencia.")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
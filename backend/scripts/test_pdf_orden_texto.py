@@ -0,0 +1,75 @@
+"""
+Prueba del comprobante PDF de órdenes con texto libre que parece marcado.
+Genera en memoria (BytesIO) comprobantes de recepción y entrega cuya descripción y observaciones
+contienen <, > y & (p. ej. "Pieza a<b", "Motor <b>ruido", "x </para> y") y valida que el PDF se
+genere y que los párrafos muestren el texto tal cual. Sin escapar, estos textos hacían fallar a
+ReportLab (ValueError / IndexError) y los endpoints de PDF respondían 500.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.test_pdf_orden_texto
+"""
+import io
+import sys
+
+from reportlab.platypus import Paragraph
+
+from app.utils.pdf_orden import TIPO_ENTREGA, TIPO_RECEPCION, _story_orden, generar_pdf_ordenes
+
+TEXTOS = [
+    "Pieza a<b",
+    "Motor <b>ruido",
+    "x </para> y",
+    "Cliente & hijos > 3 <br> días",
+    "Línea 1\nLínea <2> & 3",
+]
+
+
+def orden(i, texto):
+    return {
+        "id": i,
+        "folio": f"OT-2026-{i:05d}",
+        "estatus": "RECIBIDO",
+        "prioridad": "NORMAL",
+        "cliente_nombre": "Cliente <Prueba> & Cía",
+        "descripcion": texto,
+        "observaciones": texto,
+        "subtareas": [{"titulo": texto, "tecnico_nombre": "", "estado": "PENDIENTE"}],
+        "piezas_usadas": [{"pieza_codigo": "MAT-1", "pieza_nombre": texto, "cantidad": 1, "subtotal": 10}],
+        "fotos_entrada_list": [],
+    }
+
+
+def main():
+    print("=" * 60)
+    print("Prueba: Texto libre en comprobantes PDF de órdenes")
+    print("=" * 60)
+
+    ordenes = [orden(i, t) for i, t in enumerate(TEXTOS, start=1)]
+    for tipo in (TIPO_RECEPCION, TIPO_ENTREGA):
+        buf = io.BytesIO()
+        try:
+            generar_pdf_ordenes(ordenes, buf, tipo)
+        except Exception as e:
+            print(f"   ERROR {tipo}: {type(e).__name__}: {e}")
+            sys.exit(1)
+        parrafos = [
+            " ".join(f.getPlainText() for f in _story_orden(o, tipo, {}) if isinstance(f, Paragraph))
+            for o in ordenes
+        ]
+        # getPlainText omite los <br/>: los saltos de línea se comparan sin separador
+        faltantes = [t for t, texto in zip(TEXTOS, parrafos) if t.replace("\n", "") not in texto]
+        if faltantes:
+            print(f"   ERROR {tipo}: el texto no aparece tal cual en el PDF: {faltantes}")
+            sys.exit(1)
+        print(f"   OK - {tipo}: {len(ordenes)} órdenes, {len(buf.getvalue())} bytes.")
+
+    print()
+    print("=" * 60)
+    print("Resultado: PRUEBA EXITOSA - El texto libre no se interpreta como marcado.")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
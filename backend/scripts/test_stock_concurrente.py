@@ -0,0 +1,126 @@
+"""
+Prueba de concurrencia del stock de piezas.
+Crea una pieza con poco stock y lanza muchas peticiones en paralelo para agregarla a una orden
+(varios hilos contra los workers de uvicorn). Valida que el stock nunca quede negativo: solo
+deben tener éxito tantas peticiones como piezas había, el resto debe responder "Stock insuficiente",
+y la bitácora movimientos_inventario debe cuadrar con el stock final.
+
+Uso:
+  Desde la raíz del backend:
+    python -m scripts.test_stock_concurrente
+
+  Variables de entorno (opcionales):
+    API_BASE_URL    - Base URL del API (default: http://localhost:8000)
+    TEST_USERNAME   - Usuario con rol ADMIN
+    TEST_PASSWORD   - Contraseña del usuario
+    TEST_STOCK      - Stock inicial de la pieza (default: 25)
+    TEST_PETICIONES - Peticiones de 1 pieza en paralelo (default: 100)
+    TEST_HILOS      - Hilos en paralelo (default: 16)
+
+ATENCIÓN: crea una orden y una pieza reales; usar solo contra una base de datos de pruebas.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.test_crear_orden import request, API_BASE_URL, TEST_USERNAME, TEST_PASSWORD
+
+TEST_STOCK = int(os.environ.get("TEST_STOCK", "25"))
+TEST_PETICIONES = int(os.environ.get("TEST_PETICIONES", "100"))
+TEST_HILOS = int(os.environ.get("TEST_HILOS", "16"))
+
+
+def main():
+    print("=" * 60)
+    print("Prueba: Stock concurrente de piezas")
+    print("=" * 60)
+    print(f"API: {API_BASE_URL}  stock={TEST_STOCK}  peticiones={TEST_PETICIONES}  hilos={TEST_HILOS}")
+    print()
+
+    if not TEST_USERNAME or not TEST_PASSWORD:
+        print("ERROR: Define TEST_USERNAME y TEST_PASSWORD (usuario con rol ADMIN).")
+        sys.exit(1)
+
+    # 1. Login
+    print("1. Iniciando sesión...")
+    code, body = request("POST", "/api/v1/auth/login/json", {
+        "username": TEST_USERNAME,
+        "password": TEST_PASSWORD,
+    })
+    if code != 200 or not body.get("access_token"):
+        print(f"   ERROR login: {code} - {body}")
+        sys.exit(1)
+    token = body["access_token"]
+    print("   OK - Token obtenido.")
+
+    # 2. Orden y pieza de prueba
+    print("2. Creando orden y pieza de prueba...")
+    code, body = request("GET", "/api/v1/clientes?limit=1", token=token)
+    clientes = body if code == 200 and isinstance(body, list) else []
+    if not clientes:
+        print("   ERROR: Se necesita al menos un cliente (ejecuta antes scripts.test_crear_orden).")
+        sys.exit(1)
+    code, orden = request("POST", "/api/v1/ordenes", {
+        "cliente_id": clientes[0].get("id"),
+        "descripcion": "Prueba automatizada de concurrencia del stock de piezas.",
+        "prioridad": "NORMAL",
+        "estatus": "RECIBIDO",
+        "anticipo": 0,
+    }, token=token)
+    if code not in (200, 201):
+        print(f"   ERROR orden: {code} - {orden}")
+        sys.exit(1)
+    code, pieza = request("POST", "/api/v1/piezas", {
+        "nombre": f"Pieza prueba stock concurrente {int(time.time())}",
+        "precio": 1,
+        "stock": TEST_STOCK,
+    }, token=token)
+    if code not in (200, 201):
+        print(f"   ERROR pieza: {code} - {pieza}")
+        sys.exit(1)
+    print(f"   OK - Orden {orden.get('folio')}, pieza {pieza.get('codigo')} con stock {TEST_STOCK}.")
+
+    # 3. Agregar la pieza a la orden en paralelo, 1 por petición
+    print(f"3. Enviando {TEST_PETICIONES} peticiones en paralelo...")
+    payload = {"pieza_id": pieza["id"], "cantidad": 1}
+
+    def agregar(_):
+        return request("POST", f"/api/v1/ordenes/{orden['id']}/piezas", payload, token=token)
+
+    with ThreadPoolExecutor(max_workers=TEST_HILOS) as pool:
+        resultados = list(pool.map(agregar, range(TEST_PETICIONES)))
+
+    exitos = sum(1 for c, _ in resultados if c in (200, 201))
+    insuficientes = sum(1 for c, b in resultados if c == 400 and "Stock insuficiente" in str(b))
+    otros = [(c, b) for c, b in resultados if c not in (200, 201) and not (c == 400 and "Stock insuficiente" in str(b))]
+    print(f"   Éxitos={exitos}  stock insuficiente={insuficientes}  otros errores={len(otros)}")
+    if otros:
+        print(f"   ERROR: respuestas inesperadas. Primera: {otros[0]}")
+        sys.exit(1)
+
+    # 4. Validar stock final y bitácora
+    code, final = request("GET", f"/api/v1/piezas/{pieza['id']}", token=token)
+    code_mov, movimientos = request("GET", f"/api/v1/piezas/{pieza['id']}/movimientos?limit=500", token=token)
+    if code != 200 or code_mov != 200:
+        print(f"   ERROR consultando pieza/movimientos: {code} {code_mov}")
+        sys.exit(1)
+    stock_final = final.get("stock")
+    suma = sum(m["cantidad"] for m in movimientos)
+    negativos = [m for m in movimientos if m["stock_resultante"] < 0]
+    esperado_exitos = min(TEST_STOCK, TEST_PETICIONES)
+    if stock_final < 0 or negativos or exitos != esperado_exitos or stock_final != TEST_STOCK - exitos or suma != stock_final:
+        print(f"   ERROR: stock final={stock_final} éxitos={exitos} (esperados {esperado_exitos}) "
+              f"suma de movimientos={suma} movimientos con stock negativo={len(negativos)}")
+        sys.exit(1)
+
+    print(f"   OK - Stock final {stock_final}; {len(movimientos)} movimientos y su suma cuadra con el stock.")
+    print()
+    print("=" * 60)
+    print("Resultado: PRUEBA EXITOSA - El stock no queda negativo bajo concurrencia.")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
@@ -12,6 +12,14 @@ if (-Not (Test-Path "app\main.py")) {
     exit 1
 }
 
+# Aplicar migraciones de base de datos
+Write-Host "Aplicando migraciones..." -ForegroundColor Yellow
+python -m scripts.migrar
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "Error al aplicar migraciones" -ForegroundColor Red
+    exit 1
+}
+
 # Iniciar servidor
 Write-Host "Iniciando servidor FastAPI en http://localhost:8000..." -ForegroundColor Green
 Write-Host "API Docs disponible en: http://localhost:8000/docs" -ForegroundColor Green